@@ -1,5 +1,7 @@
 from flask import Flask
 from flask import request          # ← 추가
+from flask import session
+from flask import has_app_context
 from uuid import uuid4
 from flask_cors import CORS
 from config import Config
@@ -17,19 +19,77 @@ from monsters import monsters_bp
 from sqlalchemy.orm import Session   # 타입 힌트용
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from utils.walkable import get_walkable, get_tilemap
+from utils.walkable import WalkGrid, get_walkable
+from utils.pathfinding import PathCache
+from utils.flowfield import FlowFieldCache
+from utils.los import LosCache
+from utils.scheduler import WorldScheduler
+from utils.mapcompiler import TRIG_MONSTER_FORBIDDEN, CompiledMap   # ❶ 금단 타일 = .mapbin 트리거 플래그
+from utils.mapregistry import maps as map_registry
 from utils.session import with_db_session
+from utils.rate_limit import SidRateLimiter
+from utils.socket_auth import verify_token
+from utils.char_state import CharStateStore
+from utils.monster_state import MonsterState, MonsterStore
+from utils.spatial import SpatialHash
+from utils.world_delta import WorldDeltaBuffer
+from utils.registry import SessionRegistry, EntityRegistry
+from utils.mailbox import SerialExecutor
+from utils.dead_reckoning import MotionTable, MAX_EXTRAPOLATE, MAX_SPEED
+from utils.triggers import TriggerTable, compile_triggers, TELEPORT, NPC_NEAR, INVALID
+from utils.wire import (WIRE_JSON, WIRE_BIN, WireError, HandleTable,
+                        negotiate, encode_world_delta)
 from random import choice, shuffle
+from functools import wraps
 from typing import Any
 import os
+import sys
+import signal
 import time
 import json
 import redis                     # ▸ pip install redis
 
-knockback_until: dict[int, float] = {}   # {monster_id: unix_timestamp}
-last_move_sent: dict[int, float] = {}   # {char_id: unix_ts}
-_last_tile: dict[int, tuple[str, int, int]] = {}   # {char_id: (map_key, tx, ty)}
-_monster_tiles_by_map: dict[str, set[tuple[int, int]]] = {}   # {map_key: {(tx, ty), ...}}
+sessions = SessionRegistry()     # 접속 캐릭터별 이동/전송 상태 (join_map ~ disconnect)
+entities = EntityRegistry()      # 몬스터별 일시 상태 (넉백)
+_monster_tiles_by_map: dict[str, dict[tuple[int, int], int]] = {}   # {map_key: {(tx, ty): monster_id}}
+_move_slots: dict[str, dict] = {}    # {sid: 최신 move 데이터} — 처리 대기 중인 슬롯
+_move_seq: dict[str, int] = {}       # {sid: 마지막으로 받은 클라이언트 seq}
+# 소켓 ↔ 계정/캐릭터 바인딩 (프로세스 로컬 — move 소유권 검사에 Redis 를 쓰지 않음)
+sid_user: dict[str, int] = {}        # {sid: user_id} — connect/join_map 토큰 검증 결과
+sid_char: dict[str, int] = {}        # {sid: char_id} — join_map 에서 묶음
+char_sid: dict[int, str] = {}        # {char_id: sid} — 역방향 (한 캐릭터 = 소켓 하나)
+trigger_tables: dict[str, TriggerTable] = {}   # {map_key: 컴파일된 타일 트리거}
+char_states = CharStateStore()   # 접속 중 캐릭터 상태 (write-behind)
+monster_states = MonsterStore()  # 몬스터 상태 — 맵별 한 번 로드, 사망·리스폰·체크포인트 때만 기록
+
+
+def sid_owns_char(sid: str, char_id: int) -> bool:
+    return sid_char.get(sid) == char_id
+
+
+def on_current_map(char_id: int, map_key: str) -> bool:
+    """서버가 둔 맵(메모리 상태)과 같은지 — 맵 이동은 텔레포트 트리거 / join_map 만"""
+    st = char_states.get(char_id)
+    return st is not None and st.map_key == map_key
+
+
+def bind_local(sid: str, char_id: int) -> None:
+    old = char_sid.get(char_id)
+    if old is not None and old != sid:
+        sid_char.pop(old, None)          # 다른 탭이 가져가면 이전 소켓은 이동 불가
+    prev_char = sid_char.get(sid)
+    if prev_char is not None and prev_char != char_id and char_sid.get(prev_char) == sid:
+        char_sid.pop(prev_char, None)
+    sid_char[sid] = char_id
+    char_sid[char_id] = sid
+
+
+def unbind_local(sid: str) -> None:
+    sid_user.pop(sid, None)
+    char_id = sid_char.pop(sid, None)
+    if char_id is not None and char_sid.get(char_id) == sid:
+        del char_sid[char_id]
+
 
 # ---------------------------------------------
 # redis 연결
@@ -110,42 +170,202 @@ def remove_sid(sid: str):
     return found_cid
 # ---------------------------------------------
 
-from math import hypot
+from math import hypot, isfinite
 TILE   = 128                    # 이미 쓰던 상수
-INVALID_TILE_ID = 15            # ❶ 금단 타일
 
 ATK_RANGE  = 1                  # 타일 1칸이면 근접
 AGGRO_DIST = 4                  # 몬스터가 플레이어 인식하는 반경(타일)
+NPC_NEAR_TILES = 1              # NPC 근접 트리거 반경(타일) — 클라이언트 대화 거리(48px)보다 넓게
+LEASH_DIST = 10                 # 스폰에서 이보다 멀어지면 추격 포기 후 복귀(타일)
 
 EXP_PER_LEVEL = 20              # 간단한 보상 공식
 RESPAWN_POS   = ('city2', 1, 26)
 
-tilemaps: dict[str, Any] = {}
+# 몬스터 AI 틱 주기(초) — 기본값 + 맵별 덮어쓰기 (MONSTER_TICK_MAPS="dungeon1=1.5,cave=0.5")
+MONSTER_TICK      = float(os.environ.get("MONSTER_TICK", 2.0))
+MONSTER_TICK_MAPS = {
+    k.strip(): float(v)
+    for k, v in (p.split("=", 1) for p in os.environ.get("MONSTER_TICK_MAPS", "").split(",") if "=" in p)
+}
+MONSTER_MAP_SCAN  = 10.0        # 몬스터가 있는 맵 목록 재확인 주기(초) — 새 맵은 이 안에 틱 시작
+
+
+def monster_tick_period(map_key: str) -> float:
+    return MONSTER_TICK_MAPS.get(map_key, MONSTER_TICK)
+
+
+# 몬스터 위치/HP 체크포인트 주기(초) — 사망·리스폰은 즉시 기록
+MONSTER_CHECKPOINT_INTERVAL = float(os.environ.get("MONSTER_CHECKPOINT_INTERVAL", 30.0))
+
+# 캐릭터 상태 배치 flush 주기(초) — 이동/피격은 이 주기로만 DB 기록
+CHAR_FLUSH_INTERVAL = float(os.environ.get("CHAR_FLUSH_INTERVAL", 5.0))
+
+# AOI(관심 영역) — 셀 = AOI_CELL_TILES² 타일, 주변 AOI_RADIUS 셀만 실시간 이동 수신
+MOVE_SEND_INTERVAL = 0.12       # 캐릭터당 이동 전송 최소 간격 (120 ms)
+AOI_CELL_TILES     = 8
+AOI_RADIUS         = 1          # 3×3 셀 = 24×24 타일 시야
+FAR_MOVE_INTERVAL  = 1.0        # 시야 밖 플레이어에게는 1초에 한 번만
+aoi_grid = SpatialHash(AOI_CELL_TILES)   # char_id → (map_key, cx, cy)
+# 몬스터 어그로 후보 — 셀 = AGGRO_DIST² 타일, 몬스터 주변 3×3 셀만 확인 (AOI 와 같이 타일 변경 때 갱신)
+aggro_grid = SpatialHash(AGGRO_DIST)
+
+# world_delta — 이동/피격/디스폰을 tick 마다 맵(room)당 패킷 하나로 묶어 전송
+WORLD_DELTA_TICK = 0.05         # 50 ms
+world_deltas = WorldDeltaBuffer()
+
+# 캐릭터별 이동 직렬화 — 같은 캐릭터의 타일 변경/전투가 greenlet 사이에서 겹치지 않게
+move_mailbox = SerialExecutor()
+
+# 몬스터 복귀 경로 — (map, from, to) LRU / 추격은 타깃별 공유 flow field
+#   둘 다 맵 reload 시 그 맵만 폐기
+path_cache = PathCache()
+flow_fields = FlowFieldCache()
+map_registry.listeners.append(path_cache.invalidate)
+map_registry.listeners.append(flow_fields.invalidate)
+
+# 어그로 시야 — (몬스터 타일, 타깃 타일) 쌍별 Bresenham 결과, AGGRO_DIST 안만 캐시
+los_cache = LosCache(AGGRO_DIST)
+map_registry.listeners.append(los_cache.invalidate)
+
+# 속도 기반 이동(move_vel) — 키프레임 + 속도로 서버가 tick 마다 좌표 외삽
+motions = MotionTable()
+
+# 와이어 코덱 — join_map 의 wire 로 협상 (기본 JSON, bin1 = struct 바이너리)
+sid_wire: dict[str, str] = {}            # {sid: codec}
+player_handles  = HandleTable()          # char_id ↔ u16
+monster_handles = HandleTable()          # monster_id ↔ u16
+
+# 이동 검증 (컴파일된 격자가 있는 맵만) — 범위/충돌/속도. 위반은 Redis·DB 전에 거부
+MOVE_TILES_PER_SEC = MAX_SPEED / TILE   # 외삽과 같은 속도 상한
+MOVE_SLACK_TILES   = 2.0                # 패킷 몰림·타일 경계 반올림 여유
+
+# 소켓 입력 rate-limit — {event: (초당 허용 수, 버킷 크기)}, Redis/DB 이전에 검사
+#   move 는 클라이언트가 프레임마다 보내므로 60 Hz + 여유, 초과분은 버려도 latest-wins 로 무해
+INBOUND_LIMITS = {
+    'move':             (90.0, 180),
+    'move_vel':         (20.0, 40),     # 방향 전환 + 키프레임(4 Hz) 여유
+    'chat_message':     (2.0, 5),
+    'request_monsters': (1.0, 3),
+}
+inbound_limiter = SidRateLimiter(INBOUND_LIMITS)
+
+
+def aoi_room(cell: tuple[str, int, int], wire: str = WIRE_JSON) -> str:
+    map_key, cx, cy = cell
+    room = f"aoi_{map_key}_{cx}_{cy}"
+    return room if wire == WIRE_JSON else f"{room}_{wire}"
+
+
+def delta_room(map_key: str, wire: str = WIRE_JSON) -> str:
+    """맵 전체 world_delta 수신 room (코덱별로 분리)"""
+    return f"wd_{wire}_{map_key}"
+
+
+def player_dict(d: dict) -> dict:
+    """spawn 계열 패킷에 바이너리 핸들(h) 부여 — 접속 중(메모리 상태가 있는) 캐릭터만.
+    오프라인 캐릭터는 0: 움직이지 않으니 핸들이 필요 없고, disconnect 로 반납될 일도 없다"""
+    d['h'] = player_handles.handle(d['id']) if d['id'] in char_states else 0
+    return d
+
+
+def monster_dict(m: MonsterState) -> dict:
+    d = m.to_dict()
+    d['h'] = monster_handles.handle(m.id)
+    return d
+
+def _map_json_file(map_key: str) -> str | None:
+    """레지스트리가 처음 보는 맵 — Map.json_file 조회 (앱 컨텍스트 밖이면 <key>.json)"""
+    if not has_app_context():
+        return None
+    m = db.session.get(Map, map_key)
+    return m.json_file if m else None
+
+
+map_registry.resolve = _map_json_file
+
+HOT_MAPS = [k for k in os.environ.get("HOT_MAPS", "").split(",") if k]
+
+
+def warm_maps() -> list[str]:
+    """기동 시 미리 로드 — Map 행의 json_file 등록 후 몬스터가 있는 맵 + HOT_MAPS"""
+    for m in Map.query.all():
+        map_registry.set_source(m.key, m.json_file)
+    hot = {k for (k,) in db.session.query(Monster.map_key).distinct()}
+    return map_registry.warm(sorted(hot | set(HOT_MAPS)))
+
+
+def walkable_tiles(map_key: str) -> WalkGrid | None:
+    """통과 가능 타일 집합 — Tiled JSON 이 없는 맵은 None (검사 안 함)"""
+    cm = map_registry.find(map_key)
+    return cm.walk if cm is not None else None
+
 
-def get_layer(map_key:str):
-    if map_key not in tilemaps:
-        _, layer = get_tilemap(map_key)   # layer.data → 2-D list
-        tilemaps[map_key] = layer
-    return tilemaps[map_key]              # SimpleNamespace
+def invalid_tiles(map_key: str) -> list[tuple[int, int]]:
+    """컴파일된 트리거 섹션의 금단 타일 좌표 (Tiled JSON 이 없는 맵은 빈 목록)"""
+    cm = map_registry.find(map_key)
+    return cm.tiles_with_flag(TRIG_MONSTER_FORBIDDEN) if cm is not None else []
 
 
-def set_monster_tiles(map_key: str, monsters: list[Monster]) -> None:
+def trigger_table(map_key: str) -> TriggerTable:
+    """맵의 트리거 테이블 — 처음 한 번만 Map/NPC/레이어로 컴파일, 이후엔 메모리만"""
+    table = trigger_tables.get(map_key)
+    if table is None:
+        m = db.session.get(Map, map_key)
+        npcs = NPC.query.filter_by(map_key=map_key, is_active=True).all()
+        table = trigger_tables[map_key] = compile_triggers(
+            map_key, m.map_data if m else None, npcs, invalid_tiles(map_key),
+            npc_radius=NPC_NEAR_TILES)
+    return table
+
+
+def char_tile(c) -> tuple[int, int]:
+    """캐릭터 픽셀 좌표 → 타일"""
+    return int(c.x // TILE), int(c.y // TILE)
+
+
+def spawn_tile(tilemap: CompiledMap, m: MonsterState) -> tuple[int, int]:
+    """몬스터 스폰 타일 — 맵 수정으로 벽이 됐으면 가장 큰 연결 요소의 가까운 타일"""
+    spawn = (m.spawn_x, m.spawn_y)
+    if tilemap.component(*spawn):
+        return spawn
+    return tilemap.nearest_in_main(*spawn) or spawn
+
+
+def set_monster_tiles(map_key: str, monsters: list[MonsterState]) -> None:
+    """살아있는 몬스터 목록으로 (tx, ty) → monster_id 점유 인덱스 재구성"""
     _monster_tiles_by_map[map_key] = {
-        (m.x, m.y) for m in monsters if m.is_alive
+        (m.x, m.y): m.id for m in monsters if m.is_alive
     }
 
 
-def update_monster_tile(map_key: str, old_tile: tuple[int, int], new_tile: tuple[int, int] | None) -> None:
-    tiles = _monster_tiles_by_map.setdefault(map_key, set())
-    tiles.discard(old_tile)
+def update_monster_tile(map_key: str, mob_id: int,
+                        old_tile: tuple[int, int] | None,
+                        new_tile: tuple[int, int] | None) -> None:
+    """몬스터 하나의 점유 타일 이동 (None = 없음/사망)"""
+    tiles = _monster_tiles_by_map.setdefault(map_key, {})
+    if old_tile is not None and tiles.get(old_tile) == mob_id:
+        del tiles[old_tile]
     if new_tile is not None:
-        tiles.add(new_tile)
+        tiles[new_tile] = mob_id
+
+
+def monster_tiles(map_key: str) -> dict[tuple[int, int], int]:
+    """맵의 점유 인덱스 — 처음 한 번만 몬스터 상태에서 채우고 이후엔 증분 갱신"""
+    tiles = _monster_tiles_by_map.get(map_key)
+    if tiles is None:
+        set_monster_tiles(map_key, monster_states.alive(map_key))
+        tiles = _monster_tiles_by_map[map_key]
+    return tiles
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
     db.init_app(app)
+    app.extensions['char_states'] = char_states   # REST 블루프린트 동기화용
+    app.extensions['monster_states'] = monster_states
+    app.extensions['trigger_tables'] = trigger_tables
+    app.extensions['map_registry'] = map_registry
 
     cors_origins = os.environ.get("CORS_ORIGINS", "*")
     allowed_origins = cors_origins if cors_origins == "*" else [o.strip() for o in cors_origins.split(",")]
@@ -159,8 +379,10 @@ def create_app():
 
     @app.after_request
     def add_cache_headers(response):
-        """API GET 응답에 Cache-Control 헤더를 추가하여 브라우저 캐시 방지"""
-        if request.method == 'GET' and request.path.startswith('/api/'):
+        """API GET 응답에 Cache-Control 헤더를 추가하여 브라우저 캐시 방지
+        (맵 청크처럼 핸들러가 직접 캐시 정책을 정한 응답은 그대로)"""
+        if (request.method == 'GET' and request.path.startswith('/api/')
+                and 'Cache-Control' not in response.headers):
             response.headers['Cache-Control'] = 'no-store'
         return response
 
@@ -190,10 +412,27 @@ def create_app():
     # 백그라운드로 시작
     socketio.start_background_task(chat_listener)
 
+    # ──────────────────────────────────────────────────────────
+    # 입력 rate-limit 데코레이터 — 초과 시 I/O 없이 버리고 rl_<event> 카운트
+    # ──────────────────────────────────────────────────────────
+    def rate_limited(event: str):
+        def deco(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not inbound_limiter.allow(request.sid, event):
+                    key = f'rl_{event}'
+                    _move_debug[key] = _move_debug.get(key, 0) + 1
+                    flush_move_debug()
+                    return None
+                return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
     # ──────────────────────────────────────────────────────────
     # 클라이언트로부터 채팅 메시지 수신 핸들러
     # ──────────────────────────────────────────────────────────
     @socketio.on("chat_message")
+    @rate_limited("chat_message")
     @with_db_session
     def handle_chat_message(data):
         """
@@ -204,7 +443,10 @@ def create_app():
         """
         # 보낸 사람 이름 조회
         sender_id = data.get("sender_id")
-        char = db.session.get(Character, sender_id) if sender_id else None
+        # 접속 중이면 메모리 상태에서 이름만 꺼냄 (DB 스킵)
+        char = char_states.get(sender_id) if sender_id else None
+        if char is None and sender_id:
+            char = db.session.get(Character, sender_id)
         sender_name = char.name if char else "Unknown"
         msg = {
             "sender"   : sender_name,
@@ -220,69 +462,97 @@ def create_app():
         emit("chat_ack", {"ok": True})
 
     # ─────────────────────────────────────────────
-    #  🐾  몬스터 랜덤 이동 루프 (2초 간격)
+    #  🐾  몬스터 AI — 몬스터가 있는 맵마다 틱 태스크 하나 (utils.scheduler)
     # ─────────────────────────────────────────────
-    def monster_ai():
-        walkable = get_walkable("dungeon1")        # 캐시
-        while True:
-            socketio.sleep(2.0)
-            try:
-                with app.app_context():
-                    # dungeon1 맵의 캐릭터만 로드 (전체 로드 방지)
-                    # TODO: 다른 맵에 몬스터가 추가되면 map_key를 동적으로 처리해야 함
-                    chars = {c.id: c for c in Character.query.filter_by(map_key='dungeon1').all()}
-
-                    now  = time.time()
-
-                    # ── 0) 먼저 “죽은 몬스터 중 리스폰할 대상” 검사 ──
-                    dead_ready = (
-                        Monster.query.filter_by(is_alive=False, map_key='dungeon1')
-                        .filter(Monster.died_at.isnot(None))          # safety
-                        .all()
-                    )
-                    respawned = False
-                    for m in dead_ready:
-                        if now - m.died_at >= m.respawn_s:
-                            m.is_alive = True
-                            m.hp       = m.max_hp
-                            m.x, m.y   = m.spawn_x, m.spawn_y
-                            m.died_at  = None
-                            respawned = True
-                            socketio.emit('monster_spawn', m.to_dict(), room='map_dungeon1')
-
-                    # 리스폰 변경분을 즉시 커밋 — 이후 이동/전투 롤백에 영향받지 않도록
-                    if respawned:
-                        db.session.commit()
-
-                    # ── 1) 살아있는 몬스터 랜덤 이동 (기존 로직) ──
-
-                    mobs = Monster.query.filter_by(
-                        map_key="dungeon1", is_alive=True
-                    ).all()
-
-                    # ── ① 현재 점유 타일 set ──
-                    occupied: set[tuple[int, int]] = {(m.x, m.y) for m in mobs}
-
-                    shuffle(mobs)                       # 이동 순서 랜덤화
-                    for m in mobs:
-                        # ── ❌ 아직 넉백 쿨타임이면 건너뜀 ──
-                        if knockback_until.get(m.id, 0) > now:
-                            continue
-
+    def monster_tick(map_key: str) -> None:
+        """맵 하나의 몬스터 AI 한 틱 — 리스폰, 이동/추격, 공격"""
+        try:
+            with app.app_context():
+                # 틱마다 스냅샷 하나 — 도중에 관리자가 맵을 교체해도 이 틱은 이전 맵 그대로
+                tilemap  = map_registry.get(map_key)
+                walkable = tilemap.walk
+                # 접속 중 캐릭터는 메모리 상태(char_states), 어그로 후보는 aggro_grid 버킷만 — 맵 전체 순회 없음
+
+                now  = time.time()
+
+                # 몬스터는 메모리 상태 — 맵당 첫 틱에만 SELECT
+                everyone = monster_states.on_map(map_key)
+
+                # ── 0) 먼저 “죽은 몬스터 중 리스폰할 대상” 검사 ──
+                respawned = []
+                for m in everyone:
+                    if (not m.is_alive and m.died_at is not None
+                            and now - m.died_at >= m.respawn_s):
+                        m.is_alive = True
+                        m.hp       = m.max_hp
+                        m.x, m.y   = spawn_tile(tilemap, m)
+                        m.died_at  = None
+                        m.target_char_id = None
+                        respawned.append(m.id)
+                        update_monster_tile(map_key, m.id, None, (m.x, m.y))
+                        socketio.emit('monster_spawn', monster_dict(m), room=f'map_{map_key}')
+
+                # 리스폰은 드물고 중요 → 즉시 기록 (이동/피격은 체크포인트 때)
+                if respawned:
+                    monster_states.flush(respawned)
+
+                # ── 1) 살아있는 몬스터 랜덤 이동 (기존 로직) ──
+                mobs = [m for m in everyone if m.is_alive]
+
+                # ── ① 현재 점유 타일 set ──
+                occupied: set[tuple[int, int]] = {(m.x, m.y) for m in mobs}
+
+                shuffle(mobs)                       # 이동 순서 랜덤화
+                for m in mobs:
+                    # ── ❌ 아직 넉백 쿨타임이면 건너뜀 ──
+                    if entities.knocked_back(m.id, now):
+                        continue
+
+                    here = (m.x, m.y)
+                    home = spawn_tile(tilemap, m)
+
+                    # ── 리쉬: 스폰에서 너무 멀어지면 타깃 버리고 복귀 ──
+                    if (entities.returning(m.id)
+                            or hypot(m.x - m.spawn_x, m.y - m.spawn_y) > LEASH_DIST):
+                        m.target_char_id = None
+                        if not tilemap.reachable(here, home):
+                            step = None              # 걸어서 못 감 → 탐색 없이 스폰으로 옮김
+                            update_monster_tile(map_key, m.id, here, home)
+                            m.x, m.y = home
+                            world_deltas.monster_move(map_key, m.id, m.x, m.y)
+                            here = home
+                        else:
+                            step = path_cache.next_step(map_key, walkable, here, home)
+                        if step is None:             # 도착 (또는 돌아갈 길 없음)
+                            entities.end_return(m.id)
+                            nx, ny = here
+                        else:
+                            entities.start_return(m.id)
+                            nx, ny = step if step not in occupied else here
+                        target = None
+                    else:
                         # ── 타깃 선정 ─────────────────────
-                        target = chars.get(m.target_char_id) if m.target_char_id else None
-                        if (not target) or target.map_key != m.map_key or target.hp <= 0:
+                        target = char_states.get(m.target_char_id) if m.target_char_id else None
+                        if ((not target) or target.map_key != m.map_key or target.hp <= 0
+                                or not tilemap.reachable(here, char_tile(target))):
                             # 새로 찾아본다
                             target = None
-                            for c in chars.values():
+                            for cid in aggro_grid.query_tiles(map_key, m.x, m.y, AGGRO_DIST):
+                                c = char_states.get(cid)
                                 # 좌표가 없으면 무시
+                                if c is None:
+                                    continue
                                 if c.x is None or c.y is None:
                                     app.logger.warning("null coord in chars: id=%s", c.id)
                                     continue
                                 if c.map_key != m.map_key or c.hp <= 0:
                                     continue
-                                if hypot(c.x/TILE - m.x, c.y/TILE - m.y) <= AGGRO_DIST:
-                                    target = c
+                                # 벽으로 막힌 곳(다른 연결 요소)의 플레이어는 후보에서 제외
+                                if not tilemap.reachable(here, char_tile(c)):
+                                    continue
+                                if (hypot(c.x/TILE - m.x, c.y/TILE - m.y) <= AGGRO_DIST
+                                        and los_cache.visible(map_key, walkable, here, char_tile(c))):
+                                    target = c               # 벽 너머 플레이어는 인식 못 함
                                     break
                             m.target_char_id = target.id if target else None
 
@@ -292,144 +562,349 @@ def create_app():
 
                         # ── 이동 (타깃이 없으면 랜덤) ────
                         if target:
-                            # 한 칸 이동을 위해 x/y 차이 정규화
-                            dx = 1 if target.x/TILE > m.x else -1 if target.x/TILE < m.x else 0
-                            dy = 1 if target.y/TILE > m.y else -1 if target.y/TILE < m.y else 0
-                            cand = [
-                                (m.x+dx, m.y) if dx else None,
-                                (m.x, m.y+dy) if dy else None
-                            ]
-                            cand = [p for p in cand if p and p in walkable and p not in occupied]
-                            if cand:
-                                nx, ny = cand[0]         # 우선순위 하나만
+                            # 타깃별 공유 flow field — 타깃이 타일을 옮길 때만 BFS, 몬스터는 이웃 비교만
+                            goal  = char_tile(target)
+                            field = flow_fields.get(map_key, walkable, target.id, goal)
+                            step  = field.next_step(walkable, m.x, m.y, occupied)
+                            if field.distance(m.x, m.y) is None:
+                                m.target_char_id = None      # 갈 수 없는 타깃 → 다음 틱에 다시 선정
+                            if step is not None and step not in occupied:
+                                nx, ny = step
                             else:
-                                nx, ny = m.x, m.y        # 못 움직임
+                                nx, ny = here            # 도착했거나 더 가까운 칸을 다른 몬스터가 막음
                         else:
                             # 기존 랜덤 이동
                             # ── ② 네 방향 후보 중 walkable ∩ not-occupied ──
-                            cand = [
-                                (m.x + 1, m.y),
-                                (m.x - 1, m.y),
-                                (m.x, m.y + 1),
-                                (m.x, m.y - 1),
-                            ]
-                            cand = [p for p in cand if p in walkable and p not in occupied]
+                            cand = [p for p in walkable.neighbors(m.x, m.y) if p not in occupied]
 
                             if not cand:                 # 사면이 막혀 있으면
-                                nx, ny = m.x, m.y        # 그냥 가만히 두기
+                                nx, ny = here            # 그냥 가만히 두기
                             else:
                                 nx, ny = choice(cand)
-                        
-                        if (nx, ny) != (m.x, m.y):
-                            occupied.discard((m.x, m.y))
-                            occupied.add((nx, ny))
-                            m.x, m.y = nx, ny
-                            socketio.emit('monster_move',
-                                        {"id": m.id, "x": nx, "y": ny},
-                                        room="map_dungeon1")
-
-                        # ── 공격 판정 ───────────────────
-                        if target and hypot(target.x/TILE - m.x, target.y/TILE - m.y) <= ATK_RANGE:
-                            dmg = max(1, m.attack - target.dex)   # 방어 대신 DEX 사용 예시
-                            with db.session.no_autoflush:
-                                target.hp -= dmg
-
-                            # --- NEW:  0 보다 작으면 0 으로 보정 + 죽음 판정 ---
-                            if target.hp <= 0:
-                                target.hp = 0
-                                dead = True
-                                _last_tile.pop(target.id, None)
-                            else:
-                                dead = False
-                            # ----------------------------------------------------
-
-                            # 데미지 브로드캐스트
-                            socketio.emit('player_hit', {
-                                "id": target.id, "dmg": dmg, "hp": target.hp
-                            }, room=f"map_{target.map_key}")
-
-                            # HP <=0  이면 사망 처리
-                            if dead:
-                                prev_map = target.map_key          # ① 기존 방 보관
-                                # 드롭 아이템(카테고리 drop) 전부 삭제
-                                with db.session.no_autoflush:          # ← ★ 중요
-                                    for ci in list(target.items):
-                                        if ci.item.category == 'drop':
-                                            db.session.delete(ci)
-
-                                # ② 리스폰 좌표/맵으로 이동
-                                target.hp  = target.max_hp // 2
-                                target.map_key, target.x, target.y = RESPAWN_POS
+
+                    if (nx, ny) != (m.x, m.y):
+                        occupied.discard((m.x, m.y))
+                        occupied.add((nx, ny))
+                        update_monster_tile(map_key, m.id, (m.x, m.y), (nx, ny))
+                        m.x, m.y = nx, ny
+                        world_deltas.monster_move(map_key, m.id, nx, ny)
+
+                    # ── 공격 판정 ───────────────────
+                    if target and hypot(target.x/TILE - m.x, target.y/TILE - m.y) <= ATK_RANGE:
+                        dmg = max(1, m.attack - target.dex)   # 방어 대신 DEX 사용 예시
+                        target.set(hp=target.hp - dmg)        # 메모리만 갱신 (배치 flush)
+
+                        # --- NEW:  0 보다 작으면 0 으로 보정 + 죽음 판정 ---
+                        if target.hp <= 0:
+                            target.set(hp=0)
+                            dead = True
+                            if (sess := sessions.get(target.id)) is not None:
+                                sess.last_tile = None
+                                # 리스폰 타일에서 속도 검사 다시 시작 (None 이면 첫 이동이 검사를 건너뜀)
+                                sess.move_tile, sess.move_at = RESPAWN_POS, time.time()
+                        else:
+                            dead = False
+                        # ----------------------------------------------------
+
+                        # 데미지 브로드캐스트
+                        world_deltas.player_hit(target.map_key, {
+                            "id": target.id, "dmg": dmg, "hp": target.hp
+                        })
+
+                        # HP <=0  이면 사망 처리
+                        if dead:
+                            prev_map = target.map_key          # ① 기존 방 보관
+                            # 사망은 드물고 중요 → 즉시 DB 기록 (write-through)
+                            char_row = db.session.get(Character, target.id)
+                            # 드롭 아이템(카테고리 drop) 전부 삭제
+                            with db.session.no_autoflush:          # ← ★ 중요
+                                for ci in list(char_row.items if char_row else []):
+                                    if ci.item.category == 'drop':
+                                        db.session.delete(ci)
+
+                            # ② 리스폰 좌표/맵으로 이동
+                            resp_map, resp_x, resp_y = RESPAWN_POS
+                            target.set(hp=target.max_hp // 2,
+                                       map_key=resp_map, x=resp_x, y=resp_y)
+                            written: set[str] = set()
+                            if char_row:
+                                target.sync_to(char_row)
+                                # 기록한 dirty 만 떼어 둠 — commit I/O 중 들어온 변경은 다음 flush 로
+                                written, target.dirty = target.dirty, set()
+                            try:
                                 db.session.commit()
-                                resp_pkt = {                           # ② 공통 패킷
-                                    "id"     : target.id,
-                                    "map_key": target.map_key,
-                                    "x"      : target.x*TILE + TILE/2,
-                                    "y"      : target.y*TILE + TILE/2,
-                                    "hp"     : target.hp
-                                }
-                                print(resp_pkt)
-                                socketio.emit('player_respawn', resp_pkt, room=f'map_{prev_map}')
-
-                                target_sid = get_sid_by_char(target.id)
-                                print(target_sid)
-                                if target_sid:
-                                    # ① 이전 방 모든 플레이어에게 despawn (잔상 제거)
-                                    socketio.emit(
-                                        'player_despawn', {'id': target.id},
-                                        room=f'map_{prev_map}', namespace='/'
-                                    )
-                                    # ② 해당 플레이어(본인)에게만 respawn
-                                    socketio.emit(
-                                        'player_respawn', resp_pkt,
-                                        to=target_sid, namespace='/'
-                                    )
-                                    # ③ 새 방 플레이어들에게 spawn (본인 제외)
-                                    socketio.emit(
-                                        'player_spawn', resp_pkt,
-                                        room=f'map_{target.map_key}', skip_sid=target_sid,
-                                        namespace='/'
-                                    )
-                                else:
-                                    # 오프라인 상태면 최소 despawn만
-                                    socketio.emit(
-                                        'player_despawn', {'id': target.id},
-                                        room=f'map_{prev_map}', namespace='/'
-                                    )
-
-                        # ─── ❶ 금단 타일 체크 & 강제 리스폰 ───
-                        layer = get_layer(m.map_key)          # SimpleNamespace
-                        gid   = layer.data[m.y][m.x]          # ← int gid
-                        if gid == INVALID_TILE_ID:            # 객체가 아니라 gid 비교
-                            m.x, m.y = m.spawn_x, m.spawn_y
-                            knockback_until.pop(m.id, None)   # (선택) 넉백 쿨타임 해제
-                            socketio.emit('monster_move', {
-                                'id': m.id, 'x': m.x, 'y': m.y
-                            }, room=f'map_{m.map_key}')
-
-                    set_monster_tiles('dungeon1', mobs)
-                    db.session.commit()
+                            except Exception:
+                                target.dirty |= written
+                                raise
+                            resp_pkt = {                           # ② 공통 패킷
+                                "id"     : target.id,
+                                "h"      : player_handles.handle(target.id),
+                                "map_key": target.map_key,
+                                "x"      : target.x*TILE + TILE/2,
+                                "y"      : target.y*TILE + TILE/2,
+                                "hp"     : target.hp
+                            }
+                            print(resp_pkt)
+                            # 치명타 player_hit 이 respawn 보다 늦게 도착하지 않도록 먼저 내보냄
+                            motions.stop(target.id)        # 외삽이 리스폰 좌표를 덮지 않게
+                            world_deltas.drop_player(prev_map, target.id)
+                            flush_world_deltas(prev_map)
+                            socketio.emit('player_respawn', resp_pkt, room=f'map_{prev_map}')
+
+                            target_sid = char_sid.get(target.id)
+                            print(target_sid)
+                            if target_sid:
+                                # AOI 셀도 리스폰 타일로 옮김 (RESPAWN_POS 는 타일 좌표)
+                                aoi_place(target.id, target_sid, resp_map, resp_x, resp_y)
+                                # ① 이전 방 모든 플레이어에게 despawn (잔상 제거)
+                                socketio.emit(
+                                    'player_despawn', {'id': target.id},
+                                    room=f'map_{prev_map}', namespace='/'
+                                )
+                                # ② 해당 플레이어(본인)에게만 respawn
+                                socketio.emit(
+                                    'player_respawn', resp_pkt,
+                                    to=target_sid, namespace='/'
+                                )
+                                # ③ 새 방 플레이어들에게 spawn (본인 제외)
+                                socketio.emit(
+                                    'player_spawn', resp_pkt,
+                                    room=f'map_{target.map_key}', skip_sid=target_sid,
+                                    namespace='/'
+                                )
+                            else:
+                                # 오프라인 상태면 최소 despawn만
+                                socketio.emit(
+                                    'player_despawn', {'id': target.id},
+                                    room=f'map_{prev_map}', namespace='/'
+                                )
+
+                    # ─── ❶ 금단 타일 체크 & 강제 리스폰 ───
+                    # 같은 틱 스냅샷의 컴파일된 트리거 플래그 (gid 레이어 재검사 없음)
+                    if tilemap.flags(m.x, m.y) & TRIG_MONSTER_FORBIDDEN:
+                        spawn = spawn_tile(tilemap, m)
+                        update_monster_tile(m.map_key, m.id, (m.x, m.y), spawn)
+                        m.x, m.y = spawn
+                        entities.forget(m.id)             # (선택) 넉백 쿨타임 해제
+                        world_deltas.monster_move(m.map_key, m.id, m.x, m.y)
+
+                set_monster_tiles(map_key, mobs)
+        except Exception:
+            app.logger.exception("monster_ai 틱 예외 (%s) — 다음 틱 계속", map_key)
+            with app.app_context():        # 롤백도 컨텍스트 안에서
+                db.session.rollback()
+        finally:
+            with app.app_context():
+                db.session.remove()
+
+    def random_step(x: int, y: int, walkable: WalkGrid):
+        cand = walkable.neighbors(x, y)
+        return choice(cand) if cand else (x, y)
+
+    def monster_maps() -> list[str]:
+        """몬스터가 있고 충돌 격자(Tiled JSON)도 있는 맵 — 격자 없는 맵은 AI 를 돌릴 수 없음"""
+        keys = {k for (k,) in db.session.query(Monster.map_key).distinct()}
+        return sorted(k for k in keys if map_registry.find(k) is not None)
+
+    # 맵마다 독립 틱 태스크 — 한 맵의 틱이 길어져도 다른 맵 주기는 그대로
+    world_ticks = WorldScheduler(socketio.start_background_task, socketio.sleep)
+    world_ticks.on_error = lambda key, e: app.logger.error("monster_tick(%s) 예외: %r", key, e)
+
+    def monster_supervisor():
+        while True:
+            try:
+                with app.app_context():
+                    world_ticks.sync(monster_maps(), monster_tick_period, monster_tick)
             except Exception:
-                app.logger.exception(
-                    "monster_ai 루프 예외 — 루프 계속 진행"
-                )
-                with app.app_context():        # 롤백도 컨텍스트 안에서
-                    db.session.rollback()
+                app.logger.exception("몬스터 맵 스캔 실패 — 다음 스캔 때 재시도")
             finally:
                 with app.app_context():
                     db.session.remove()
-
-    def random_step(x: int, y: int, walkable: set[tuple[int,int]]):
-        cand = [(x+1,y), (x-1,y), (x,y+1), (x,y-1)]
-        cand = [p for p in cand if p in walkable]
-        return choice(cand) if cand else (x, y)
+            socketio.sleep(MONSTER_MAP_SCAN)
 
     # Flask-SocketIO 의 헬퍼로 백그라운드 태스크 시작
-    socketio.start_background_task(monster_ai)
+    socketio.start_background_task(monster_supervisor)
+    app.monster_tick = monster_tick
+    app.monster_maps = monster_maps
+    app.world_ticks  = world_ticks
+
+    # ─────────────────────────────────────────────
+    #  💾  캐릭터 상태 write-behind flush 루프
+    # ─────────────────────────────────────────────
+    def flush_char_states():
+        """dirty 캐릭터 상태를 한 번의 bulk UPDATE 로 기록 (종료 시에도 호출)"""
+        try:
+            with app.app_context():
+                char_states.flush()
+        except Exception:
+            app.logger.exception("캐릭터 상태 flush 실패 — 다음 주기에 재시도")
+        finally:
+            with app.app_context():
+                db.session.remove()
+
+    def char_state_flusher():
+        while True:
+            socketio.sleep(CHAR_FLUSH_INTERVAL)
+            flush_char_states()
+            # disconnect 를 놓친 세션 회수 — 바인딩된 캐릭터만 남긴다
+            sessions.sweep(char_sid)
+
+    socketio.start_background_task(char_state_flusher)
+    app.flush_char_states = flush_char_states      # __main__ 종료 훅용
+
+    # ─────────────────────────────────────────────
+    #  💾  몬스터 상태 체크포인트 — 이동/피격 HP 는 이 주기로만 DB 기록
+    # ─────────────────────────────────────────────
+    def checkpoint_monsters():
+        try:
+            with app.app_context():
+                monster_states.flush()
+        except Exception:
+            app.logger.exception("몬스터 체크포인트 실패 — 다음 주기에 재시도")
+        finally:
+            with app.app_context():
+                db.session.remove()
+
+    def monster_checkpointer():
+        while True:
+            socketio.sleep(MONSTER_CHECKPOINT_INTERVAL)
+            checkpoint_monsters()
+
+    socketio.start_background_task(monster_checkpointer)
+    app.checkpoint_monsters = checkpoint_monsters  # __main__ 종료 훅용
+
+    # ────────────────────────────────────────────────
+    #  AOI — 셀 room 관리
+    # ────────────────────────────────────────────────
+    def aoi_place(char_id: int, sid: str, map_key: str, tx: int, ty: int) -> None:
+        """타일 좌표로 AOI 셀 갱신 — 셀이 바뀌면 셀 room 도 갈아탐"""
+        aggro_grid.update(char_id, map_key, tx, ty)
+        old = aoi_grid.update(char_id, map_key, tx, ty)
+        new = aoi_grid.cell_of(char_id)
+        if old == new:
+            return
+        wire = sid_wire.get(sid, WIRE_JSON)
+        if old is not None:
+            leave_room(aoi_room(old, wire), sid=sid, namespace='/')
+        join_room(aoi_room(new, wire), sid=sid, namespace='/')
+
+    def queue_player_move(char_id: int, map_key: str, px, py) -> None:
+        """최신 좌표만 버퍼에 남김 — 실제 전송은 flush_world_deltas 가 tick 마다"""
+        world_deltas.player_move(map_key, char_id, px, py)
+
+    # ────────────────────────────────────────────────
+    #  world_delta — tick 단위 배치 전송
+    # ────────────────────────────────────────────────
+    def bin_world_delta(payload: dict) -> bytes | dict:
+        try:
+            return encode_world_delta(payload, player_handles, monster_handles)
+        except WireError:
+            return payload                    # 표현 불가 → 이번 패킷만 JSON
+
+    def emit_world_delta(payload: dict, json_room: str, bin_room: str, has_bin: bool,
+                         movers=()) -> None:
+        """JSON room 과 bin1 room 에 각각 한 번씩 (bin1 인코딩은 수신자가 있을 때만).
+        movers: 이 room 에 있고 payload 에 자기 이동이 실린 캐릭터 — 자기 이동은 되돌려 보내지 않음
+        (room 전송에서 빼고, 남은 내용이 있으면 자기 이동만 뺀 사본을 따로)"""
+        skip = [sid for cid in movers if (sid := char_sid.get(cid)) is not None]
+        socketio.emit('world_delta', payload, room=json_room, skip_sid=skip or None, namespace='/')
+        if has_bin:
+            socketio.emit('world_delta', bin_world_delta(payload), room=bin_room,
+                          skip_sid=skip or None, namespace='/')
+        for cid in movers:
+            sid = char_sid.get(cid)
+            if sid is None:
+                continue
+            own = {**payload, 'players': [m for m in payload['players'] if m[0] != cid]}
+            if not own['players']:
+                del own['players']
+            if len(own) > 1:
+                socketio.emit('world_delta',
+                              bin_world_delta(own) if sid_wire.get(sid) == WIRE_BIN else own,
+                              to=sid, namespace='/')
+
+    def flush_world_deltas(only_map: str | None = None) -> None:
+        """맵별 누적분을 room 당 world_delta 1개로 전송.
+        - 몬스터 이동/피격/디스폰 + 시야 밖 플레이어 → 맵 delta room
+        - 시야 안 플레이어 이동 → 수신 셀 room 마다 주변 셀 이동만 모아서"""
+        now = time.time()
+        has_bin = WIRE_BIN in sid_wire.values()
+        map_keys = [only_map] if only_map else world_deltas.map_keys()
+        for map_key in map_keys:
+            delta = world_deltas.take(map_key)
+            if delta is None:
+                continue
+
+            payload = delta.map_payload(map_key)
+            far: list[list] = []
+            near_by_cell: dict[tuple[str, int, int], list[list]] = {}
+            for char_id, (px, py) in delta.players.items():
+                sess = sessions.touch(char_id)
+                if now - sess.last_move_sent < MOVE_SEND_INTERVAL:
+                    # 120 ms 미만이면 버리지 않고 다음 tick 으로 이월 (정지 위치 유실 방지)
+                    world_deltas.player_move(map_key, char_id, px, py)
+                    continue
+                sess.last_move_sent = now
+                move = [char_id, px, py]
+
+                cell = aoi_grid.cell_of(char_id)
+                if cell is None or cell[0] != map_key:
+                    far.append(move)          # 아직 격자에 없으면 맵 전체
+                    continue
+                if now - sess.last_far_sent >= FAR_MOVE_INTERVAL:
+                    # 맵 전체 패킷에 실리면 시야 안 플레이어도 받으므로 셀 패킷에선 뺀다
+                    sess.last_far_sent = now
+                    far.append(move)
+                else:
+                    near_by_cell.setdefault(cell, []).append(move)
+
+            if far:
+                payload['players'] = far
+            if len(payload) > 1:
+                # 맵 delta room 에는 지금 이 맵에 있는 캐릭터만 들어 있음
+                movers = [m[0] for m in far if on_current_map(m[0], map_key)]
+                emit_world_delta(payload, delta_room(map_key), delta_room(map_key, WIRE_BIN), has_bin,
+                                 movers=movers)
+
+            # 이동한 셀 주변 중 실제로 누가 있는 셀 room 에만
+            targets = {
+                c for cell in near_by_cell
+                for c in aoi_grid.cells_around(cell, AOI_RADIUS)
+                if aoi_grid.occupied(c)
+            }
+            for c in targets:
+                moves = [
+                    m for n in aoi_grid.cells_around(c, AOI_RADIUS)
+                    for m in near_by_cell.get(n, ())
+                ]
+                # 셀 c 에서 움직인 캐릭터 = 이 셀 room 에 있는 발신자 → 자기 이동은 빼고
+                emit_world_delta({'map_key': map_key, 'players': moves},
+                                 aoi_room(c), aoi_room(c, WIRE_BIN), has_bin,
+                                 movers=[m[0] for m in near_by_cell.get(c, ())])
+
+    def world_delta_pump():
+        while True:
+            socketio.sleep(WORLD_DELTA_TICK)
+            try:
+                if len(motions):
+                    with app.app_context():
+                        advance_motions()
+                flush_world_deltas()
+            except Exception:
+                app.logger.exception("world_delta 전송 실패 — 다음 tick 에 계속")
+
+    socketio.start_background_task(world_delta_pump)
+    app.flush_world_deltas = flush_world_deltas
 
     @socketio.on('connect')
-    def on_connect():
+    def on_connect(auth=None):
+        """auth={'token': /auth/login 토큰} 또는 같은 origin 의 Flask 세션으로 계정 확인"""
         print('◆ socket connected', request.sid)      # ★ 반드시 떠야 함
+        uid = verify_token(auth.get('token')) if isinstance(auth, dict) else None
+        if uid is None:
+            uid = session.get('user_id')
+        if uid is not None:
+            sid_user[request.sid] = uid
 
     # ────────────────────────────────────────────────
     # ① 맵 입장
@@ -438,17 +913,32 @@ def create_app():
     def handle_join_map(data):
         sid        = request.sid
         char_id    = data['character_id']
-        _last_tile.pop(char_id, None)
+        # 인증: connect 때 못 했으면 join_map 의 token 으로도 가능
+        uid = verify_token(data.get('token'))
+        if uid is not None:
+            sid_user[sid] = uid
+        if sid not in sid_user:
+            emit('auth_error', {'reason': 'unauthenticated'}, to=sid)
+            return
         req_map    = data.get('map_key')
-        # 0) 로드 & DB 반영
+        # 소유권 확인 전에는 남의 캐릭터 상태(외삽/세션/dirty)를 건드리지 않음
         char:Character = db.session.get(Character, char_id)
         if not char:
             return
+        if char.user_id != sid_user[sid]:
+            emit('auth_error', {'reason': 'not_owner'}, to=sid)
+            return
+        motions.stop(char_id)                # 맵 입장 = 새 키프레임 전까지 정지
+        sessions.open(char_id, sid)          # 타일 캐시 초기화 (맵이 바뀌었을 수 있음)
+        # 0) 메모리에 남은 변경분 먼저 기록 → commit 으로 char 만료, 아래에서 최신 값 재로드
+        char_states.flush([char_id])
         if req_map and req_map != char.map_key:
             char.map_key = req_map
             db.session.commit()
+        char_states.adopt(char)
         cur_map = char.map_key
-        char_d  = char.to_dict()
+        char_d  = player_dict(char.to_dict())
+        wire    = negotiate(data.get('wire'))
 
         # 1) 이전 방에서 despawn + leave
         prev_map = get_map_by_sid(sid)
@@ -458,22 +948,45 @@ def create_app():
                 room=f'map_{prev_map}', namespace='/'
             )
             leave_room(f'map_{prev_map}')
+        old_wire = sid_wire.get(sid)
+        if prev_map and (prev_map != cur_map or old_wire != wire):
+            leave_room(delta_room(prev_map, old_wire or WIRE_JSON))
+        if old_wire is not None and old_wire != wire:
+            # 코덱이 바뀌면 AOI 셀 room 도 새 코덱으로 다시 가입
+            if (cell := aoi_grid.remove(char_id)) is not None:
+                leave_room(aoi_room(cell, old_wire))
+        sid_wire[sid] = wire
 
         # 2) 새 방 join + Redis 갱신
         join_room(f'map_{cur_map}')
+        join_room(delta_room(cur_map, wire))
         bind_char_sid(char_id, sid, cur_map)
+        bind_local(sid, char_id)             # move 소유권은 이 로컬 바인딩으로만 검사
+        join_tile = (int((char.x or 0) // TILE), int((char.y or 0) // TILE))
+        aoi_place(char_id, sid, cur_map, *join_tile)
+        sess = sessions.touch(char_id)       # 이동 속도 검사는 입장 좌표에서 시작
+        sess.move_tile, sess.move_at = (cur_map, *join_tile), time.time()
 
         # 3) 자기 자신에게 초기 상태 푸시
         players  = Character.query.filter_by(map_key=cur_map).all()
-        monsters = Monster.query.filter_by(map_key=cur_map, is_alive=True).all()
+        monsters = monster_states.alive(cur_map)   # 맵당 첫 입장 때만 SELECT
         set_monster_tiles(cur_map, monsters)
-        emit('current_players',  [p.to_dict() for p in players],  to=sid)
-        emit('current_monsters', [m.to_dict() for m in monsters], to=sid)
+        # 맵 로드 시 트리거 컴파일 (이후 이동은 메모리만) — 입장 타일이 NPC 근처면 바로 알림
+        set_near_npc(char_id, sid, next((t.npc_id for t in trigger_table(cur_map).at(*join_tile)
+                                         if t.kind == NPC_NEAR), None))
+        # DB 좌표는 flush 주기만큼 늦을 수 있으므로 접속 중 상태로 덮어씀
+        players_d = []
+        for p in players:
+            st = char_states.get(p.id)
+            players_d.append(player_dict(st.overlay(p.to_dict()) if st else p.to_dict()))
+        emit('wire_ack', {'wire': wire, 'h': char_d['h']}, to=sid)
+        emit('current_players',  players_d,  to=sid)
+        emit('current_monsters', [monster_dict(m) for m in monsters], to=sid)
 
         # 4) 새로 들어온 클라이언트에게 다른 플레이어들 spawn
-        for p in players:
-            if p.id != char_id:
-                emit('player_spawn', p.to_dict(), to=sid)
+        for p in players_d:
+            if p['id'] != char_id:
+                emit('player_spawn', p, to=sid)
 
         # 5) 나를 다른 클라이언트들에게 spawn
         socketio.emit(
@@ -483,48 +996,86 @@ def create_app():
 
     # ── 몬스터 동기화 요청 (주기적 폴링 대응)
     @socketio.on('request_monsters')
+    @rate_limited('request_monsters')
     @with_db_session
     def handle_request_monsters(data):
         map_key = data.get('map_key')
         if not map_key:
             return
-        monsters = Monster.query.filter_by(map_key=map_key, is_alive=True).all()
+        monsters = monster_states.alive(map_key)
         set_monster_tiles(map_key, monsters)
-        emit('current_monsters', [m.to_dict() for m in monsters])
+        emit('current_monsters', [monster_dict(m) for m in monsters])
+
+    def set_near_npc(char_id: int, sid: str, npc_id: int | None) -> None:
+        """근접 NPC 가 바뀔 때만 본인에게 npc_near (타일 경계에서만 호출 — 매 프레임 거리 계산 없음)"""
+        sess = sessions.touch(char_id)
+        if sess.near_npc != npc_id:
+            sess.near_npc = npc_id
+            socketio.emit('npc_near', {'npc_id': npc_id}, to=sid, namespace='/')
 
     # ② 이동 — inner (타일 변경 시에만 DB 접근)
     @with_db_session
-    def _handle_move_tile_change(char_id, new_map, new_px, new_py, tx, ty):
-        """타일 변경 시 DB 조회/커밋 + 몬스터 전투 처리.
+    def _handle_move_tile_change(char_id, new_map, new_px, new_py, tx, ty, sid):
+        """타일 변경 시 상태 갱신(커밋 없음) + 몬스터 전투 처리.
         True=캐시 가능(몬스터 없음), False=캐시 금지(전투/에러)."""
-        char: Character = db.session.get(Character, char_id)
+        char = char_states.load(char_id)     # 접속 중이면 DB 조회 없음
         if not char or char.hp <= 0:
             return False
 
-        char.map_key, char.x, char.y = new_map, new_px, new_py
-        db.session.commit()
-
-        # 이동 패킷 rate-limit
-        now = time.time()
-        if now - last_move_sent.get(char_id, 0) >= 0.12:   # 120 ms
-            emit('player_move', {'id': char_id,
-                                'x': new_px, 'y': new_py},
-                room=f"map_{new_map}", include_self=False)
-            last_move_sent[char_id] = now
-
-        # ── 1. 해당 타일에 살아있는 몬스터 탐색 ──────────────────
-        mob: Monster | None = (
-            Monster.query
-                .filter_by(map_key=new_map,
-                            x=tx, y=ty,
-                            is_alive=True)
-                .first()
-        )
-        if not mob:
-            update_monster_tile(new_map, (tx, ty), None)
-            update_sid_map(request.sid, char.map_key)
+        # ── 0. 타일 트리거 (컴파일된 테이블 — JSON 파싱/DB 없음) ──
+        npc_id = None
+        mob_free = False
+        for trig in trigger_table(new_map).at(tx, ty):
+            if trig.kind == INVALID:
+                # 몬스터 금단 타일 — 플레이어는 통과 가능, 몬스터는 AI 가 스폰으로 되돌림
+                mob_free = True
+            elif trig.kind == TELEPORT:
+                # 포탈 → 서버가 도착 좌표를 확정, 클라이언트는 join_map 으로 방 이동
+                char.set(map_key=trig.to_map,
+                         x=(trig.to_x + 0.5) * TILE, y=(trig.to_y + 0.5) * TILE)
+                _move_debug['teleport'] = _move_debug.get('teleport', 0) + 1
+                # 도착 타일에서 속도 검사 다시 시작 — 이전 맵 타일이 남으면 첫 이동이 검사를 건너뜀
+                sess = sessions.touch(char_id)
+                sess.move_tile, sess.move_at = (trig.to_map, trig.to_x, trig.to_y), time.time()
+                sess.near_npc = None                 # 새 맵 근접 NPC 는 join_map 이 다시 알림
+                motions.stop(char_id)
+                socketio.emit('teleport', {'map_key': trig.to_map,
+                                           'x': trig.to_x, 'y': trig.to_y},
+                              to=sid, namespace='/')
+                return False
+            elif trig.kind == NPC_NEAR and npc_id is None:
+                npc_id = trig.npc_id
+        set_near_npc(char_id, sid, npc_id)
+
+        # 좌표는 메모리만 갱신 — flush 루프가 주기적으로 배치 기록
+        char.set(map_key=new_map, x=new_px, y=new_py)
+
+        # AOI 셀 갱신 → 이동은 world_delta 버퍼로 (tick 마다 전송)
+        aoi_place(char_id, sid, new_map, tx, ty)
+        queue_player_move(char_id, new_map, new_px, new_py)
+
+        # ── 1. 해당 타일에 살아있는 몬스터 탐색 (점유 인덱스 → 메모리 상태) ──
+        tiles = monster_tiles(new_map)
+        mob_id = None if mob_free else tiles.get((tx, ty))
+        if mob_id is None:
+            update_sid_map(sid, char.map_key)
             return True
 
+        mob = monster_states.get(mob_id)
+        if not (mob and mob.is_alive and mob.map_key == new_map and (mob.x, mob.y) == (tx, ty)):
+            # 인덱스가 낡음 → 이 맵의 메모리 상태로 타일 확인 후 보정
+            update_monster_tile(new_map, mob_id, (tx, ty), None)
+            mob = next((m for m in monster_states.alive(new_map) if (m.x, m.y) == (tx, ty)), None)
+            if not mob:
+                # 맵 로드 뒤에 추가된 행만 DB 로 확인 (이미 로드된 몬스터는 메모리가 최신)
+                rows = Monster.query.filter_by(map_key=new_map, x=tx, y=ty, is_alive=True).all()
+                row = next((r for r in rows if monster_states.get(r.id) is None), None)
+                mob = monster_states.adopt(row) if row else None
+            if not mob:
+                update_sid_map(sid, char.map_key)
+                return True
+            update_monster_tile(new_map, mob.id, None, (tx, ty))
+
         # ── 2. 데미지 계산 ──────────────────────────────────────
         atk  = max(1, char.str)                            # 아주 단순한 예시
         dmg  = max(1, atk - mob.defense)
@@ -542,75 +1093,77 @@ def create_app():
 
         if dx or dy:
             walkable = get_walkable(new_map)
-            with db.session.no_autoflush:
-                occupied = {(m.x, m.y) for m in Monster.query.filter_by(
-                                map_key=new_map, is_alive=True)}
+            occupied = tiles.keys()
 
             last_free: tuple[int,int] | None = None
             for step in (1, 2):
                 nx = mob.x + dx*step
                 ny = mob.y + dy*step
-                if (nx, ny) not in walkable or (nx, ny) in occupied:
+                if not walkable.is_walkable(nx, ny) or (nx, ny) in occupied:
                     break
                 last_free = (nx, ny)
 
             if last_free:
                 mob.x, mob.y = last_free
-                knockback_until[mob.id] = time.time() + 3
+                entities.knock_back(mob.id, time.time() + 3)
 
         # ── 4. 드롭 & 인벤토리 업데이트 ──────────────────────────
         if mob_dead:
             now = time.time()
             mob.is_alive = False
             mob.died_at  = now
-            knockback_until.pop(mob.id, None)
+            entities.forget(mob.id)
 
+            # 처치 보상은 드물고 레벨업 규칙이 모델에 있으므로 ORM 으로 처리
+            char_row: Character = db.session.get(Character, char_id)
+            char.sync_to(char_row)
+            # 기록한 dirty 만 떼어 둠 — INSERT/commit I/O 중 들어온 변경(몬스터 틱 피격 등)은 유지
+            written, char.dirty = char.dirty, set()
             gained = mob.level * EXP_PER_LEVEL
-            prev_lv = char.level
-            char.gain_exp(gained)
-            level_up = char.level > prev_lv
+            prev_lv = char_row.level
+            char_row.gain_exp(gained)
+            level_up = char_row.level > prev_lv
             socketio.emit('exp_gain', {
-                "char_id": char.id, "exp": gained,
-                "total_exp": char.exp, "level": char.level, "level_up": level_up,
-                "hp": char.hp, "max_hp": char.max_hp,
-                "mp": char.mp, "max_mp": char.max_mp,
+                "char_id": char_row.id, "exp": gained,
+                "total_exp": char_row.exp, "level": char_row.level, "level_up": level_up,
+                "hp": char_row.hp, "max_hp": char_row.max_hp,
+                "mp": char_row.mp, "max_mp": char_row.max_mp,
             }, room=f"map_{new_map}")
 
-            if mob.drop_item_id:
-                stmt = pg_insert(CharacterItem).values(
-                    character_id=char.id,
-                    item_id=mob.drop_item_id,
-                    quantity=1,
-                ).on_conflict_do_update(
-                    constraint='uq_char_item',
-                    set_={'quantity': CharacterItem.quantity + 1},
-                )
-                db.session.execute(stmt)
-
-            db.session.commit()
-            update_monster_tile(new_map, (tx, ty), None)
-        elif (mob.x, mob.y) != (tx, ty):
-            update_monster_tile(new_map, (tx, ty), (mob.x, mob.y))
+            try:
+                if mob.drop_item_id:
+                    stmt = pg_insert(CharacterItem).values(
+                        character_id=char.id,
+                        item_id=mob.drop_item_id,
+                        quantity=1,
+                    ).on_conflict_do_update(
+                        constraint='uq_char_item',
+                        set_={'quantity': CharacterItem.quantity + 1},
+                    )
+                    db.session.execute(stmt)
+                db.session.commit()
+            except Exception:
+                char.dirty |= written
+                raise
+            char.absorb(char_row, keep_dirty=True)   # 레벨/EXP 반영 — commit 중 바뀐 필드는 그대로
+            monster_states.flush([mob.id])      # 사망은 즉시 기록 (리스폰 기준 died_at)
+            update_monster_tile(new_map, mob.id, (tx, ty), None)
         else:
-            update_monster_tile(new_map, (tx, ty), (tx, ty))
+            update_monster_tile(new_map, mob.id, (tx, ty), (mob.x, mob.y))
 
         # ── 5. 결과 브로드캐스트 ─────────────────────────────────
-        socketio.emit('monster_hit',
+        world_deltas.monster_hit(new_map,
                     {'id' : mob.id,
                     'attacker_id': char_id,
                     'dmg': dmg,
                     'hp' : mob.hp,
                     'x'  : mob.x,
-                    'y'  : mob.y},
-                    room=f"map_{new_map}")
+                    'y'  : mob.y})
 
         if mob.hp == 0:
-            socketio.emit('monster_despawn',
-                        {'id': mob.id},
-                        room=f"map_{new_map}")
+            world_deltas.monster_despawn(new_map, mob.id)
 
-        db.session.commit()
-        update_sid_map(request.sid, char.map_key)
+        update_sid_map(sid, char.map_key)
         # 몬스터 전투 발생 → 캐시 금지 (같은 타일 재진입 시 다시 DB 경로)
         return False
 
@@ -630,45 +1183,90 @@ def create_app():
         print(
             f"[move_debug] {_move_debug} "
             f"detail={_move_debug_detail} "
-            f"monster_tiles={dict((k, len(v)) for k, v in _monster_tiles_by_map.items())}",
+            f"monster_tiles={dict((k, len(v)) for k, v in _monster_tiles_by_map.items())} "
+            f"triggers={dict((k, len(v)) for k, v in trigger_tables.items())} "
+            f"tilemaps={len(map_registry)} (loads={map_registry.loads} reloads={map_registry.reloads}) "
+            f"sessions={len(sessions)} entities={len(entities)} "
+            f"paths={len(path_cache)} (hit={path_cache.hits} miss={path_cache.misses}) "
+            f"flow_fields={len(flow_fields)} (builds={flow_fields.builds} hit={flow_fields.hits}) "
+            f"los={len(los_cache)} (hit={los_cache.hits} miss={los_cache.misses}) "
+            f"ticks={world_ticks.stats()} "
+            f"char_states={len(char_states)} char_dirty={char_states.dirty_count()} "
+            f"monsters={len(monster_states)} (loads={monster_states.loads} dirty={monster_states.dirty_count()}) "
+            f"aoi={len(aoi_grid)}/{aoi_grid.occupied_cells()}cells "
+            f"aggro={len(aggro_grid)}/{aggro_grid.occupied_cells()}cells "
+            f"delta_maps={len(world_deltas)} motions={len(motions)} "
+            f"mailbox={len(move_mailbox)}/{move_mailbox.pending()} "
+            f"wire_bin={sum(1 for w in sid_wire.values() if w == WIRE_BIN)}/{len(sid_wire)}",
             flush=True,
         )
         _move_debug.clear()
         _move_debug_detail.clear()
 
-    def maybe_rebind_char_sid(char_id: int, sid: str, map_key: str, expected_sid: str | None) -> bool:
-        current_sid_map = get_map_by_sid(sid)
-        expected_sid_map = get_map_by_sid(expected_sid) if expected_sid else None
-
-        if expected_sid is None and current_sid_map == map_key:
-            bind_char_sid(char_id, sid, map_key)
-            print(
-                f"[sid_heal] char_id={char_id} reason=missing current_sid={sid} map_key={map_key}",
-                flush=True,
-            )
-            return True
-
-        if expected_sid and expected_sid != sid and expected_sid_map is None and current_sid_map == map_key:
-            bind_char_sid(char_id, sid, map_key)
-            print(
-                "[sid_heal] "
-                f"char_id={char_id} reason=stale expected_sid={expected_sid} "
-                f"current_sid={sid} map_key={map_key}",
-                flush=True,
-            )
+    def _stale_seq(sid: str, data: dict) -> bool:
+        """move / move_vel 공통 순번 — 역순·중복이면 True (Redis·DB 전에 버림)"""
+        seq = data.get('seq')
+        if seq is None:
+            return False
+        if not isinstance(seq, int) or isinstance(seq, bool):
+            _move_debug['bad_seq'] = _move_debug.get('bad_seq', 0) + 1
+            flush_move_debug()
+            return True                      # 숫자가 아닌 seq → 패킷 버림 (비교 TypeError 방지)
+        if seq <= _move_seq.get(sid, -1):
+            _move_debug['stale_seq'] = _move_debug.get('stale_seq', 0) + 1
+            flush_move_debug()
             return True
-
-        _move_debug_detail['sid_reject'] = (
-            f"char_id={char_id} expected_sid={expected_sid} current_sid={sid} "
-            f"expected_sid_map={expected_sid_map} current_sid_map={current_sid_map} "
-            f"move_map={map_key}"
-        )
+        _move_seq[sid] = seq
         return False
 
-    # ② 이동 — outer (같은 타일이면 DB 완전 스킵)
+    # ② 이동 — 입구: seq 검사 + 소켓당 최신 이동 1개로 합치기
     @socketio.on('move')
+    @rate_limited('move')
     def handle_move(data):
-        """같은 타일(128px) 내 이동은 DB 스킵. 타일 변경 시에만 DB 접근."""
+        """오래된/역순 seq 는 Redis·DB 전에 버리고, 같은 스케줄링 창에 몰린
+        이동은 슬롯에 덮어써 마지막 것만 처리 (latest-wins)."""
+        sid = request.sid
+        if _stale_seq(sid, data):
+            return
+
+        if sid in _move_slots:
+            # 앞선 이동이 아직 처리 전 → 슬롯만 교체
+            _move_slots[sid] = data
+            _move_debug['coalesced'] = _move_debug.get('coalesced', 0) + 1
+            return
+        _move_slots[sid] = data
+        socketio.sleep(0)                  # 같은 창에 도착한 이동이 슬롯을 덮어쓸 기회
+        _process_move(_move_slots.pop(sid, data))
+
+    # ② 이동 — 속도 모드: 출발/정지/방향 전환 + 키프레임만 수신
+    @socketio.on('move_vel')
+    @rate_limited('move_vel')
+    def handle_move_vel(data):
+        """키프레임 좌표는 move 와 똑같이 반영하고, 다음 키프레임까지는
+        advance_motions 가 tick 마다 외삽한다. vx=vy=0 이면 정지."""
+        sid = request.sid
+        if _stale_seq(sid, data):
+            return
+        char_id = _process_move(data)
+        if char_id is None:
+            return
+        _move_debug['move_vel'] = _move_debug.get('move_vel', 0) + 1
+        st = char_states.get(char_id)
+        if st is None or st.hp <= 0 or st.map_key != data['map_key']:
+            motions.stop(char_id)            # 사망/포탈 → 외삽 안 함
+            return
+        vx, vy = data.get('vx') or 0, data.get('vy') or 0
+        if not (isinstance(vx, (int, float)) and isinstance(vy, (int, float))
+                and isfinite(vx) and isfinite(vy)):
+            _move_debug['bad_vel'] = _move_debug.get('bad_vel', 0) + 1
+            motions.stop(char_id)            # 키프레임 좌표만 반영, 외삽 안 함
+            return
+        # 속도 벡터 길이를 MAX_SPEED 로 클램프 (축별 아님 — 대각선도 같은 상한)
+        motions.set(char_id, data['map_key'], data['x'], data['y'], vx, vy)
+
+    # ② 이동 — outer: 검증 후 _apply_move
+    def _process_move(data) -> int | None:
+        """검증 통과 시 이동을 반영하고 char_id 반환 (거부면 None)"""
         char_id   = data.get('character_id')
         new_map   = data.get('map_key')
         new_px    = data.get('x')
@@ -677,47 +1275,121 @@ def create_app():
         if not char_id or new_px is None or new_py is None or not new_map:
             _move_debug['bad_data'] = _move_debug.get('bad_data', 0) + 1
             flush_move_debug()
-            return
+            return None
 
-        # Redis로 sid 검증 (fail-closed: 매핑 없으면 차단)
-        expected_sid = get_sid_by_char(char_id)
-        if not expected_sid or expected_sid != request.sid:
-            if maybe_rebind_char_sid(char_id, request.sid, new_map, expected_sid):
-                expected_sid = request.sid
-            else:
-                _move_debug['sid_reject'] = _move_debug.get('sid_reject', 0) + 1
-                flush_move_debug()
-                return
+        # join_map 에서 묶은 소켓만 이동 가능 (로컬 dict — Redis 왕복 없음)
+        if not sid_owns_char(request.sid, char_id):
+            _move_debug['sid_reject'] = _move_debug.get('sid_reject', 0) + 1
+            flush_move_debug()
+            return None
+
+        reason = _illegal_move(char_id, new_map, new_px, new_py)
+        if reason is not None:
+            _move_debug[reason] = _move_debug.get(reason, 0) + 1
+            flush_move_debug()
+            socketio.emit('move_resync', {}, to=request.sid, namespace='/')
+            return None
+
+        _apply_move(char_id, request.sid, new_map, new_px, new_py)
+        return char_id
+
+    def _illegal_move(char_id: int, new_map: str, new_px, new_py,
+                      now: float | None = None) -> str | None:
+        """메모리만 보는 이동 검증 — 거부 사유(_move_debug 키) 또는 None.
+        통과하면 세션의 마지막 허용 타일/시각을 갱신"""
+        if not (isinstance(new_px, (int, float)) and isinstance(new_py, (int, float))
+                and isfinite(new_px) and isfinite(new_py)):
+            return 'mv_bad_coord'
+        # 클라이언트가 고른 map_key 는 받지 않음 — 모르는 키는 레지스트리(DB/파일) 조회 전에 거부
+        if not on_current_map(char_id, new_map):
+            return 'mv_map'
+        walkable = walkable_tiles(new_map)
+        if walkable is None:
+            return None                      # 서버가 둔 맵인데 Tiled JSON 이 없음 → 검사 안 함
+        tx, ty = int(new_px // TILE), int(new_py // TILE)
+        if not (0 <= tx < walkable.width and 0 <= ty < walkable.height):
+            return 'mv_oob'
+        if not walkable.is_walkable(tx, ty):
+            return 'mv_wall'
+        if now is None:
+            now = time.time()
+        sess = sessions.touch(char_id)
+        prev = sess.move_tile
+        if prev is not None and prev[0] == new_map:
+            moved = max(abs(tx - prev[1]), abs(ty - prev[2]))
+            if moved > MOVE_SLACK_TILES + MOVE_TILES_PER_SEC * (now - sess.move_at):
+                return 'mv_too_fast'
+        sess.move_tile = (new_map, tx, ty)
+        sess.move_at = now
+        return None
 
+    def _apply_move(char_id: int, sid: str, new_map: str, new_px, new_py) -> None:
+        """캐릭터 mailbox 로 — 앞선 이동이 처리 중이면 큐 끝을 최신 좌표로 교체"""
+        if not move_mailbox.submit(char_id, _apply_move_now, char_id, sid, new_map,
+                                   new_px, new_py, coalesce=True):
+            _move_debug['mailbox_wait'] = _move_debug.get('mailbox_wait', 0) + 1
+
+    def _apply_move_now(char_id: int, sid: str, new_map: str, new_px, new_py) -> None:
+        """같은 타일(128px) 내 이동은 DB 스킵. 타일 변경 시에만 DB 접근."""
         # 타일 좌표 계산
         tx = int(new_px // TILE)
         ty = int(new_py // TILE)
 
-        cached = _last_tile.get(char_id)
+        sess = sessions.touch(char_id)
         # 같은 타일 + 해당 타일에 몬스터 없음 → fast-path (DB 완전 스킵)
         if (
-            cached == (new_map, tx, ty)
-            and (tx, ty) not in _monster_tiles_by_map.get(new_map, set())
+            sess.last_tile == (new_map, tx, ty)
+            and (tx, ty) not in _monster_tiles_by_map.get(new_map, {})
         ):
+            queue_player_move(char_id, new_map, new_px, new_py)
             now = time.time()
-            if now - last_move_sent.get(char_id, 0) >= 0.12:
-                emit('player_move', {'id': char_id,
-                                    'x': new_px, 'y': new_py},
-                    room=f"map_{new_map}", include_self=False)
-                last_move_sent[char_id] = now
             _move_debug['fast_path'] = _move_debug.get('fast_path', 0) + 1
             flush_move_debug(now)
             return
 
         # 타일 변경 또는 cache miss → DB 접근
-        if _handle_move_tile_change(char_id, new_map, new_px, new_py, tx, ty):
-            _last_tile[char_id] = (new_map, tx, ty)
+        if _handle_move_tile_change(char_id, new_map, new_px, new_py, tx, ty, sid):
+            sess.last_tile = (new_map, tx, ty)
         _move_debug['db_path'] = _move_debug.get('db_path', 0) + 1
 
         # 5초에 한 번 디버그 카운터 출력
         now = time.time()
         flush_move_debug(now)
 
+    def advance_motions(now: float | None = None) -> None:
+        """move_vel 로 움직이는 캐릭터 좌표를 외삽해 일반 이동과 같은 경로로 반영
+        (AOI·타일 트리거·전투). 벽에 닿으면 멈추고 클라이언트에 키프레임 요청."""
+        if now is None:
+            now = time.time()
+        for char_id, m in motions.items():
+            sid = char_sid.get(char_id)
+            st = char_states.get(char_id)
+            if sid is None or st is None or st.hp <= 0:
+                motions.stop(char_id)
+                continue
+            px, py = m.position(now)
+            px, py = round(px, 1), round(py, 1)
+            walkable = walkable_tiles(m.map_key)
+            if walkable is not None and (int(px // TILE), int(py // TILE)) not in walkable:
+                # 클라이언트는 충돌로 멈췄을 것 — 실제 좌표로 보정 요청
+                motions.stop(char_id)
+                _move_debug['resync'] = _move_debug.get('resync', 0) + 1
+                socketio.emit('move_resync', {}, to=sid, namespace='/')
+                continue
+            _apply_move(char_id, sid, m.map_key, px, py)
+            if now - m.t0 >= MAX_EXTRAPOLATE:
+                motions.stop(char_id)        # 키프레임 끊김 → 마지막 외삽 좌표에서 정지
+
+    app.advance_motions = advance_motions
+    app.illegal_move = _illegal_move
+    move_mailbox.on_error = lambda e: app.logger.exception("이동 처리 실패 — 다음 이동은 계속")
+
+    @with_db_session
+    def _retire_char_state(char_id: int) -> None:
+        """퇴장 시 남은 변경분 강제 flush 후 메모리에서 제거"""
+        char_states.flush([char_id])
+        char_states.evict(char_id)
+
     # ③ 맵 퇴장 또는 브라우저 종료
     @socketio.on('disconnect')
     def on_disconnect():
@@ -732,10 +1404,25 @@ def create_app():
         # 제거 전에 먼저 map_key를 조회하고, 그 다음 제거
         try:
             map_key = get_map_by_sid(sid) or "unknown"
+            sid_wire.pop(sid, None)
+            _move_slots.pop(sid, None)
+            _move_seq.pop(sid, None)
+            inbound_limiter.forget(sid)
+            local_char = sid_char.get(sid)
+            unbind_local(sid)
             char_id = remove_sid(sid)
+            if char_id is None:
+                char_id = local_char           # Redis 매핑이 없어도 로컬 세션은 정리
             if char_id is None:
                 return
-            _last_tile.pop(int(char_id), None)
+            sessions.close(int(char_id))
+            aoi_grid.remove(int(char_id))
+            aggro_grid.remove(int(char_id))
+            world_deltas.drop_player(map_key, int(char_id))
+            player_handles.release(int(char_id))
+            motions.stop(int(char_id))
+            flow_fields.forget(int(char_id))
+            _retire_char_state(int(char_id))
 
             # decode_responses=True이므로 이미 문자열
             safe_char_id = str(char_id)
@@ -1002,9 +1689,18 @@ if __name__ == '__main__':
             db.session.add_all(seed_monsters) 
             db.session.commit()
 
+        print(f'[maps] 미리 로드: {warm_maps()}')
+
+    # SIGTERM(컨테이너 종료)도 정상 종료 경로로 → 아래 finally 에서 강제 flush
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
     debug = os.environ.get("FLASK_DEBUG", "false").lower() in ("1", "true")
-    socketio.run(app,
-                 host='0.0.0.0',
-                 port=5000,
-                 debug=debug,
-                 )
+    try:
+        socketio.run(app,
+                     host='0.0.0.0',
+                     port=5000,
+                     debug=debug,
+                     )
+    finally:
+        app.flush_char_states()
+        app.checkpoint_monsters()
@@ -1,6 +1,7 @@
 # auth.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, session
 from models import db, User
+from utils.socket_auth import issue_token
 import re
 
 auth_bp = Blueprint('auth', __name__)
@@ -83,10 +84,10 @@ def login():
     if not user.check_password(password):
         return jsonify({'error': 'Invalid username or password'}), 401
 
-    # 여기서 세션/토큰 발행 로직을 구현할 수 있음
-    # 예: flask_login, JWT 등
-    # 아래는 단순히 메시지만 리턴하는 예시:
+    # 소켓 인증: 서명 토큰(connect auth) + 같은 origin 이면 Flask 세션도 사용 가능
+    session['user_id'] = user.id
     return jsonify({
         'message': 'Login successful',
-        'user': user.to_dict()
+        'user': user.to_dict(),
+        'token': issue_token(user.id),
     }), 200
@@ -2,6 +2,7 @@
 
 from flask import Blueprint, request, jsonify
 from models import db, Character, User
+from utils.char_state import flush_live, absorb_live, evict_live
 
 characters_bp = Blueprint('characters', __name__)
 
@@ -101,6 +102,7 @@ def list_characters():
     /characters?user_id=1 → 해당 유저의 캐릭터 목록
     """
     user_id = request.args.get('user_id', type=int)
+    flush_live()        # 접속 중 캐릭터의 최신 좌표/HP 를 먼저 기록
     query = Character.query
 
     if user_id:
@@ -115,6 +117,7 @@ def get_character(char_id):
     """
     캐릭터 상세 조회
     """
+    flush_live([char_id])
     char = Character.query.get_or_404(char_id)
     return jsonify(char.to_dict())
 
@@ -132,6 +135,7 @@ def update_character(char_id):
       "hair_color": "red"
     }
     """
+    flush_live([char_id])
     char = Character.query.get_or_404(char_id)
     data = request.get_json() or {}
 
@@ -161,6 +165,7 @@ def update_character(char_id):
     #   return 에러 or 무시
 
     db.session.commit()
+    absorb_live(char)       # 접속 중이면 메모리의 name 도 갱신
     return jsonify({
         'message': 'Character updated',
         'character': char.to_dict()
@@ -175,6 +180,7 @@ def delete_character(char_id):
     char = Character.query.get_or_404(char_id)
     db.session.delete(char)
     db.session.commit()
+    evict_live(char_id)
     return jsonify({'message': 'Character deleted'})
 
 
@@ -187,12 +193,14 @@ def gain_exp(char_id):
       "amount": 150
     }
     """
+    flush_live([char_id])
     char = Character.query.get_or_404(char_id)
     data = request.get_json() or {}
     amount = data.get('amount', 0)
 
     char.gain_exp(amount)
     db.session.commit()
+    absorb_live(char)
 
     return jsonify({
         'message': f'Gained {amount} exp',
@@ -214,6 +222,7 @@ def update_stats(char_id):
       "intl": 9
     }
     """
+    flush_live([char_id])
     char = Character.query.get_or_404(char_id)
     data = request.get_json() or {}
 
@@ -232,6 +241,7 @@ def update_stats(char_id):
         char.intl = data['intl']
 
     db.session.commit()
+    absorb_live(char)
     return jsonify({
         'message': 'Stats updated',
         'character': char.to_dict()
@@ -244,6 +254,7 @@ def move_character(char_id):
     캐릭터 이동 API (맵, 좌표 업데이트)
     요청 JSON 예: {"map_key": "city2", "x": 1280, "y": 1536}
     """
+    flush_live([char_id])
     char = Character.query.get_or_404(char_id)
     data = request.get_json() or {}
 
@@ -259,6 +270,7 @@ def move_character(char_id):
     char.x = new_x
     char.y = new_y
     db.session.commit()
+    absorb_live(char)
 
     return jsonify({
         'message': 'Character moved',
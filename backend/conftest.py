@@ -1,5 +1,8 @@
 import os
+import tempfile
 os.environ.setdefault("SECRET_KEY", "test-secret")
+# .mapbin 은 저장소 밖 임시 디렉터리에 (utils.mapcompiler import 전에 설정)
+os.environ.setdefault("MAP_BUILD_DIR", tempfile.mkdtemp(prefix="mapbin-"))
 
 import pytest
 from flask import Flask
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from models import db, Item, Character, CharacterItem
 from auth_admin import admin_required
+from utils.char_state import flush_live, absorb_live
 
 items_bp = Blueprint('items', __name__)
 
@@ -92,6 +93,8 @@ def use_item():
     if qty < 1:
         return jsonify({'error': '수량은 1 이상이어야 합니다.'}), 400
 
+    # 접속 중이면 메모리 HP/좌표를 먼저 기록 (낡은 DB HP 로 판단하지 않도록)
+    flush_live([char_id])
     char: Character = db.session.get(Character, char_id)
     if not char:
         return jsonify({'error': '캐릭터를 찾을 수 없습니다.'}), 404
@@ -131,6 +134,7 @@ def use_item():
         db.session.delete(ci)
 
     db.session.commit()
+    absorb_live(char)       # 회복한 HP 를 접속 중 상태에 반영 (다음 flush 가 덮어쓰지 않게)
 
     return jsonify({
         'message': f'{item.name} 사용! HP +{healed}',
@@ -1,7 +1,11 @@
 # maps.py
-from flask import Blueprint, request, jsonify
-from models import db, Map
+from flask import Blueprint, request, jsonify, current_app, session
+from models import db, Map, Character, NPC
 from auth_admin import admin_required
+from utils.triggers import invalidate_live
+from utils.mapregistry import reload_live, forget_live, live_registry
+from utils.mapchunks import chunk_index, CHUNK_RADIUS, CHUNK_RADIUS_MAX
+from utils import mapbundle
 
 maps_bp = Blueprint('maps', __name__)
 
@@ -20,6 +24,114 @@ def get_map(map_key):
     m = Map.query.get_or_404(map_key)
     return jsonify(m.to_dict())
 
+def _viewer_tile(m: Map):
+    """로그인 사용자 본인 캐릭터의 현재 타일 (서버 상태 기준) → ((char_id, tx, ty), 오류 응답)"""
+    uid = session.get('user_id')
+    if uid is None:
+        return None, (jsonify({'error': 'Login required'}), 401)
+    char_id = request.args.get('character_id', type=int)
+    if char_id is None:
+        return None, (jsonify({'error': 'character_id is required'}), 400)
+    row = db.session.get(Character, char_id)
+    if row is None or row.user_id != uid:          # 남의 캐릭터는 존재 여부도 알리지 않음
+        return None, (jsonify({'error': 'Character not found'}), 404)
+    # 소켓 서버가 있으면 접속 중 메모리 상태만 (좌표는 서버가 검증한 값), 단독 REST 앱이면 DB
+    states = current_app.extensions.get('char_states')
+    char = row if states is None else states.get(char_id)
+    if char is None:
+        return None, (jsonify({'error': 'Character is not online'}), 409)
+    if char.map_key != m.key:
+        return None, (jsonify({'error': 'Character is not on this map'}), 400)
+    tile_w, tile_h = m.tile_width or 128, m.tile_height or 128
+    return (char_id, int((char.x or 0) // tile_w), int((char.y or 0) // tile_h)), None
+
+# 2-1) 청크 목록 — 본인 캐릭터 위치 주변 청크의 해시만 (위치는 서버 상태 기준)
+@maps_bp.route('/maps/<string:map_key>/chunks', methods=['GET'])
+def list_chunks(map_key):
+    """
+    GET /api/maps/<key>/chunks?character_id=1[&r=1]   (로그인 + 본인 캐릭터)
+    → chunks: [{cx, cy, hash, url}] — url 은 해시가 들어간 immutable 주소
+    """
+    m = Map.query.get_or_404(map_key)
+    cm = live_registry().find(map_key)
+    if cm is None:
+        return jsonify({'error': 'No tilemap for this map'}), 404
+
+    viewer, err = _viewer_tile(m)
+    if err:
+        return err
+    char_id, tx, ty = viewer
+
+    radius = min(max(request.args.get('r', CHUNK_RADIUS, type=int), 0), CHUNK_RADIUS_MAX)
+    idx = chunk_index(cm)
+    chunks = [
+        {'cx': cx, 'cy': cy, 'hash': (h := idx.hash(cx, cy)),
+         'url': f"/api/maps/{map_key}/chunks/{cx}/{cy}/{h}?character_id={char_id}"}
+        for cx, cy in idx.around(tx, ty, radius)
+    ]
+    return jsonify({
+        'map_key': map_key, 'chunk_tiles': idx.size,
+        'width': cm.width, 'height': cm.height, 'cols': idx.cols, 'rows': idx.rows,
+        'center': list(idx.chunk_of(tx, ty)), 'chunks': chunks,
+    })
+
+# 2-2) 청크 본문 — 본인 캐릭터 주변(CHUNK_RADIUS_MAX) 청크만
+#      해시가 맞으면 1년 immutable 캐시(브라우저만 — private), 맵이 바뀌어 해시가 다르면 404
+@maps_bp.route('/maps/<string:map_key>/chunks/<int:cx>/<int:cy>/<string:chunk_hash>', methods=['GET'])
+def get_chunk(map_key, cx, cy, chunk_hash):
+    m = Map.query.get_or_404(map_key)
+    cm = live_registry().find(map_key)
+    if cm is None:
+        return jsonify({'error': 'No tilemap for this map'}), 404
+    viewer, err = _viewer_tile(m)
+    if err:
+        return err
+    idx = chunk_index(cm)
+    if (cx, cy) not in idx:
+        return jsonify({'error': 'Chunk out of range'}), 404
+    ccx, ccy = idx.chunk_of(viewer[1], viewer[2])
+    if max(abs(cx - ccx), abs(cy - ccy)) > CHUNK_RADIUS_MAX:
+        return jsonify({'error': 'Chunk is not near the character'}), 403
+    current = idx.hash(cx, cy)
+    if chunk_hash != current:
+        return jsonify({'error': 'Stale chunk hash', 'hash': current}), 404
+    if current in request.if_none_match:
+        resp = current_app.response_class(status=304)
+    else:
+        resp = jsonify(idx.payload(cx, cy))
+    resp.set_etag(current)
+    resp.headers['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return resp
+
+# 2-3) 맵 번들 — 메타데이터 + Tiled JSON + NPC + 포탈을 한 번에 (버전 ETag, 미리 압축)
+@maps_bp.route('/maps/<string:map_key>/bundle', methods=['GET'])
+def get_map_bundle(map_key):
+    """
+    GET /api/maps/<key>/bundle
+    → {version, map, start_position, teleports, npcs, tilemap}
+    If-None-Match 가 version 과 같으면 304 (캐시 적중 시 DB 조회 없음)
+    """
+    # 번들이 없는 키는 먼저 Map 행 확인 — 없는 키로 레지스트리를 건드리지 않음
+    m = None if mapbundle.has(map_key) else Map.query.get_or_404(map_key)
+    source = live_registry().source_path(map_key)
+    bundle = mapbundle.cached(map_key, source)
+    if bundle is None:
+        m = m or Map.query.get_or_404(map_key)
+        npcs = NPC.query.filter_by(map_key=map_key, is_active=True).order_by(NPC.id).all()
+        bundle = mapbundle.store(mapbundle.build_bundle(m, npcs, source))
+
+    if request.if_none_match.contains_weak(bundle.version):
+        resp = current_app.response_class(status=304)
+    else:
+        body, encoding = bundle.variant(request.accept_encodings)
+        resp = current_app.response_class(body, mimetype='application/json')
+        if encoding:
+            resp.headers['Content-Encoding'] = encoding
+    resp.set_etag(bundle.version, weak=True)
+    resp.headers['Vary'] = 'Accept-Encoding'
+    resp.headers['Cache-Control'] = 'no-cache'      # 저장은 하되 매번 ETag 로 재검증
+    return resp
+
 # 3) 맵 생성 — 관리자 전용
 @maps_bp.route('/maps', methods=['POST'])
 @admin_required
@@ -60,6 +172,9 @@ def create_map():
     )
     db.session.add(new_map)
     db.session.commit()
+    reload_live(new_map.key, new_map.json_file)
+    invalidate_live(new_map.key)
+    mapbundle.invalidate(new_map.key)
     return jsonify({'message': 'Map created', 'map': new_map.to_dict()}), 201
 
 # 4) 맵 수정 — 관리자 전용
@@ -82,6 +197,9 @@ def update_map(map_key):
     # key(primary_key)는 변경 불가
 
     db.session.commit()
+    reload_live(map_key, m.json_file)   # 타일맵 교체 (새 맵을 다 읽은 뒤 한 번에)
+    invalidate_live(map_key)        # 포탈 등 트리거 테이블 다시 컴파일
+    mapbundle.invalidate(map_key)
     return jsonify({'message': 'Map updated', 'map': m.to_dict()})
 
 # 5) 맵 삭제 — 관리자 전용
@@ -91,4 +209,7 @@ def delete_map(map_key):
     m = Map.query.get_or_404(map_key)
     db.session.delete(m)
     db.session.commit()
+    forget_live(map_key)
+    invalidate_live(map_key)
+    mapbundle.invalidate(map_key)
     return jsonify({'message': 'Map deleted'})
@@ -1,6 +1,7 @@
 # monsters.py
 from flask import Blueprint, request, jsonify
 from models import Monster
+from utils.monster_state import overlay_live
 
 monsters_bp = Blueprint('monsters', __name__)
 
@@ -9,4 +10,4 @@ def list_monsters():
     q = Monster.query
     if mk := request.args.get('map_key'):
         q = q.filter_by(map_key=mk)
-    return jsonify([m.to_dict() for m in q.all()])
+    return jsonify([overlay_live(m) for m in q.all()])
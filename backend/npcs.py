@@ -3,6 +3,8 @@
 from flask import Blueprint, request, jsonify
 from models import db, NPC
 from auth_admin import admin_required
+from utils.triggers import invalidate_live
+from utils import mapbundle
 
 npcs_bp = Blueprint('npcs', __name__)
 
@@ -70,6 +72,8 @@ def create_npc():
     )
     db.session.add(npc)
     db.session.commit()
+    invalidate_live(npc.map_key)
+    mapbundle.invalidate(npc.map_key)
 
     return jsonify({'message': 'NPC created', 'npc': npc.to_dict()}), 201
 
@@ -80,6 +84,7 @@ def create_npc():
 def update_npc(npc_id):
     npc = NPC.query.get_or_404(npc_id)
     data = request.get_json() or {}
+    old_map = npc.map_key
 
     npc.name = data.get('name', npc.name)
     npc.gender = data.get('gender', npc.gender)
@@ -96,6 +101,8 @@ def update_npc(npc_id):
         npc.npc_type = data['npc_type']
 
     db.session.commit()
+    invalidate_live(old_map, npc.map_key)     # 맵을 옮겼으면 양쪽 다
+    mapbundle.invalidate(old_map, npc.map_key)
     return jsonify({'message': 'NPC updated', 'npc': npc.to_dict()})
 
 
@@ -104,8 +111,11 @@ def update_npc(npc_id):
 @admin_required
 def delete_npc(npc_id):
     npc = NPC.query.get_or_404(npc_id)
+    map_key = npc.map_key
     db.session.delete(npc)
     db.session.commit()
+    invalidate_live(map_key)
+    mapbundle.invalidate(map_key)
     return jsonify({'message': 'NPC deleted'})
 
 
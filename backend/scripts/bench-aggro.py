@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Monster aggro benchmark: target-search time per AI tick, full player scan vs aggro_grid buckets.
+
+서버를 띄우지 않고 app.py monster_tick 과 같은 규칙(AGGRO_DIST 유클리드 반경 + 시야)으로
+몬스터마다 타깃 후보를 찾는 비용만 잰다. 플레이어는 틱마다 랜덤 워크, 버킷은 타일 변경 때 갱신.
+
+    python scripts/bench-aggro.py                          # 10/100/1000 명, 몬스터 200
+    python scripts/bench-aggro.py --players 5000 --monsters 500 --size 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import pathlib
+import random
+import sys
+import time
+from dataclasses import dataclass
+
+BACKEND = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from utils.los import LosCache  # noqa: E402
+from utils.spatial import SpatialHash  # noqa: E402
+from utils.walkable import WalkGrid  # noqa: E402
+
+# app.py 와 동일한 값
+TILE = 128
+AGGRO_DIST = 4
+
+MAP_KEY = "bench"
+
+
+@dataclass
+class Result:
+    players: int
+    mode: str
+    ms_per_tick: float
+    visited_per_mob: float
+    targets: int
+
+
+def make_grid(size: int, wall_ratio: float, rnd: random.Random) -> WalkGrid:
+    cells = [0 if rnd.random() < wall_ratio else 1 for _ in range(size * size)]
+    return WalkGrid(size, size, cells)
+
+
+def random_tile(grid: WalkGrid, rnd: random.Random) -> tuple[int, int]:
+    while True:
+        x, y = rnd.randrange(grid.width), rnd.randrange(grid.height)
+        if grid.is_walkable(x, y):
+            return x, y
+
+
+def simulate(players: int, monsters: int, ticks: int, grid: WalkGrid, seed: int, use_grid: bool) -> Result:
+    rnd = random.Random(seed)
+    chars = {cid: [(x + 0.5) * TILE, (y + 0.5) * TILE]
+             for cid, (x, y) in enumerate(random_tile(grid, rnd) for _ in range(players))}
+    mobs = [random_tile(grid, rnd) for _ in range(monsters)]
+    los = LosCache(AGGRO_DIST)
+    buckets = SpatialHash(AGGRO_DIST)
+    for cid, (px, py) in chars.items():
+        buckets.update(cid, MAP_KEY, int(px // TILE), int(py // TILE))
+
+    elapsed = 0.0
+    visited = 0
+    targets = 0
+    for _ in range(ticks):
+        # 플레이어 이동 (틱 사이 최대 2 타일) — 버킷 갱신은 이동 처리 쪽 비용이므로 측정 밖
+        for cid, pos in chars.items():
+            tx = min(max(int(pos[0] // TILE) + rnd.randint(-2, 2), 0), grid.width - 1)
+            ty = min(max(int(pos[1] // TILE) + rnd.randint(-2, 2), 0), grid.height - 1)
+            if grid.is_walkable(tx, ty):
+                pos[0], pos[1] = (tx + 0.5) * TILE, (ty + 0.5) * TILE
+                buckets.update(cid, MAP_KEY, tx, ty)
+
+        t0 = time.perf_counter()
+        for mx, my in mobs:
+            cands = buckets.query_tiles(MAP_KEY, mx, my, AGGRO_DIST) if use_grid else chars
+            for cid in cands:
+                visited += 1
+                cx, cy = chars[cid]
+                if (math.hypot(cx / TILE - mx, cy / TILE - my) <= AGGRO_DIST
+                        and los.visible(MAP_KEY, grid, (mx, my), (int(cx // TILE), int(cy // TILE)))):
+                    targets += 1
+                    break
+        elapsed += time.perf_counter() - t0
+
+    return Result(
+        players=players,
+        mode="grid" if use_grid else "scan",
+        ms_per_tick=elapsed / ticks * 1000,
+        visited_per_mob=visited / (ticks * monsters),
+        targets=targets,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--monsters", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--size", type=int, default=128, help="정사각형 맵 한 변(타일)")
+    parser.add_argument("--walls", type=float, default=0.15, help="벽 타일 비율")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    grid = make_grid(args.size, args.walls, random.Random(args.seed))
+    print(f"map={args.size}x{args.size} tiles, walls={args.walls:.0%}, monsters={args.monsters}, "
+          f"aggro={AGGRO_DIST} tiles, cell={AGGRO_DIST} tiles, {args.ticks} ticks")
+    print(f"{'players':>8} {'mode':>6} {'ms/tick':>10} {'visited/mob':>12} {'targets':>8}")
+    for n in args.players:
+        scan = simulate(n, args.monsters, args.ticks, grid, args.seed, use_grid=False)
+        bucket = simulate(n, args.monsters, args.ticks, grid, args.seed, use_grid=True)
+        for res in (scan, bucket):
+            print(f"{res.players:>8} {res.mode:>6} {res.ms_per_tick:>10.3f} "
+                  f"{res.visited_per_mob:>12.1f} {res.targets:>8}")
+        print(f"{'':>8} {'ratio':>6} {bucket.ms_per_tick / scan.ms_per_tick:>10.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""AOI fan-out benchmark: player_move emits/bytes per second, map broadcast vs AOI cells.
+
+서버를 띄우지 않고 app.py 와 같은 규칙(120 ms rate-limit, AOI 셀/반경, 시야 밖 1 Hz)으로
+플레이어 랜덤 워크를 시뮬레이션해 수신자 수와 전송 바이트를 센다.
+
+    python scripts/bench-aoi.py                     # 50/200/500 명, worldmap
+    python scripts/bench-aoi.py --players 1000 --seconds 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import pathlib
+import random
+import sys
+import time
+from dataclasses import dataclass
+
+BACKEND = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from utils.spatial import SpatialHash  # noqa: E402
+
+# app.py 와 동일한 값
+TILE = 128
+MOVE_SEND_INTERVAL = 0.12
+AOI_CELL_TILES = 8
+AOI_RADIUS = 1
+FAR_MOVE_INTERVAL = 1.0
+SPEED_PX = 200          # 클라이언트 이동 속도 (MyScene.update)
+
+MAP_KEY = "worldmap"
+DEFAULT_MAP_FILE = BACKEND.parent / "frontend" / "public" / "worldmap.json"
+
+
+@dataclass
+class Result:
+    players: int
+    mode: str
+    emits_per_s: float
+    kbytes_per_s: float
+    cpu_ms_per_s: float
+
+
+def map_size(path: pathlib.Path) -> tuple[int, int]:
+    if path.exists():
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data["width"], data["height"]
+    return 40, 60           # Map 시드의 worldmap 크기
+
+
+def packet_size(char_id: int, x: float, y: float) -> int:
+    """Socket.IO 텍스트 프레임 크기 (42["player_move",{...}])"""
+    body = json.dumps(["player_move", {"id": char_id, "x": x, "y": y}], separators=(",", ":"))
+    return len("42") + len(body)
+
+
+def simulate(players: int, seconds: float, width: int, height: int, seed: int, use_aoi: bool) -> Result:
+    rnd = random.Random(seed)
+    w_px, h_px = width * TILE, height * TILE
+    pos = [[rnd.uniform(0, w_px), rnd.uniform(0, h_px)] for _ in range(players)]
+    heading = [rnd.uniform(0, 2 * math.pi) for _ in range(players)]
+
+    grid = SpatialHash(AOI_CELL_TILES)
+    for cid, (x, y) in enumerate(pos):
+        grid.update(cid, MAP_KEY, int(x // TILE), int(y // TILE))
+    last_far = [-FAR_MOVE_INTERVAL] * players
+
+    emits = 0
+    nbytes = 0
+    steps = int(seconds / MOVE_SEND_INTERVAL)
+    t0 = time.perf_counter()
+    for step in range(steps):
+        now = step * MOVE_SEND_INTERVAL
+        for cid in range(players):
+            if rnd.random() < 0.1:                       # 가끔 방향 전환
+                heading[cid] = rnd.uniform(0, 2 * math.pi)
+            x = min(max(pos[cid][0] + math.cos(heading[cid]) * SPEED_PX * MOVE_SEND_INTERVAL, 0), w_px - 1)
+            y = min(max(pos[cid][1] + math.sin(heading[cid]) * SPEED_PX * MOVE_SEND_INTERVAL, 0), h_px - 1)
+            pos[cid][0], pos[cid][1] = x, y
+            size = packet_size(cid, round(x, 2), round(y, 2))
+
+            if not use_aoi:
+                recipients = players - 1
+            else:
+                grid.update(cid, MAP_KEY, int(x // TILE), int(y // TILE))
+                near = sum(1 for other in grid.query_cells(grid.cell_of(cid), AOI_RADIUS) if other != cid)
+                recipients = near
+                if now - last_far[cid] >= FAR_MOVE_INTERVAL:
+                    last_far[cid] = now
+                    recipients += players - 1 - near
+            emits += recipients
+            nbytes += recipients * size
+    cpu = time.perf_counter() - t0
+
+    sim_s = steps * MOVE_SEND_INTERVAL
+    return Result(
+        players=players,
+        mode="aoi" if use_aoi else "broadcast",
+        emits_per_s=emits / sim_s,
+        kbytes_per_s=nbytes / sim_s / 1024,
+        cpu_ms_per_s=cpu / sim_s * 1000,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--seconds", type=float, default=10.0, help="시뮬레이션 시간(초)")
+    parser.add_argument("--map-file", type=pathlib.Path, default=DEFAULT_MAP_FILE)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    width, height = map_size(args.map_file)
+    print(f"map={MAP_KEY} {width}x{height} tiles, cell={AOI_CELL_TILES} tiles, radius={AOI_RADIUS} cells, "
+          f"far={FAR_MOVE_INTERVAL}s, {args.seconds}s simulated")
+    print(f"{'players':>8} {'mode':>10} {'emits/s':>12} {'KiB/s':>12} {'sim cpu ms/s':>13}")
+    for n in args.players:
+        base = simulate(n, args.seconds, width, height, args.seed, use_aoi=False)
+        aoi = simulate(n, args.seconds, width, height, args.seed, use_aoi=True)
+        for res in (base, aoi):
+            print(f"{res.players:>8} {res.mode:>10} {res.emits_per_s:>12.0f} "
+                  f"{res.kbytes_per_s:>12.1f} {res.cpu_ms_per_s:>13.1f}")
+        print(f"{'':>8} {'ratio':>10} {aoi.emits_per_s / base.emits_per_s:>12.1%} "
+              f"{aoi.kbytes_per_s / base.kbytes_per_s:>12.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
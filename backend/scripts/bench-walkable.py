@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Walkable benchmark: memory and probe time, set[(x, y)] vs WalkGrid (bytearray).
+
+frontend/public 의 실제 맵 + 임의 크기로 늘린 합성 맵에 대해
+  - set  : 이전 get_walkable 반환값 (타일 튜플 집합)
+  - grid : utils/walkable.WalkGrid (타일당 1바이트, 이웃 비트 포함)
+의 메모리와 is_walkable / 4방향 이웃 조회 시간을 비교한다.
+
+    python scripts/bench-walkable.py
+    python scripts/bench-walkable.py --scale 400x600 1000x1000 --probes 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import random
+import sys
+import time
+
+BACKEND = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from utils.walkable import WalkGrid  # noqa: E402
+
+MAP_DIR = BACKEND.parent / "frontend" / "public"
+MAPS = ("dungeon1", "city2", "worldmap")
+
+
+def load_flags(path: pathlib.Path) -> tuple[int, int, list[bool]]:
+    """utils/walkable.parse_tiled 와 같은 규칙 (gid 0 또는 collides 아님 → 통과)"""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    collidable = {
+        ts["firstgid"] + t["id"]
+        for ts in data["tilesets"] for t in ts.get("tiles", [])
+        if {p["name"]: p["value"] for p in t.get("properties", [])}.get("collides")
+    }
+    layer = next(l for l in data["layers"] if l["type"] == "tilelayer")
+    return layer["width"], layer["height"], [g == 0 or g not in collidable for g in layer["data"]]
+
+
+def synthetic(width: int, height: int, rnd: random.Random) -> list[bool]:
+    return [rnd.random() < 0.8 for _ in range(width * height)]
+
+
+def set_bytes(tiles: set[tuple[int, int]]) -> int:
+    """집합 + 튜플 + (작은 정수 캐시 밖의) int 객체까지"""
+    size = sys.getsizeof(tiles)
+    for x, y in tiles:
+        size += sys.getsizeof((x, y))
+        size += sum(sys.getsizeof(v) for v in (x, y) if v > 256)
+    return size
+
+
+def grid_bytes(grid: WalkGrid) -> int:
+    return sys.getsizeof(grid) + sys.getsizeof(grid.cells)
+
+
+def bench(width: int, height: int, flags: list[bool], probes: int, rnd: random.Random) -> dict:
+    tiles = {(i % width, i // width) for i, f in enumerate(flags) if f}
+    t0 = time.perf_counter()
+    grid = WalkGrid(width, height, flags)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    pts = [(rnd.randrange(-1, width + 1), rnd.randrange(-1, height + 1)) for _ in range(probes)]
+
+    t0 = time.perf_counter()
+    hit_set = sum(1 for p in pts if p in tiles)
+    t_set = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    is_walkable = grid.is_walkable
+    hit_grid = sum(1 for x, y in pts if is_walkable(x, y))
+    t_grid = time.perf_counter() - t0
+    assert hit_set == hit_grid
+
+    t0 = time.perf_counter()
+    for x, y in pts:
+        [p for p in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)) if p in tiles]
+    t_nset = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    neighbors = grid.neighbors
+    for x, y in pts:
+        neighbors(x, y)
+    t_ngrid = time.perf_counter() - t0
+
+    ns = 1e9 / probes
+    return {
+        "set_kib": set_bytes(tiles) / 1024,
+        "grid_kib": grid_bytes(grid) / 1024,
+        "build_ms": build_ms,
+        "probe_set_ns": t_set * ns,
+        "probe_grid_ns": t_grid * ns,
+        "nbr_set_ns": t_nset * ns,
+        "nbr_grid_ns": t_ngrid * ns,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", nargs="*", default=["200x300", "1000x1000"],
+                        help="합성 맵 크기 WxH (80%% 통과)")
+    parser.add_argument("--probes", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rnd = random.Random(args.seed)
+
+    cases: list[tuple[str, int, int, list[bool]]] = []
+    for key in MAPS:
+        path = MAP_DIR / f"{key}.json"
+        if path.exists():
+            cases.append((key, *load_flags(path)))
+    for spec in args.scale:
+        w, h = (int(v) for v in spec.lower().split("x"))
+        cases.append(("synthetic", w, h, synthetic(w, h, rnd)))
+
+    print(f"{'map':>10} {'size':>10} {'set KiB':>9} {'grid KiB':>9} {'build ms':>9} "
+          f"{'in set ns':>10} {'grid ns':>8} {'nbr set ns':>11} {'nbr grid ns':>12}")
+    for name, w, h, flags in cases:
+        r = bench(w, h, flags, args.probes, rnd)
+        print(f"{name:>10} {f'{w}x{h}':>10} {r['set_kib']:>9.1f} {r['grid_kib']:>9.1f} "
+              f"{r['build_ms']:>9.1f} {r['probe_set_ns']:>10.0f} {r['probe_grid_ns']:>8.0f} "
+              f"{r['nbr_set_ns']:>11.0f} {r['nbr_grid_ns']:>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
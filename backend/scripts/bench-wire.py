@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Wire benchmark: payload bytes and encode time, per-event JSON dicts vs world_delta JSON vs bin1.
+
+한 tick 에 나갈 이동/피격 이벤트를 무작위로 만들어
+  - legacy : 이벤트마다 42["player_move",{...}] 텍스트 프레임 (user-003 이전)
+  - json   : world_delta 묶음 1개 (JSON)
+  - bin1   : world_delta 묶음 1개 (utils/wire.py struct 바이너리, 451- 헤더 포함)
+의 바이트 수와 인코딩 시간을 비교한다.
+
+    python scripts/bench-wire.py                       # 10/50/200 엔티티
+    python scripts/bench-wire.py --entities 500 --rounds 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import random
+import sys
+import time
+
+BACKEND = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from utils.wire import HandleTable, encode_world_delta  # noqa: E402
+
+TILE = 128
+MAP_W, MAP_H = 40, 60
+# Socket.IO 바이너리 이벤트 = 텍스트 헤더 프레임 + 첨부 프레임
+BIN_HEADER = len('451-["world_delta",{"_placeholder":true,"num":0}]')
+
+
+def make_tick(rnd: random.Random, n: int) -> dict:
+    """플레이어 n, 몬스터 n/2, 피격 n/10 규모의 한 tick"""
+    players = [[1000 + i, rnd.uniform(0, MAP_W * TILE), rnd.uniform(0, MAP_H * TILE)]
+               for i in range(n)]
+    monsters = [[i, rnd.randrange(MAP_W), rnd.randrange(MAP_H)] for i in range(n // 2)]
+    hits = [{'id': rnd.randrange(n // 2 or 1), 'attacker_id': 1000 + rnd.randrange(n),
+             'dmg': rnd.randrange(1, 30), 'hp': rnd.randrange(0, 200),
+             'x': rnd.randrange(MAP_W), 'y': rnd.randrange(MAP_H)}
+            for _ in range(max(1, n // 10))]
+    return {'map_key': 'dungeon1', 'players': players, 'monsters': monsters,
+            'monster_hits': hits}
+
+
+def legacy_frames(tick: dict) -> list[str]:
+    frames = []
+    for cid, x, y in tick['players']:
+        frames.append('42' + json.dumps(['player_move', {'id': cid, 'x': x, 'y': y}]))
+    for mid, x, y in tick['monsters']:
+        frames.append('42' + json.dumps(['monster_move', {'id': mid, 'x': x, 'y': y}]))
+    for hit in tick['monster_hits']:
+        frames.append('42' + json.dumps(['monster_hit', hit]))
+    return frames
+
+
+def timed(fn, rounds: int) -> tuple[float, object]:
+    out = fn()
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1e6, out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    print(f"{'players':>8} {'mode':>8} {'frames':>7} {'bytes':>9} {'encode us':>10} {'vs legacy':>10}")
+    for n in args.entities:
+        tick = make_tick(rnd, n)
+        players, monsters = HandleTable(), HandleTable()
+
+        us_legacy, frames = timed(lambda: legacy_frames(tick), args.rounds)
+        us_json, text = timed(lambda: '42' + json.dumps(['world_delta', tick]), args.rounds)
+        us_bin, blob = timed(lambda: encode_world_delta(tick, players, monsters), args.rounds)
+
+        legacy_bytes = sum(len(f) for f in frames)
+        rows = [
+            ('legacy', len(frames), legacy_bytes, us_legacy),
+            ('json', 1, len(text), us_json),
+            ('bin1', 2, BIN_HEADER + len(blob), us_bin),
+        ]
+        for mode, nframes, nbytes, us in rows:
+            print(f"{n:>8} {mode:>8} {nframes:>7} {nbytes:>9} {us:>10.1f} "
+                  f"{nbytes / legacy_bytes:>10.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -110,15 +110,16 @@ class LoadClient:
             http_session=self.http,
         )
         self.player_move_events = 0
+        self.token = ""
         self.connected = threading.Event()
 
         @self.socket.event
         def connect() -> None:
             self.connected.set()
 
-        @self.socket.on("player_move")
-        def on_player_move(_data: dict) -> None:
-            self.player_move_events += 1
+        @self.socket.on("world_delta")
+        def on_world_delta(data: dict) -> None:
+            self.player_move_events += len(data.get("players", ()))
 
     def setup(self) -> tuple[int, int]:
         username = random_username()
@@ -134,6 +135,14 @@ class LoadClient:
             201,
         )
         user_id = register_data["user"]["id"]
+        login_data = post_json(
+            self.http,
+            self.base_url,
+            "/auth/login",
+            {"username": username, "password": PASSWORD},
+            200,
+        )
+        self.token = login_data["token"]
         char_data = post_json(
             self.http,
             self.base_url,
@@ -149,7 +158,12 @@ class LoadClient:
         return user_id, char_id
 
     def connect_and_join(self, char_id: int) -> None:
-        self.socket.connect(self.base_url, transports=["polling"], wait_timeout=self.profile.timeout_s)
+        self.socket.connect(
+            self.base_url,
+            transports=["polling"],
+            auth={"token": self.token},
+            wait_timeout=self.profile.timeout_s,
+        )
         if not self.connected.wait(timeout=self.profile.timeout_s):
             raise RuntimeError("Socket connect timeout")
         self.socket.call(
@@ -1,6 +1,7 @@
 # shop.py
 from flask import Blueprint, request, jsonify
 from models import db, NPC, Character, Item, CharacterItem
+from utils.char_state import flush_live, absorb_live
 
 shop_bp = Blueprint('shop', __name__)
 
@@ -36,7 +37,8 @@ def buy_item(npc_id):
     if err:
         return err
 
-    # 2) 캐릭터 / 아이템 확인
+    # 2) 캐릭터 / 아이템 확인 (접속 중 메모리 변경분 먼저 기록)
+    flush_live([char_id])
     char = Character.query.get_or_404(char_id)
     item = Item.query.get_or_404(item_id)
 
@@ -59,6 +61,7 @@ def buy_item(npc_id):
     char_item.quantity += qty
 
     db.session.commit()
+    absorb_live(char)
 
     return jsonify({
         'message': f'Purchased {qty} x {item.name}',
@@ -87,7 +90,8 @@ def sell_item(npc_id):
     if err:
         return err
 
-    # 2) 캐릭터 / 아이템
+    # 2) 캐릭터 / 아이템 (접속 중 메모리 변경분 먼저 기록)
+    flush_live([char_id])
     char = Character.query.get_or_404(char_id)
     item = Item.query.get_or_404(item_id)
 
@@ -108,6 +112,7 @@ def sell_item(npc_id):
         db.session.delete(char_item)
 
     db.session.commit()
+    absorb_live(char)
 
     return jsonify({
         'message': f'Sold {qty} x {item.name}',
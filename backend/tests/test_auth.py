@@ -59,7 +59,13 @@ def test_login_success(client):
         "password": "abcd1234",
     })
     assert resp.status_code == 200
-    assert resp.get_json()["user"]["username"] == "login123"
+    body = resp.get_json()
+    assert body["user"]["username"] == "login123"
+    # 소켓 인증 토큰: 서명 검증 시 같은 user_id
+    from utils.socket_auth import verify_token
+    with client.application.app_context():
+        assert verify_token(body["token"]) == body["user"]["id"]
+        assert verify_token(body["token"] + "x") is None
 
 
 def test_login_wrong_password(client):
@@ -0,0 +1,43 @@
+from math import hypot
+
+from utils.dead_reckoning import MAX_EXTRAPOLATE, MAX_SPEED, MotionTable, clamp_velocity
+
+
+def test_position_extrapolates_from_keyframe():
+    t = MotionTable()
+    m = t.set(1, 'city', 100, 50, 200, -100, now=10.0)
+    assert m.position(10.5) == (200, 0)
+    assert m.position(9.0) == (100, 50)          # 키프레임 이전 시각은 그대로
+
+
+def test_extrapolation_capped():
+    m = MotionTable().set(1, 'city', 0, 0, 200, 0, now=0.0)
+    assert m.position(MAX_EXTRAPOLATE + 5) == (200 * MAX_EXTRAPOLATE, 0)
+
+
+def test_zero_velocity_removes_motion():
+    t = MotionTable()
+    t.set(1, 'city', 0, 0, 200, 0, now=0.0)
+    assert t.set(1, 'city', 40, 0, 0, 0, now=0.2) is None
+    assert 1 not in t and len(t) == 0
+
+
+def test_velocity_clamped():
+    vx, vy = clamp_velocity(3000, 4000)
+    assert abs(hypot(vx, vy) - MAX_SPEED) < 1e-9
+    assert clamp_velocity(200, 0) == (200, 0)
+
+
+def test_diagonal_clamped_by_length_not_per_axis():
+    m = MotionTable().set(1, 'city', 0, 0, MAX_SPEED, MAX_SPEED, now=0.0)
+    assert abs(hypot(m.vx, m.vy) - MAX_SPEED) < 1e-9
+    assert abs(m.vx - m.vy) < 1e-9                 # 방향은 그대로
+
+
+def test_items_is_snapshot():
+    t = MotionTable()
+    t.set(1, 'city', 0, 0, 200, 0, now=0.0)
+    t.set(2, 'city', 0, 0, 0, 200, now=0.0)
+    for char_id, _ in t.items():
+        t.stop(char_id)
+    assert len(t) == 0
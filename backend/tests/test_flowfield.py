@@ -0,0 +1,66 @@
+from utils.flowfield import FlowField, FlowFieldCache
+from utils.pathfinding import find_path
+from utils.walkable import WalkGrid, get_walkable
+
+
+def test_distances_match_shortest_paths():
+    grid = get_walkable("dungeon1")
+    goal = sorted(grid)[len(grid) // 2]
+    field = FlowField(grid, goal, max_dist=10_000)
+    for tile in list(grid)[::7]:
+        path = find_path(grid, tile, goal, max_expansions=10_000)
+        assert field.distance(*tile) == (None if path is None else len(path))
+
+
+def test_next_step_descends_and_avoids_blocked():
+    #  . . .
+    #  . # .
+    #  . . G
+    grid = WalkGrid.from_tiles(3, 3, [(0, 0), (1, 0), (2, 0), (0, 1), (2, 1), (0, 2), (1, 2), (2, 2)])
+    field = FlowField(grid, (2, 2))
+    assert field.distance(0, 0) == 4
+    assert field.next_step(grid, 0, 0) == (1, 0)          # N,E,S,W 순 첫 후보
+    assert field.next_step(grid, 0, 0, blocked={(1, 0)}) == (0, 1)
+    assert field.next_step(grid, 2, 2) is None            # 이미 도착
+    assert field.distance(1, 1) is None
+
+
+def test_max_dist_bounds_field():
+    grid = WalkGrid(20, 1, [1] * 20)
+    field = FlowField(grid, (0, 0), max_dist=5)
+    assert field.distance(5, 0) == 5
+    assert field.distance(6, 0) is None
+    assert field.next_step(grid, 6, 0) is None
+
+
+def test_cache_reuses_until_target_moves():
+    grid = WalkGrid(8, 8, [1] * 64)
+    cache = FlowFieldCache()
+    a = cache.get("m", grid, 1, (3, 3))
+    assert cache.get("m", grid, 1, (3, 3)) is a            # 몬스터 여러 마리 = field 하나
+    b = cache.get("m", grid, 1, (4, 3))
+    assert b is not a and cache.builds == 2 and cache.hits == 1
+
+
+def test_cache_caps_fields_per_map():
+    grid = WalkGrid(4, 4, [1] * 16)
+    cache = FlowFieldCache(max_per_map=2)
+    first = cache.get("m", grid, 1, (0, 0))
+    cache.get("m", grid, 2, (1, 1))
+    cache.get("m", grid, 1, (0, 0))                         # 1 을 최근 사용으로
+    cache.get("m", grid, 3, (2, 2))                         # 2 가 밀려남
+    cache.get("other", grid, 9, (0, 0))
+    assert len(cache) == 3
+    assert cache.get("m", grid, 1, (0, 0)) is first
+
+
+def test_forget_and_invalidate():
+    grid = WalkGrid(4, 4, [1] * 16)
+    cache = FlowFieldCache()
+    cache.get("a", grid, 1, (0, 0))
+    cache.get("b", grid, 1, (0, 0))
+    cache.get("b", grid, 2, (0, 0))
+    cache.forget(1)
+    assert len(cache) == 1
+    cache.invalidate("b")
+    assert len(cache) == 0
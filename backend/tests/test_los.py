@@ -0,0 +1,44 @@
+from utils.los import LosCache, bresenham, line_clear
+from utils.walkable import WalkGrid
+
+
+def _grid(rows):
+    return WalkGrid(len(rows[0]), len(rows), [ch == "." for row in rows for ch in row])
+
+
+def test_bresenham_endpoints_and_steps():
+    line = list(bresenham((0, 0), (4, 2)))
+    assert line[0] == (0, 0) and line[-1] == (4, 2)
+    assert len(line) == 5
+    assert list(bresenham((3, 3), (3, 3))) == [(3, 3)]
+    assert list(bresenham((2, 0), (0, 0))) == [(2, 0), (1, 0), (0, 0)]
+
+
+def test_wall_blocks_sight():
+    grid = _grid([
+        ".....",
+        "..#..",
+        ".....",
+    ])
+    assert not line_clear(grid, (0, 1), (4, 1))
+    assert line_clear(grid, (0, 0), (4, 0))
+    assert not line_clear(grid, (0, 0), (2, 1))          # 끝점이 벽
+
+
+def test_cache_within_radius_only():
+    grid = _grid(["." * 10])
+    los = LosCache(radius=4)
+    assert los.visible("m", grid, (0, 0), (3, 0))
+    assert los.visible("m", grid, (0, 0), (3, 0))
+    assert los.hits == 1 and los.misses == 1 and len(los) == 1
+    assert los.visible("m", grid, (0, 0), (9, 0))         # 반경 밖 — 계산만
+    assert len(los) == 1
+
+
+def test_invalidate_on_map_change():
+    open_grid = _grid(["....."])
+    walled = _grid(["..#.."])
+    los = LosCache(radius=4)
+    assert los.visible("m", open_grid, (0, 0), (4, 0))
+    los.invalidate("m")
+    assert not los.visible("m", walled, (0, 0), (4, 0))
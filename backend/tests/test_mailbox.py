@@ -0,0 +1,72 @@
+import eventlet
+import pytest
+
+from utils.mailbox import SerialExecutor
+
+
+def test_same_key_runs_in_order_without_overlap():
+    ex = SerialExecutor()
+    log: list[str] = []
+
+    def work(tag):
+        log.append(f'start {tag}')
+        eventlet.sleep(0)                 # DB/네트워크 대기 흉내 — 다른 greenlet 이 끼어듦
+        log.append(f'end {tag}')
+
+    pool = eventlet.GreenPool()
+    for tag in 'abc':
+        pool.spawn(ex.submit, 1, work, tag)
+    pool.waitall()
+    assert log == ['start a', 'end a', 'start b', 'end b', 'start c', 'end c']
+    assert ex.queued == 2 and len(ex) == 0
+
+
+def test_different_keys_interleave():
+    ex = SerialExecutor()
+    log: list[str] = []
+
+    def work(tag):
+        log.append(f'start {tag}')
+        eventlet.sleep(0)
+        log.append(f'end {tag}')
+
+    pool = eventlet.GreenPool()
+    pool.spawn(ex.submit, 1, work, 'a')
+    pool.spawn(ex.submit, 2, work, 'b')
+    pool.waitall()
+    assert log[:2] == ['start a', 'start b']
+
+
+def test_coalesce_keeps_latest_queued_args():
+    ex = SerialExecutor()
+    seen: list[int] = []
+
+    def work(n):
+        if n == 0:
+            for i in (1, 2, 3):
+                assert ex.submit('k', work, i, coalesce=True) is False
+        seen.append(n)
+
+    assert ex.submit('k', work, 0, coalesce=True) is True
+    assert seen == [0, 3]
+    assert ex.coalesced == 2
+
+
+def test_failure_does_not_drop_queued_work():
+    errors: list[BaseException] = []
+    ex = SerialExecutor(on_error=errors.append)
+    seen: list[int] = []
+
+    def boom():
+        ex.submit('k', seen.append, 1)
+        raise RuntimeError('x')
+
+    ex.submit('k', boom)
+    assert seen == [1] and len(errors) == 1
+
+
+def test_failure_propagates_without_handler():
+    ex = SerialExecutor()
+    with pytest.raises(RuntimeError):
+        ex.submit('k', lambda: (_ for _ in ()).throw(RuntimeError('x')))
+    assert len(ex) == 0
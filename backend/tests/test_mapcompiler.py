@@ -0,0 +1,130 @@
+import json
+import shutil
+
+import pytest
+
+from utils import mapcompiler
+from utils.mapcompiler import (
+    INVALID_TILE_ID, MAGIC, TRIG_MONSTER_FORBIDDEN, CompiledMap, MapBinError,
+    compile_bytes, ensure_compiled, load_map,
+)
+from utils.walkable import ROOT, WalkGrid, parse_tiled
+
+
+@pytest.fixture()
+def build(tmp_path, monkeypatch):
+    """원본 JSON 은 tmp/src 로 복사, 산출물은 tmp/build 로"""
+    src = tmp_path / "src"
+    src.mkdir()
+    shutil.copy(ROOT / "dungeon1.json", src / "dungeon1.json")
+    monkeypatch.setattr(mapcompiler, "ROOT", src)
+    monkeypatch.setattr(mapcompiler, "BUILD_DIR", tmp_path / "build")
+    return src
+
+
+def _reference():
+    data = json.loads((ROOT / "dungeon1.json").read_text(encoding="utf-8"))
+    return parse_tiled(data)
+
+
+def test_compiled_map_matches_json(build):
+    w, h, gids, collidable = _reference()
+    cm = load_map("dungeon1")
+    assert (cm.width, cm.height) == (w, h)
+    assert list(cm.layer.gids) == gids
+    ref = WalkGrid(w, h, (g == 0 or g not in collidable for g in gids))
+    assert bytes(cm.walk.cells) == bytes(ref.cells)
+    assert len(cm.walk) == len(ref)
+    assert cm.walk.neighbors(1, 1) == ref.neighbors(1, 1)
+    assert len(cm.tiles_with_flag(TRIG_MONSTER_FORBIDDEN)) == gids.count(INVALID_TILE_ID)
+
+
+def test_mmap_view_is_read_only(build):
+    cm = load_map("dungeon1")
+    with pytest.raises(TypeError):
+        cm.walk.cells[0] = 0
+
+
+def test_recompiles_only_when_source_changes(build):
+    path, fresh = ensure_compiled("dungeon1")
+    assert fresh and path.read_bytes()[:4] == MAGIC
+    assert ensure_compiled("dungeon1") == (path, False)
+
+    data = json.loads((build / "dungeon1.json").read_text(encoding="utf-8"))
+    layer = next(l for l in data["layers"] if l["type"] == "tilelayer")
+    layer["data"][0] = 0
+    (build / "dungeon1.json").write_text(json.dumps(data), encoding="utf-8")
+
+    _, fresh = ensure_compiled("dungeon1")
+    assert fresh
+    assert load_map("dungeon1").layer.gid(0, 0) == 0
+
+
+def test_stale_artifact_hash_is_replaced(build):
+    path, _ = ensure_compiled("dungeon1")
+    blob = bytearray(path.read_bytes())
+    blob[20] ^= 0xFF                         # 헤더의 원본 sha256 변조
+    path.write_bytes(bytes(blob))
+    assert ensure_compiled("dungeon1")[1] is True
+
+
+def test_missing_source_raises(build):
+    with pytest.raises(FileNotFoundError):
+        load_map("nowhere")
+
+
+@pytest.mark.parametrize("patch", [
+    lambda b: b"XXXX" + b[4:],               # magic
+    lambda b: b[:4] + b"\x63\x00" + b[6:],   # version 99
+    lambda b: b[:10],                        # 잘린 헤더
+])
+def test_bad_header_rejected(patch):
+    blob = compile_bytes((ROOT / "dungeon1.json").read_bytes())
+    with pytest.raises(MapBinError):
+        CompiledMap("dungeon1", patch(blob))
+
+
+def test_trigger_flags_match_gid_layer(build):
+    w, h, gids, _ = _reference()
+    cm = load_map("dungeon1")
+    for i, g in enumerate(gids):
+        assert bool(cm.flags(i % w, i // w) & TRIG_MONSTER_FORBIDDEN) == (g == INVALID_TILE_ID)
+    assert cm.flags(-1, 0) == 0 and cm.flags(w, 0) == 0
+
+
+def _box_map(rows):
+    """'#'=벽 '.'=통과 문자열 목록 → CompiledMap"""
+    w, h = len(rows[0]), len(rows)
+    raw = json.dumps({
+        "tilesets": [{"firstgid": 1, "tiles": [
+            {"id": 1, "properties": [{"name": "collides", "type": "bool", "value": True}]}]}],
+        "layers": [{"type": "tilelayer", "width": w, "height": h,
+                    "data": [2 if ch == "#" else 1 for row in rows for ch in row]}],
+    }).encode()
+    return CompiledMap("box", compile_bytes(raw))
+
+
+def test_components_label_pockets():
+    cm = _box_map([
+        "...#.",
+        "...#.",
+        "#.##.",
+        ".#...",
+    ])
+    assert cm.component(0, 0) == 1                    # 가장 큰 요소 (7칸 vs 6칸)
+    assert cm.component(4, 0) == 2
+    assert cm.component(0, 3) == 3
+    assert cm.component(3, 0) == 0 and cm.component(-1, 0) == 0
+    assert cm.reachable((0, 0), (2, 1))
+    assert cm.reachable((4, 0), (2, 3))
+    assert not cm.reachable((0, 0), (4, 0))
+    assert not cm.reachable((3, 0), (3, 0))           # 벽끼리는 도달 불가
+    assert cm.nearest_in_main(3, 0) == (2, 0)
+    assert cm.nearest_in_main(4, 3, max_radius=1) is None
+
+
+def test_components_match_walkable_connectivity(build):
+    cm = load_map("dungeon1")
+    for x, y in cm.walk:
+        for nx, ny in cm.walk.neighbors(x, y):
+            assert cm.component(x, y) == cm.component(nx, ny) != 0
@@ -0,0 +1,116 @@
+import json
+import shutil
+
+import pytest
+from flask import Flask
+
+from utils import mapcompiler
+from utils.mapregistry import MapRegistry, forget_live, live_registry, maps, reload_live
+from utils.walkable import ROOT
+
+
+@pytest.fixture()
+def src(tmp_path, monkeypatch):
+    """Tiled JSON 검색 경로를 tmp/src 하나로"""
+    d = tmp_path / "src"
+    d.mkdir()
+    shutil.copy(ROOT / "dungeon1.json", d / "dungeon1.json")
+    monkeypatch.setattr(mapcompiler, "SOURCE_DIRS", [d])
+    monkeypatch.setattr(mapcompiler, "BUILD_DIR", tmp_path / "build")
+    return d
+
+
+def _edit_first_gid(path, gid):
+    data = json.loads(path.read_text(encoding="utf-8"))
+    next(l for l in data["layers"] if l["type"] == "tilelayer")["data"][0] = gid
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_lazy_load_once(src):
+    reg = MapRegistry()
+    assert "dungeon1" not in reg
+    cm = reg.get("dungeon1")
+    assert reg.get("dungeon1") is cm
+    assert reg.loads == 1 and len(reg) == 1
+
+
+def test_missing_map_cached_as_none(src):
+    reg = MapRegistry()
+    assert reg.find("nowhere") is None
+    with pytest.raises(FileNotFoundError):
+        reg.get("nowhere")
+    (src / "nowhere.json").write_bytes((src / "dungeon1.json").read_bytes())
+    assert reg.find("nowhere") is None          # 음수 캐시 — reload 전까지 재탐색 안 함
+    reg.reload("nowhere")
+    assert reg.find("nowhere") is not None
+
+
+def test_json_file_from_map_row(src):
+    shutil.move(src / "dungeon1.json", src / "cave.json")
+    reg = MapRegistry()
+    reg.resolve = lambda key: {"dungeon1": "maps/cave.json"}.get(key)
+    assert reg.source_path("dungeon1") == src / "cave.json"   # 디렉터리 부분은 무시
+    assert reg.find("dungeon1") is not None
+
+
+def test_unknown_key_not_memoized(src):
+    reg = MapRegistry()
+    reg.resolve = lambda key: None              # Map 행 없음
+    assert reg.source_path("ghost") is None
+    assert "ghost" not in reg._files
+
+
+def test_reload_swaps_snapshot(src):
+    reg = MapRegistry()
+    old = reg.get("dungeon1")
+    old_gid = old.layer.gid(0, 0)
+    _edit_first_gid(src / "dungeon1.json", 0)
+
+    new = reg.reload("dungeon1")
+    assert new is reg.get("dungeon1") and new is not old
+    assert new.layer.gid(0, 0) == 0
+    assert old.layer.gid(0, 0) == old_gid       # 이전 틱이 잡은 스냅샷은 그대로
+    assert reg.reloads == 1
+
+
+def test_reload_unloaded_map_defers(src):
+    reg = MapRegistry()
+    assert reg.reload("dungeon1") is None
+    assert "dungeon1" not in reg and reg.loads == 0
+
+
+def test_reload_with_new_json_file(src):
+    reg = MapRegistry()
+    reg.get("dungeon1")
+    shutil.copy(src / "dungeon1.json", src / "dungeon1b.json")
+    _edit_first_gid(src / "dungeon1b.json", 0)
+    assert reg.reload("dungeon1", "dungeon1b.json").layer.gid(0, 0) == 0
+
+
+def test_warm_skips_missing(src):
+    reg = MapRegistry()
+    assert reg.warm(["dungeon1", "nowhere"]) == ["dungeon1"]
+
+
+def test_live_helpers_use_app_extension(src):
+    reg = MapRegistry()
+    app = Flask(__name__)
+    with app.app_context():
+        reload_live("dungeon1")                 # 레지스트리 없는 앱 — 아무 일 없음
+    app.extensions["map_registry"] = reg
+    old = reg.get("dungeon1")
+    with app.app_context():
+        reload_live("dungeon1")
+        assert reg.get("dungeon1") is not old
+        forget_live("dungeon1")
+    assert "dungeon1" not in reg
+
+
+def test_live_registry_prefers_empty_app_registry():
+    reg = MapRegistry()
+    app = Flask(__name__)
+    with app.app_context():
+        assert live_registry() is maps          # 등록 안 된 앱만 프로세스 공용으로
+    app.extensions["map_registry"] = reg
+    with app.app_context():
+        assert len(reg) == 0 and live_registry() is reg
@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_create_map(admin_client):
     resp = admin_client.post("/api/maps", json={
         "key": "testmap",
@@ -43,3 +46,173 @@ def test_create_map_requires_admin(client):
     """미인증 요청은 401 반환"""
     resp = client.post("/api/maps", json={"key": "hack", "display_name": "Hack"})
     assert resp.status_code == 401
+
+
+@pytest.fixture()
+def chunked(app, client, admin_client, monkeypatch):
+    """dungeon1(20x30) 을 8x8 청크로 — 캐릭터는 타일 (9, 17), client 는 그 주인으로 로그인"""
+    from models import db, User, Character
+    from utils import mapchunks
+    monkeypatch.setattr(mapchunks, "CHUNK_TILES", 8)
+    admin_client.post("/api/maps", json={"key": "dungeon1", "json_file": "dungeon1.json"})
+    user = User(username="chunker")
+    db.session.add(user)
+    db.session.flush()
+    char = Character(name="chunker", map_key="dungeon1", x=9 * 128 + 10, y=17 * 128 + 10,
+                     hp=100, max_hp=100, user_id=user.id)
+    db.session.add(char)
+    db.session.commit()
+    with client.session_transaction() as sess:
+        sess["user_id"] = user.id
+    return char
+
+
+def test_chunk_manifest_only_near_player(client, chunked):
+    resp = client.get(f"/api/maps/dungeon1/chunks?character_id={chunked.id}")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert (body["cols"], body["rows"], body["center"]) == (3, 4, [1, 2])
+    assert sorted((c["cx"], c["cy"]) for c in body["chunks"]) == [
+        (cx, cy) for cx in range(3) for cy in range(1, 4)]
+
+    far = client.get(f"/api/maps/dungeon1/chunks?character_id={chunked.id}&r=0").get_json()
+    assert [(c["cx"], c["cy"]) for c in far["chunks"]] == [(1, 2)]
+
+
+def test_chunk_body_is_immutable_and_matches_layer(client, chunked):
+    from utils.walkable import get_tile_layer
+    manifest = client.get(f"/api/maps/dungeon1/chunks?character_id={chunked.id}").get_json()
+    edge = next(c for c in manifest["chunks"] if (c["cx"], c["cy"]) == (2, 3))
+    resp = client.get(edge["url"])
+    assert resp.status_code == 200
+    assert "immutable" in resp.headers["Cache-Control"]
+    body = resp.get_json()
+    assert (body["x0"], body["y0"], body["w"], body["h"]) == (16, 24, 4, 6)   # 잘린 끝 청크
+    layer = get_tile_layer("dungeon1")
+    assert body["gids"] == [layer.gid(x, y) for y in range(24, 30) for x in range(16, 20)]
+
+    again = client.get(edge["url"], headers={"If-None-Match": f'"{edge["hash"]}"'})
+    assert again.status_code == 304
+
+
+def test_chunk_stale_hash_and_bad_requests(client, chunked):
+    q = f"?character_id={chunked.id}"
+    assert client.get("/api/maps/dungeon1/chunks/0/0/deadbeef" + q).status_code == 404
+    assert client.get("/api/maps/dungeon1/chunks/9/9/deadbeef" + q).status_code == 404
+    assert client.get("/api/maps/dungeon1/chunks").status_code == 400
+    assert client.get("/api/maps/dungeon1/chunks?character_id=999").status_code == 404
+
+
+def test_chunks_require_owner_login(app, client, chunked):
+    from models import db, User, Character
+    manifest = client.get(f"/api/maps/dungeon1/chunks?character_id={chunked.id}").get_json()
+    url = manifest["chunks"][0]["url"]
+    other = User(username="peeker")
+    db.session.add(other)
+    db.session.commit()
+    theirs = Character(name="peeker", map_key="dungeon1", x=0, y=0, user_id=other.id)
+    db.session.add(theirs)
+    db.session.commit()
+
+    assert client.get(f"/api/maps/dungeon1/chunks?character_id={theirs.id}").status_code == 404
+    anon = app.test_client()
+    assert anon.get(f"/api/maps/dungeon1/chunks?character_id={chunked.id}").status_code == 401
+    assert anon.get(url).status_code == 401
+
+
+def test_chunk_body_only_near_character(client, chunked, monkeypatch):
+    import maps
+    monkeypatch.setattr(maps, "CHUNK_RADIUS_MAX", 1)
+    manifest = client.get(f"/api/maps/dungeon1/chunks?character_id={chunked.id}").get_json()
+    near = next(c for c in manifest["chunks"] if (c["cx"], c["cy"]) == (1, 1))
+    assert client.get(near["url"]).status_code == 200
+    far = f"/api/maps/dungeon1/chunks/1/0/deadbeef?character_id={chunked.id}"
+    assert client.get(far).status_code == 403                # 해시와 무관하게 멀면 거부
+
+
+def test_chunk_centre_uses_live_state(app, client, chunked):
+    from utils.char_state import CharStateStore
+    states = app.extensions["char_states"] = CharStateStore()
+    url = f"/api/maps/dungeon1/chunks?character_id={chunked.id}&r=0"
+    assert client.get(url).status_code == 409                 # 소켓 서버인데 접속 안 함
+    states.adopt(chunked).set(x=1 * 128, y=1 * 128)           # 서버가 검증한 최신 좌표
+    assert client.get(url).get_json()["center"] == [0, 0]
+
+
+def _bundle_json(resp):
+    import gzip
+    import json
+    raw = resp.data
+    if resp.headers.get("Content-Encoding") == "gzip":
+        raw = gzip.decompress(raw)
+    return json.loads(raw)
+
+
+@pytest.fixture()
+def bundled(admin_client):
+    admin_client.post("/api/maps", json={
+        "key": "dungeon1", "json_file": "dungeon1.json",
+        "map_data": '{"start_position": [10, 2], "teleports": [{"from": {"x": 1, "y": 0}, '
+                    '"to_map": "worldmap", "to_position": [12, 9]}]}',
+    })
+    admin_client.post("/api/npcs", json={"name": "Guard", "map_key": "dungeon1", "x": 3, "y": 4})
+    return admin_client
+
+
+def test_bundle_contains_everything_for_map_entry(client, bundled):
+    resp = client.get("/api/maps/dungeon1/bundle", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    body = _bundle_json(resp)
+    assert body["map"]["key"] == "dungeon1"
+    assert body["start_position"] == [10, 2]
+    assert body["teleports"][0]["to_map"] == "worldmap"
+    assert [n["name"] for n in body["npcs"]] == ["Guard"]
+    assert body["tilemap"]["layers"]
+    assert resp.headers["ETag"] == f'W/"{body["version"]}"'
+
+    plain = client.get("/api/maps/dungeon1/bundle", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert _bundle_json(plain) == body
+
+
+def test_bundle_etag_revalidates_without_db(client, bundled, app):
+    from unittest.mock import patch
+    first = client.get("/api/maps/dungeon1/bundle")
+    etag = first.headers["ETag"]
+    with patch("maps.Map.query") as q:
+        resp = client.get("/api/maps/dungeon1/bundle", headers={"If-None-Match": etag})
+        q.get_or_404.assert_not_called()            # 캐시 적중 — DB 조회 없음
+    assert resp.status_code == 304
+
+
+def test_bundle_regenerated_on_map_or_npc_change(client, bundled):
+    v1 = _bundle_json(client.get("/api/maps/dungeon1/bundle"))["version"]
+    bundled.put("/api/maps/dungeon1", json={"display_name": "Ice Cavern"})
+    v2 = _bundle_json(client.get("/api/maps/dungeon1/bundle"))["version"]
+    assert v2 != v1
+    bundled.post("/api/npcs", json={"name": "Smith", "map_key": "dungeon1", "x": 5, "y": 5})
+    body = _bundle_json(client.get("/api/maps/dungeon1/bundle"))
+    assert body["version"] != v2 and len(body["npcs"]) == 2
+
+
+def test_bundle_unknown_map_404(client, monkeypatch):
+    from utils.mapregistry import maps as registry
+    monkeypatch.setattr(registry, "resolve", lambda key: None)
+    assert client.get("/api/maps/nowhere/bundle").status_code == 404
+    assert "nowhere" not in registry._files        # 익명 요청으로 레지스트리가 자라지 않음
+
+
+def test_bundle_cache_notices_tilemap_file_change(tmp_path):
+    import os
+    from models import Map
+    from utils import mapbundle
+    src = tmp_path / "cave.json"
+    src.write_text('{"layers": []}', encoding="utf-8")
+    bundle = mapbundle.store(mapbundle.build_bundle(Map(key="cave", map_data="{}"), [], src))
+    assert mapbundle.cached("cave", src) is bundle
+    src.write_text('{"layers": [1]}', encoding="utf-8")
+    os.utime(src, ns=(0, 0))
+    assert mapbundle.cached("cave", src) is None
+    mapbundle.invalidate("cave")
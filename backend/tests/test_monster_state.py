@@ -0,0 +1,48 @@
+from models import Monster
+from utils.monster_state import MonsterStore
+
+
+def _mob(session, map_key="dungeon1", x=1, y=1, **kw):
+    m = Monster(name="Slime", species="Slime", map_key=map_key, x=x, y=y,
+                hp=20, max_hp=20, spawn_x=x, spawn_y=y, is_alive=True, **kw)
+    session.add(m)
+    session.commit()
+    return m
+
+
+def test_loads_each_map_once(session):
+    a = _mob(session)
+    _mob(session, map_key="other")
+    store = MonsterStore()
+    assert [m.id for m in store.on_map("dungeon1")] == [a.id]
+    _mob(session, x=5)                                   # 로드 뒤 추가된 행은 adopt 전까지 안 보임
+    assert len(store.on_map("dungeon1")) == 1
+    assert store.loads == 1 and "other" not in store
+
+
+def test_flush_writes_only_changed(session):
+    a, b = _mob(session), _mob(session, x=2)
+    store = MonsterStore()
+    store.on_map("dungeon1")
+    assert store.flush() == 0
+    st = store.get(a.id)
+    st.x, st.hp = 4, 7
+    st.target_char_id = 99                               # 메모리 전용 — 기록 대상 아님
+    store.get(b.id).target_char_id = 1
+    assert store.dirty_count() == 1
+    assert store.flush() == 1
+    session.expire_all()
+    assert (session.get(Monster, a.id).x, session.get(Monster, a.id).hp) == (4, 7)
+    assert store.flush() == 0
+
+
+def test_flush_subset_and_to_dict(session):
+    a, b = _mob(session), _mob(session, x=2)
+    store = MonsterStore()
+    store.on_map("dungeon1")
+    for mid in (a.id, b.id):
+        store.get(mid).hp = 0
+    assert store.flush([b.id]) == 1                      # 사망한 몬스터만 즉시
+    assert store.dirty_count() == 1
+    d = store.get(a.id).to_dict()
+    assert d == {**a.to_dict(), "hp": 0}
@@ -0,0 +1,119 @@
+import random
+from collections import deque
+
+import pytest
+
+from utils.mapregistry import MapRegistry
+from utils.pathfinding import PathCache, find_path
+from utils.walkable import WalkGrid, get_walkable
+
+
+def _bfs_len(grid, start, goal):
+    """기준값 — 4방향 BFS 최단 거리 (못 가면 None)"""
+    dist = {start: 0}
+    q = deque([start])
+    while q:
+        cur = q.popleft()
+        if cur == goal:
+            return dist[cur]
+        for n in grid.neighbors(*cur):
+            if n not in dist:
+                dist[n] = dist[cur] + 1
+                q.append(n)
+    return None
+
+
+def _assert_valid(grid, start, path):
+    prev = start
+    for step in path:
+        assert step in grid.neighbors(*prev)
+        prev = step
+
+
+def test_routes_around_wall():
+    #  . # .
+    #  . # .
+    #  . . .
+    grid = WalkGrid.from_tiles(3, 3, [(0, 0), (2, 0), (0, 1), (2, 1), (0, 2), (1, 2), (2, 2)])
+    path = find_path(grid, (0, 0), (2, 0))
+    assert path == [(0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0)]
+
+
+def test_trivial_and_blocked():
+    grid = WalkGrid.from_tiles(3, 1, [(0, 0), (2, 0)])
+    assert find_path(grid, (0, 0), (0, 0)) == []
+    assert find_path(grid, (0, 0), (2, 0)) is None
+    assert find_path(grid, (0, 0), (1, 0)) is None        # 목적지가 벽
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_grids_match_bfs(seed):
+    rnd = random.Random(seed)
+    w, h = 24, 18
+    grid = WalkGrid(w, h, [rnd.random() < 0.72 for _ in range(w * h)])
+    tiles = list(grid)
+    for _ in range(15):
+        a, b = rnd.choice(tiles), rnd.choice(tiles)
+        path = find_path(grid, a, b, max_expansions=10_000)
+        expected = _bfs_len(grid, a, b)
+        if expected is None:
+            assert path is None
+        else:
+            assert len(path) == expected
+            _assert_valid(grid, a, path)
+            assert (path[-1] if path else a) == b
+
+
+def test_dungeon1_paths_are_shortest():
+    grid = get_walkable("dungeon1")
+    tiles = sorted(grid)
+    rnd = random.Random(3)
+    for _ in range(30):
+        a, b = rnd.choice(tiles), rnd.choice(tiles)
+        path = find_path(grid, a, b, max_expansions=10_000)
+        expected = _bfs_len(grid, a, b)
+        assert (path is None) == (expected is None)
+        if path is not None:
+            assert len(path) == expected
+            _assert_valid(grid, a, path)
+
+
+def test_cache_follows_path_without_recompute():
+    grid = WalkGrid(10, 1, [1] * 10)
+    cache = PathCache()
+    pos, goal = (0, 0), (9, 0)
+    while (step := cache.next_step("m", grid, pos, goal)) is not None:
+        pos = step
+    assert pos == goal
+    assert cache.misses == 1 and cache.hits == 8
+
+
+def test_cache_remembers_unreachable():
+    grid = WalkGrid.from_tiles(3, 1, [(0, 0), (2, 0)])
+    cache = PathCache()
+    assert cache.next_step("m", grid, (0, 0), (2, 0)) is None
+    assert cache.path("m", grid, (0, 0), (2, 0)) is None
+    assert cache.misses == 1 and cache.hits == 1
+
+
+def test_cache_lru_capacity():
+    grid = WalkGrid(10, 10, [1] * 100)
+    cache = PathCache(capacity=5)
+    cache.next_step("m", grid, (0, 0), (9, 9))
+    assert len(cache) == 5
+    assert cache.next_step("m", grid, (0, 0), (9, 9)) is not None
+    assert cache.misses == 2                    # 경로 앞부분은 밀려났음
+
+
+def test_cache_invalidated_on_registry_reload(tmp_path, monkeypatch):
+    from utils import mapcompiler
+    monkeypatch.setattr(mapcompiler, "BUILD_DIR", tmp_path / "build")
+    reg = MapRegistry()
+    cache = PathCache()
+    reg.listeners.append(cache.invalidate)
+    grid = reg.get("dungeon1").walk
+    a, b = sorted(grid)[0], sorted(grid)[-1]
+    cache.path("dungeon1", grid, a, b)
+    cache.path("other", WalkGrid(2, 1, [1, 1]), (0, 0), (1, 0))
+    reg.reload("dungeon1")
+    assert len(cache) == 1                       # 다른 맵 항목은 유지
@@ -0,0 +1,39 @@
+from utils.rate_limit import SidRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_refill():
+    clock = FakeClock()
+    rl = SidRateLimiter({'move': (8.0, 3)}, clock=clock)
+    assert [rl.allow('s1', 'move') for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.125                    # 8/s → 토큰 1개
+    assert rl.allow('s1', 'move') is True
+    assert rl.allow('s1', 'move') is False
+    clock.now += 10                       # 오래 쉬어도 burst 이상 쌓이지 않음
+    assert sum(rl.allow('s1', 'move') for _ in range(10)) == 3
+
+
+def test_buckets_are_per_sid_and_event():
+    rl = SidRateLimiter({'move': (1.0, 1), 'chat_message': (1.0, 1)}, clock=FakeClock())
+    assert rl.allow('s1', 'move')
+    assert not rl.allow('s1', 'move')
+    assert rl.allow('s2', 'move')
+    assert rl.allow('s1', 'chat_message')
+    assert rl.allow('s1', 'join_map')     # 제한 없는 이벤트
+    assert len(rl) == 3
+
+
+def test_forget_drops_sid_buckets():
+    rl = SidRateLimiter({'move': (1.0, 1)}, clock=FakeClock())
+    rl.allow('s1', 'move')
+    rl.allow('s2', 'move')
+    rl.forget('s1')
+    assert len(rl) == 1
+    assert rl.allow('s1', 'move')         # 새 버킷 = 가득 찬 상태
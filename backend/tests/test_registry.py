@@ -0,0 +1,52 @@
+import pytest
+
+from utils.registry import EntityRegistry, PlayerSession, SessionRegistry
+
+
+def test_session_slots_reject_new_attributes():
+    with pytest.raises(AttributeError):
+        PlayerSession(1).extra = True
+
+
+def test_open_resets_tile_cache_only():
+    reg = SessionRegistry()
+    sess = reg.touch(1)
+    sess.last_tile = ('city', 1, 1)
+    sess.last_move_sent = 5.0
+    assert reg.open(1, 'sid-a') is sess
+    assert sess.last_tile is None and sess.last_move_sent == 5.0 and sess.sid == 'sid-a'
+
+
+def test_close_and_sweep():
+    reg = SessionRegistry()
+    for cid in (1, 2, 3):
+        reg.touch(cid)
+    assert reg.close(1).char_id == 1
+    assert reg.close(1) is None
+    assert reg.sweep({3: 'sid'}) == 1
+    assert 2 not in reg and len(reg) == 1
+
+
+def test_knockback_expires_and_is_removed():
+    ents = EntityRegistry()
+    ents.knock_back(7, until=10.0)
+    assert ents.knocked_back(7, now=9.0)
+    assert not ents.knocked_back(7, now=10.0)
+    assert len(ents) == 0
+
+
+def test_forget_on_death():
+    ents = EntityRegistry()
+    ents.knock_back(7, until=10.0)
+    ents.forget(7)
+    assert not ents.knocked_back(7, now=0.0)
+
+
+def test_return_survives_knockback_expiry():
+    ents = EntityRegistry()
+    ents.start_return(7)
+    ents.knock_back(7, until=10.0)
+    assert not ents.knocked_back(7, now=11.0)
+    assert ents.returning(7)
+    ents.end_return(7)
+    assert not ents.returning(7) and len(ents) == 0
@@ -0,0 +1,74 @@
+from utils.scheduler import MapTicker, WorldScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, s):
+        self.now += s
+
+
+def _sched(clock):
+    return WorldScheduler(spawn=lambda fn, *a: None, sleep=clock.sleep, clock=clock)
+
+
+def test_fixed_rate_and_jitter():
+    clock = FakeClock()
+    sched = _sched(clock)
+    t = sched.add("m", 1.0, lambda key: None)
+    due = sched.run_once(t, clock.now)
+    assert due == 101.0                                   # 소요시간 0 → 정확히 한 주기 뒤
+    clock.now = 101.25                                    # 250 ms 늦게 깨어남
+    assert sched.run_once(t, due) == 102.0                # 예정 시각 기준 — 지연이 누적되지 않음
+    st = t.stats()
+    assert st["ticks"] == 2 and st["overruns"] == 0
+    assert st["max_jitter_ms"] == 250.0 and 0 < st["jitter_ms"] < 250
+
+
+def test_overrun_skips_missed_ticks():
+    clock = FakeClock()
+    sched = _sched(clock)
+
+    def slow(key):
+        clock.now += 2.5
+
+    t = sched.add("m", 1.0, slow)
+    due = sched.run_once(t, clock.now)
+    assert due == clock.now + 1.0                         # 밀린 2 틱을 몰아서 돌리지 않음
+    assert t.overruns == 1 and t.max_ms == 2500.0
+
+
+def test_maps_tick_independently():
+    clock = FakeClock()
+    spawned = []
+    sched = WorldScheduler(spawn=lambda fn, t: spawned.append(t), sleep=clock.sleep, clock=clock)
+    seen = []
+    sched.sync(["a", "b"], {"a": 0.5, "b": 2.0}.get, seen.append)
+    assert [t.map_key for t in spawned] == ["a", "b"]     # 맵마다 태스크 하나
+    assert spawned[0].period == 0.5 and spawned[1].period == 2.0
+
+    sched.sync(["b"], lambda key: 1.0, seen.append)
+    assert "a" not in sched and not spawned[0].running    # 몬스터 없어진 맵은 루프 종료
+    assert spawned[1].period == 1.0 and len(spawned) == 2  # 기존 태스크는 주기만 갱신
+
+
+def test_tick_errors_do_not_stop_loop():
+    clock = FakeClock()
+    sched = _sched(clock)
+    errors = []
+    sched.on_error = lambda key, e: errors.append(key)
+    calls = []
+
+    def boom(key):
+        calls.append(key)
+        if len(calls) >= 3:
+            t.running = False
+        raise RuntimeError("x")
+
+    t = MapTicker("m", 0.5, boom)
+    sched._run(t)
+    assert calls == ["m"] * 3 and errors == ["m"] * 3 and t.ticks == 3
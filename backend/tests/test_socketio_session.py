@@ -3,7 +3,9 @@
 레이어 A: with_db_session 데코레이터 단위 테스트
 레이어 B: 실제 Socket.IO 이벤트 emit + session.remove spy
 """
+import json
 import sys
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -151,20 +153,24 @@ def socketio_app():
 
 @pytest.fixture()
 def sio_client(socketio_app):
-    """socketio.test_client 생성 + sid 검증 자동 통과 설정"""
+    """socketio.test_client 생성 + move 소유권 검사 자동 통과 설정"""
     app, sio = socketio_app
     client = app.test_client()
     sc = sio.test_client(app, flask_test_client=client)
-    # fail-closed sid 검증 지원: 핸들러 내에서 request.sid 반환
-    from flask import request as flask_req
-    with patch('app.get_sid_by_char',
-               side_effect=lambda cid: getattr(flask_req, 'sid', None)):
+    import app as app_mod
+    real_on_current_map = app_mod.on_current_map
+    # join_map 없이 move 를 보내는 테스트용: 로컬 바인딩은 항상 통과,
+    # 현재 맵은 메모리 상태가 생기기 전(첫 이동)만 통과 — 이후엔 실제로 검사
+    with patch('app.sid_owns_char', return_value=True), \
+         patch('app.on_current_map',
+               side_effect=lambda cid, mk: cid not in app_mod.char_states
+               or real_on_current_map(cid, mk)):
         yield sc, app
 
 
 @pytest.fixture()
 def raw_sio_client(socketio_app):
-    """실제 Redis sid 바인딩 흐름을 검증하는 socketio.test_client."""
+    """실제 join_map 바인딩 흐름을 검증하는 socketio.test_client."""
     app, sio = socketio_app
     client = app.test_client()
     sc = sio.test_client(app, flask_test_client=client)
@@ -184,6 +190,17 @@ def _make_user_and_char(name='tester', map_key='city'):
     return char
 
 
+def _token(char):
+    """/auth/login 이 발급하는 것과 같은 소켓 토큰"""
+    from utils.socket_auth import issue_token
+    return issue_token(char.user_id)
+
+
+def _join(sc, char, map_key='city', **extra):
+    sc.emit('join_map', {'character_id': char.id, 'map_key': map_key,
+                         'token': _token(char), **extra})
+
+
 def _make_monster(map_key='city', x=0, y=0, hp=20):
     """테스트용 몬스터 생성."""
     from models import db, Monster
@@ -206,6 +223,18 @@ def _make_monster(map_key='city', x=0, y=0, hp=20):
     return mob
 
 
+def _state_pos(app_mod, char_id):
+    """메모리 상태의 (map_key, x, y) — move 가 실제로 반영됐는지 확인용"""
+    st = app_mod.char_states.get(char_id)
+    return (st.map_key, st.x, st.y) if st else None
+
+
+def _last_tile(app_mod, char_id):
+    """fast-path 타일 캐시 (세션이 없으면 None)"""
+    sess = app_mod.sessions.get(char_id)
+    return sess.last_tile if sess else None
+
+
 def test_chat_message_calls_remove(sio_client):
     """chat_message: emit 후 db.session.remove() 호출"""
     sc, app = sio_client
@@ -222,7 +251,8 @@ def test_join_map_char_not_found_calls_remove(sio_client):
     from models import db
     with app.app_context():
         with patch.object(db.session, 'remove', wraps=db.session.remove) as spy:
-            sc.emit('join_map', {'character_id': 9999, 'map_key': 'city'})
+            sc.emit('join_map', {'character_id': 9999, 'map_key': 'city',
+                                 'token': _token(_make_user_and_char('nobody'))})
             spy.assert_called()
 
 
@@ -233,28 +263,28 @@ def test_join_map_normal_calls_remove(sio_client):
     with app.app_context():
         char = _make_user_and_char('joiner')
         with patch.object(db.session, 'remove', wraps=db.session.remove) as spy:
-            sc.emit('join_map', {'character_id': char.id, 'map_key': 'city'})
+            _join(sc, char)
             spy.assert_called()
 
 
 def test_join_map_binds_sid_and_allows_move(raw_sio_client):
-    """join_map이 Redis sid를 바인딩하면 후속 move가 실제 검증을 통과한다."""
+    """join_map이 sid를 바인딩하면 후속 move가 실제 검증을 통과한다."""
     sc, app = raw_sio_client
     import app as app_mod
     from models import db
     with app.app_context():
         char = _make_user_and_char('bound_joiner')
 
-        sc.emit('join_map', {'character_id': char.id, 'map_key': 'city'})
+        _join(sc, char)
+        assert app_mod.char_sid[char.id] in app_mod.sid_char
 
         bound_sid = app.fake_redis.hget(app_mod.K_CHAR_TO_SID, char.id)
         assert bound_sid
         assert app.fake_redis.hget(app_mod.K_SID_TO_MAP, bound_sid) == 'city'
 
-        with patch.object(db.session, 'get', wraps=db.session.get) as spy_get:
-            sc.emit('move', {'character_id': char.id, 'map_key': 'city',
-                             'x': 32, 'y': 32})
-            spy_get.assert_called()
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                         'x': 32, 'y': 32})
+        assert _state_pos(app_mod, char.id) == ('city', 32, 32)
 
 
 def test_request_monsters_calls_remove(sio_client):
@@ -300,7 +330,7 @@ def test_move_same_tile_skips_db_queries(sio_client):
     from models import db
     with app.app_context():
         char = _make_user_and_char('fast_mover', map_key='city')
-        # 첫 이동: cache miss → DB 접근 (_last_tile 세팅)
+        # 첫 이동: cache miss → DB 접근 (last_tile 세팅)
         sc.emit('move', {'character_id': char.id, 'map_key': 'city',
                          'x': 32, 'y': 32})
         # 같은 타일(0,0) 내 두 번째 이동 → DB 스킵
@@ -311,7 +341,7 @@ def test_move_same_tile_skips_db_queries(sio_client):
 
 
 def test_move_same_tile_with_monster_hits_db_and_combat(sio_client):
-    """같은 타일이어도 몬스터가 점유 중이면 DB/전투 경로를 다시 탄다."""
+    """같은 타일이어도 몬스터가 점유 중이면 전투 경로를 다시 탄다 (HP 는 체크포인트 때 기록)."""
     sc, app = sio_client
     import app as app_mod
     from models import db, Monster
@@ -321,15 +351,16 @@ def test_move_same_tile_with_monster_hits_db_and_combat(sio_client):
                          'x': 32, 'y': 32})
         mob = _make_monster(map_key='city', x=0, y=0, hp=20)
         mob_id = mob.id
-        app_mod._monster_tiles_by_map['city'] = {(0, 0)}
+        app_mod._monster_tiles_by_map['city'] = {(0, 0): mob_id}
 
-        with patch.object(db.session, 'get', wraps=db.session.get) as spy_get:
-            sc.emit('move', {'character_id': char.id, 'map_key': 'city',
-                             'x': 48, 'y': 48})
-            spy_get.assert_called()
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                         'x': 48, 'y': 48})
 
-        refreshed = db.session.get(Monster, mob_id)
-        assert refreshed.hp < 20
+        assert app_mod.monster_states.get(mob_id).hp < 20
+        assert db.session.get(Monster, mob_id).hp == 20
+        assert app_mod.monster_states.flush() == 1
+        db.session.expire_all()
+        assert db.session.get(Monster, mob_id).hp < 20
 
 
 def test_move_same_tile_no_monster_skips_db_even_on_combat_map(sio_client):
@@ -339,8 +370,8 @@ def test_move_same_tile_no_monster_skips_db_even_on_combat_map(sio_client):
     from models import db
     with app.app_context():
         char = _make_user_and_char('careful_mover', map_key='city')
-        _make_monster(map_key='city', x=4, y=4, hp=20)
-        app_mod._monster_tiles_by_map['city'] = {(4, 4)}
+        mob = _make_monster(map_key='city', x=4, y=4, hp=20)
+        app_mod._monster_tiles_by_map['city'] = {(4, 4): mob.id}
 
         # 첫 이동: cache miss → DB 경로 (tile 0,0 — 몬스터 없음)
         sc.emit('move', {'character_id': char.id, 'map_key': 'city',
@@ -352,24 +383,166 @@ def test_move_same_tile_no_monster_skips_db_even_on_combat_map(sio_client):
             mock_get.assert_not_called()  # fast-path: DB 접근 없음
 
 
-def test_move_tile_change_hits_db(sio_client):
-    """다른 타일로 이동 시 DB 접근 확인"""
+def _monster_sql(app):
+    """with 블록 안에서 실행된 monsters 테이블 SQL 수집"""
+    from contextlib import contextmanager
+    from sqlalchemy import event
+    from models import db
+
+    @contextmanager
+    def capture():
+        seen: list[str] = []
+
+        def on_exec(conn, cursor, statement, *args):
+            if 'monsters' in statement:
+                seen.append(statement)
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', on_exec)
+        try:
+            yield seen
+        finally:
+            event.remove(engine, 'before_cursor_execute', on_exec)
+    return capture()
+
+
+def test_non_combat_tile_change_makes_no_monster_queries(sio_client):
+    """점유 인덱스가 있으면 몬스터 없는 타일 변경은 monsters 테이블을 건드리지 않는다"""
+    sc, app = sio_client
+    import app as app_mod
+    with app.app_context():
+        char = _make_user_and_char('index_walker', map_key='city')
+        mob = _make_monster(map_key='city', x=9, y=9, hp=20)
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                         'x': 32, 'y': 32})              # 인덱스 최초 로드
+        assert app_mod._monster_tiles_by_map['city'] == {(9, 9): mob.id}
+
+        with _monster_sql(app) as seen:
+            for x in (160, 288, 416):                    # 타일 (1,0) (2,0) (3,0)
+                sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                                 'x': x, 'y': 32})
+        assert seen == []
+        assert _state_pos(app_mod, char.id) == ('city', 416, 32)
+
+
+def test_kill_removes_monster_from_tile_index(sio_client):
+    sc, app = sio_client
+    import app as app_mod
+    with app.app_context():
+        char = _make_user_and_char('index_killer', map_key='city')
+        mob = _make_monster(map_key='city', x=1, y=0, hp=1)
+        app_mod.set_monster_tiles('city', [mob])
+
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                         'x': 160, 'y': 32})
+        assert app_mod._monster_tiles_by_map['city'] == {}
+
+
+def test_kill_commit_keeps_concurrent_dirty_fields(sio_client):
+    """처치 보상 commit 도중 들어온 피격(hp)은 absorb 에 지워지지 않고 다음 flush 로"""
     sc, app = sio_client
+    import app as app_mod
+    from models import db
+    with app.app_context():
+        char = _make_user_and_char('kill_race', map_key='city')
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city', 'x': 32, 'y': 32})
+        mob = _make_monster(map_key='city', x=1, y=0, hp=1)
+        app_mod.set_monster_tiles('city', [mob])
+        st = app_mod.char_states.get(char.id)
+
+        real_commit = db.session.commit
+        hits = []
+
+        def commit_with_hit():
+            real_commit()
+            if not hits:                                  # 보상 commit 한 번만 (몬스터 flush 제외)
+                hits.append(1)
+                st.set(hp=st.hp - 9)                      # commit 이 양보한 사이 몬스터 틱 피격
+
+        with patch.object(db.session, 'commit', side_effect=commit_with_hit):
+            sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                             'x': 160, 'y': 32})
+        assert st.hp == 91 and st.exp > 0
+        assert st.dirty == {'hp'}
+
+
+def test_stale_tile_index_entry_falls_back_and_heals(sio_client):
+    """인덱스가 틀린 몬스터를 가리키면 타일을 재확인하고 인덱스를 고친다"""
+    sc, app = sio_client
+    import app as app_mod
+    from models import db, Monster
+    with app.app_context():
+        char = _make_user_and_char('index_healer', map_key='city')
+        real_id = _make_monster(map_key='city', x=2, y=0, hp=20).id
+        gone_id = _make_monster(map_key='city', x=7, y=7, hp=20).id
+        app_mod._monster_tiles_by_map['city'] = {(2, 0): gone_id}
+
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                         'x': 288, 'y': 32})
+        assert app_mod.monster_states.get(real_id).hp < 20
+        assert app_mod._monster_tiles_by_map['city'].get((2, 0)) == real_id
+
+
+def test_move_tile_change_updates_state_without_commit(sio_client):
+    """다른 타일로 이동해도 DB 커밋 없이 메모리 상태만 갱신 (write-behind)"""
+    sc, app = sio_client
+    import app as app_mod
     from models import db
     with app.app_context():
         char = _make_user_and_char('tile_changer', map_key='city')
         # 첫 이동: (32,32) → tile (0,0)
         sc.emit('move', {'character_id': char.id, 'map_key': 'city',
                          'x': 32, 'y': 32})
-        # 두 번째 이동: (200,200) → tile (1,1) — 다른 타일 → DB 접근
-        with patch.object(db.session, 'get', return_value=char) as mock_get:
+        # 두 번째 이동: (200,200) → tile (1,1) — 다른 타일이지만 커밋 없음
+        with patch.object(db.session, 'commit') as mock_commit, \
+             patch.object(db.session, 'get') as mock_get:
             sc.emit('move', {'character_id': char.id, 'map_key': 'city',
                              'x': 200, 'y': 200})
-            mock_get.assert_called()
+            mock_commit.assert_not_called()
+            mock_get.assert_not_called()
+        assert _state_pos(app_mod, char.id) == ('city', 200, 200)
+        assert {'x', 'y'} <= app_mod.char_states.get(char.id).dirty
+
+
+def test_char_state_flush_writes_dirty_fields(sio_client):
+    """flush 가 dirty 필드만 DB 에 기록하고 dirty 를 비운다"""
+    sc, app = sio_client
+    import app as app_mod
+    from models import db, Character
+    with app.app_context():
+        char = _make_user_and_char('flusher', map_key='city')
+        char_id = char.id
+        sc.emit('move', {'character_id': char_id, 'map_key': 'city',
+                         'x': 300, 'y': 400})
+        assert app_mod.char_states.flush() == 1
+        assert not app_mod.char_states.get(char_id).dirty
+
+        db.session.expire_all()
+        row = db.session.get(Character, char_id)
+        assert (row.x, row.y) == (300, 400)
+
+
+def test_disconnect_flushes_and_evicts_char_state(raw_sio_client):
+    """disconnect 시 남은 변경분을 강제 flush 하고 상태를 제거한다"""
+    sc, app = raw_sio_client
+    import app as app_mod
+    from models import db, Character
+    with app.app_context():
+        char = _make_user_and_char('leaver', map_key='city')
+        char_id = char.id
+        _join(sc, char)
+        sc.emit('move', {'character_id': char_id, 'map_key': 'city',
+                         'x': 520, 'y': 260})
+        sc.disconnect()
+        assert char_id not in app_mod.char_sid
+
+        assert app_mod.char_states.get(char_id) is None
+        db.session.expire_all()
+        row = db.session.get(Character, char_id)
+        assert (row.x, row.y) == (520, 260)
 
 
-def test_dead_char_same_tile_hits_db(sio_client):
-    """죽은 캐릭터: _last_tile 무효화 후 같은 타일 이동 → DB 검증 + 브로드캐스트 차단"""
+def test_dead_char_same_tile_blocks_broadcast(sio_client):
+    """죽은 캐릭터: last_tile 무효화 후 같은 타일 이동 → 상태 검증 + 브로드캐스트 차단"""
     sc, flask_app = sio_client
     import app as app_mod
     from models import db, Character
@@ -379,110 +552,956 @@ def test_dead_char_same_tile_hits_db(sio_client):
         # 첫 이동: cache 세팅
         sc.emit('move', {'character_id': char_id, 'map_key': 'city',
                          'x': 32, 'y': 32})
-        assert char_id in app_mod._last_tile  # cache 세팅 확인
-        # 캐릭터 사망 + _last_tile 무효화
-        char_obj = db.session.get(Character, char_id)
-        char_obj.hp = 0
-        db.session.commit()
-        app_mod._last_tile.pop(char_id, None)
-        # 같은 타일로 이동 → cache miss → DB 검증 경로
-        with patch.object(db.session, 'get', wraps=db.session.get) as spy_get:
+        assert _last_tile(app_mod, char_id) is not None  # cache 세팅 확인
+        # 캐릭터 사망(메모리 상태) + last_tile 무효화
+        app_mod.char_states.get(char_id).set(hp=0)
+        app_mod.sessions.get(char_id).last_tile = None
+        # 같은 타일로 이동 → cache miss → 상태 검증 경로
+        sc.emit('move', {'character_id': char_id, 'map_key': 'city',
+                         'x': 48, 'y': 48})
+        assert _state_pos(app_mod, char_id) == ('city', 32, 32)  # 좌표 미갱신
+        # inner가 False 반환 → last_tile 미갱신 (브로드캐스트 차단 보장)
+        assert _last_tile(app_mod, char_id) is None
+
+
+def test_move_stale_seq_dropped_before_redis(sio_client):
+    """이미 처리한 seq 보다 작거나 같은 이동은 sid 조회/DB 전에 버린다"""
+    sc, flask_app = sio_client
+    import app as app_mod
+    with flask_app.app_context():
+        char = _make_user_and_char('seq_mover', map_key='city')
+        char_id = char.id
+        sc.emit('move', {'character_id': char_id, 'map_key': 'city',
+                         'x': 300, 'y': 32, 'seq': 5})
+        assert _state_pos(app_mod, char_id) == ('city', 300, 32)
+
+        with patch('app.get_sid_by_char') as mock_sid:
+            for seq in (5, 3):
+                sc.emit('move', {'character_id': char_id, 'map_key': 'city',
+                                 'x': 32, 'y': 32, 'seq': seq})
+            mock_sid.assert_not_called()
+        assert _state_pos(app_mod, char_id) == ('city', 300, 32)
+
+        sc.emit('move', {'character_id': char_id, 'map_key': 'city',
+                         'x': 32, 'y': 32, 'seq': 6})
+        assert _state_pos(app_mod, char_id) == ('city', 32, 32)
+
+
+def test_move_non_numeric_seq_dropped(sio_client):
+    sc, flask_app = sio_client
+    import app as app_mod
+    with flask_app.app_context():
+        char = _make_user_and_char('seq_junk', map_key='city')
+        for seq in ('7', [1], {'n': 1}, 2.5, True):
+            sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                             'x': 300, 'y': 32, 'seq': seq})
+            sc.emit('move_vel', {'character_id': char.id, 'map_key': 'city',
+                                 'x': 300, 'y': 32, 'vx': 1, 'vy': 0, 'seq': seq})
+        assert _state_pos(app_mod, char.id) is None          # 한 번도 반영 안 됨
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city', 'x': 300, 'y': 32, 'seq': 1})
+        assert _state_pos(app_mod, char.id) == ('city', 300, 32)
+
+
+def test_moves_in_same_window_coalesce_to_latest(sio_client):
+    """처리 대기 중 도착한 이동은 슬롯만 덮어쓰고, 최신 것 하나만 처리"""
+    sc, flask_app = sio_client
+    import app as app_mod
+    with flask_app.app_context():
+        char = _make_user_and_char('burst_mover', map_key='city')
+        char_id = char.id
+        fired = []
+
+        def burst(_self, _secs=0):
+            # yield 동안 같은 소켓에서 이동 두 개가 더 도착한 상황
+            if fired:
+                return
+            fired.append(True)
+            for seq, x in ((2, 500), (3, 700)):
+                sc.emit('move', {'character_id': char_id, 'map_key': 'city',
+                                 'x': x, 'y': 32, 'seq': seq})
+
+        from flask_socketio import SocketIO
+        with patch.object(SocketIO, 'sleep', burst):
             sc.emit('move', {'character_id': char_id, 'map_key': 'city',
-                             'x': 48, 'y': 48})
-            spy_get.assert_called()  # DB 경로를 탔음
-        # inner가 False 반환 → _last_tile 미갱신 (브로드캐스트 차단 보장)
-        assert char_id not in app_mod._last_tile
+                             'x': 300, 'y': 32, 'seq': 1})
+
+        assert _state_pos(app_mod, char_id) == ('city', 700, 32)
+        assert app_mod._move_slots == {}
+
+
+def test_inbound_rate_limit_drops_before_redis(sio_client):
+    """버킷을 다 쓴 소켓의 move/request_monsters 는 sid 조회·DB 없이 버리고 카운트"""
+    sc, flask_app = sio_client
+    import app as app_mod
+    from models import db
+    with flask_app.app_context():
+        char = _make_user_and_char('flooder', map_key='city')
+        app_mod.inbound_limiter.limits['move'] = (0.0, 1)
+        app_mod.inbound_limiter.limits['request_monsters'] = (0.0, 1)
+
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city', 'x': 32, 'y': 32})
+        sc.emit('request_monsters', {'map_key': 'city'})
+        sc.get_received()
+
+        with patch('app.get_sid_by_char') as mock_sid, \
+             patch.object(db.session, 'get') as mock_get:
+            for _ in range(3):
+                sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                                 'x': 300, 'y': 32})
+            sc.emit('request_monsters', {'map_key': 'city'})
+            mock_sid.assert_not_called()
+            mock_get.assert_not_called()
+        assert _received(sc, 'current_monsters') == []
+        assert _state_pos(app_mod, char.id) == ('city', 32, 32)
 
 
 # ═══════════════════════════════════════════════════════
-# 레이어 D: Redis sid 검증 테스트
+# 레이어 D: 소켓 인증 + 로컬 sid 바인딩
 # ═══════════════════════════════════════════════════════
 
-def test_move_spoofed_sid_rejected(sio_client):
-    """위조된 sid로 move 전송 시 DB 접근 없이 차단"""
-    sc, app = sio_client
-    from models import db
+def test_join_map_without_auth_rejected(raw_sio_client):
+    """토큰/세션 없이 join_map → auth_error, 바인딩 없음"""
+    sc, app = raw_sio_client
+    import app as app_mod
     with app.app_context():
-        char = _make_user_and_char('victim', map_key='city')
-        with patch('app.get_sid_by_char', return_value='fake_sid_12345'):
-            with patch.object(db.session, 'get') as mock_get:
-                sc.emit('move', {'character_id': char.id, 'map_key': 'city',
-                                 'x': 32, 'y': 32})
-                mock_get.assert_not_called()  # DB 접근 없이 차단
+        char = _make_user_and_char('anon')
+        sc.emit('join_map', {'character_id': char.id, 'map_key': 'city'})
+        assert _received(sc, 'auth_error') == [{'reason': 'unauthenticated'}]
+        assert char.id not in app_mod.char_sid
 
 
-def test_move_missing_char_sid_mapping_self_heals(raw_sio_client):
-    """char_to_sid 누락 + 현재 sid가 같은 맵에 있으면 move에서 재바인딩 복구."""
+def test_join_map_other_users_char_rejected(raw_sio_client):
+    """남의 캐릭터로 join_map → not_owner"""
     sc, app = raw_sio_client
     import app as app_mod
-    from models import db
     with app.app_context():
-        char = _make_user_and_char('missing_sid_map', map_key='city')
+        mine = _make_user_and_char('owner_a')
+        theirs = _make_user_and_char('owner_b')
+        sc.emit('join_map', {'character_id': theirs.id, 'map_key': 'city',
+                             'token': _token(mine)})
+        assert _received(sc, 'auth_error') == [{'reason': 'not_owner'}]
+        assert theirs.id not in app_mod.char_sid
+
+
+def test_join_map_other_users_char_leaves_victim_state(socketio_app):
+    """not_owner 로 거부되기 전에 피해자의 외삽/세션/dirty 를 건드리지 않음"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        victim_sc, victim_id = _joined_client(app, sio, 'victim', 64, 64)
+        _vel(victim_sc, victim_id, 64, 64, 200, 0)
+        app_mod.char_states.get(victim_id).set(hp=42)
+        sess = app_mod.sessions.get(victim_id)
+        before = (sess.sid, sess.move_tile, sess.last_tile)
+
+        attacker = _make_user_and_char('attacker')
+        sc = sio.test_client(app, flask_test_client=app.test_client())
+        sc.emit('join_map', {'character_id': victim_id, 'map_key': 'city',
+                             'token': _token(attacker)})
+        assert _received(sc, 'auth_error') == [{'reason': 'not_owner'}]
+        assert victim_id in app_mod.motions
+        assert (sess.sid, sess.move_tile, sess.last_tile) == before
+        assert 'hp' in app_mod.char_states.get(victim_id).dirty
+
+
+def test_join_map_forged_token_rejected(raw_sio_client):
+    sc, app = raw_sio_client
+    with app.app_context():
+        char = _make_user_and_char('forger')
+        sc.emit('join_map', {'character_id': char.id, 'map_key': 'city',
+                             'token': _token(char) + 'x'})
+        assert _received(sc, 'auth_error') == [{'reason': 'unauthenticated'}]
+
+
+def test_connect_auth_token_binds_user(socketio_app):
+    """connect 의 auth 토큰으로 인증하면 join_map 에 토큰이 없어도 된다"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        char = _make_user_and_char('connect_auth')
+        sc = sio.test_client(app, flask_test_client=app.test_client(),
+                             auth={'token': _token(char)})
         sc.emit('join_map', {'character_id': char.id, 'map_key': 'city'})
+        assert _received(sc, 'auth_error') == []
+        assert char.id in app_mod.char_sid
 
-        bound_sid = app.fake_redis.hget(app_mod.K_CHAR_TO_SID, char.id)
-        assert bound_sid is not None
-        app.fake_redis.hdel(app_mod.K_CHAR_TO_SID, char.id)
 
-        with patch.object(db.session, 'get', wraps=db.session.get) as spy_get:
+def test_login_session_authenticates_socket(socketio_app):
+    """/auth/login 의 Flask 세션 쿠키만으로도 소켓 인증"""
+    app, sio = socketio_app
+    import app as app_mod
+    from models import db, User, Character
+    with app.app_context():
+        user = User(username='sessuser1')
+        user.set_password('abc12345')
+        db.session.add(user)
+        db.session.flush()
+        char = Character(name='sess_char', map_key='city', x=0, y=0,
+                         hp=100, max_hp=100, user_id=user.id)
+        db.session.add(char)
+        db.session.commit()
+
+        client = app.test_client()
+        resp = client.post('/auth/login', json={'username': 'sessuser1',
+                                                'password': 'abc12345'})
+        assert resp.status_code == 200
+        sc = sio.test_client(app, flask_test_client=client)
+        sc.emit('join_map', {'character_id': char.id, 'map_key': 'city'})
+        assert _received(sc, 'auth_error') == []
+        assert char.id in app_mod.char_sid
+
+
+def test_move_for_unbound_char_rejected(raw_sio_client):
+    """join_map 으로 묶지 않은 캐릭터의 move 는 DB 접근 없이 차단"""
+    sc, app = raw_sio_client
+    from models import db
+    with app.app_context():
+        char = _make_user_and_char('unregistered', map_key='city')
+        with patch.object(db.session, 'get') as mock_get:
             sc.emit('move', {'character_id': char.id, 'map_key': 'city',
                              'x': 32, 'y': 32})
-            spy_get.assert_called()
+            mock_get.assert_not_called()
+
+
+def test_move_spoofed_char_rejected(socketio_app):
+    """다른 소켓에 묶인 캐릭터를 움직이려는 move 차단"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        victim, victim_id = _joined_client(app, sio, 'victim', 64, 64)
+        attacker, _ = _joined_client(app, sio, 'attacker', 64, 64)
+        attacker.emit('move', {'character_id': victim_id, 'map_key': 'city',
+                               'x': 900, 'y': 900})
+        assert _state_pos(app_mod, victim_id) == ('city', 64, 64)
+
+
+def test_rejoin_from_new_socket_revokes_old_binding(socketio_app):
+    """같은 캐릭터로 다른 탭이 join 하면 이전 소켓의 move 는 거부"""
+    app, sio = socketio_app
+    import app as app_mod
+    from models import db, Character
+    with app.app_context():
+        old, char_id = _joined_client(app, sio, 'two_tabs', 64, 64)
+        new = sio.test_client(app, flask_test_client=app.test_client())
+        _join(new, db.session.get(Character, char_id))
 
-        assert app.fake_redis.hget(app_mod.K_CHAR_TO_SID, char.id) == bound_sid
+        old.emit('move', {'character_id': char_id, 'map_key': 'city',
+                          'x': 900, 'y': 64})
+        assert _state_pos(app_mod, char_id) == ('city', 64, 64)
+        new.emit('move', {'character_id': char_id, 'map_key': 'city',
+                          'x': 300, 'y': 64})
+        assert _state_pos(app_mod, char_id) == ('city', 300, 64)
 
 
-def test_move_stale_sid_mapping_self_heals(raw_sio_client):
-    """stale old sid만 남고 현재 sid가 같은 맵에 있으면 move에서 현재 sid로 복구."""
+def test_fast_path_move_makes_no_redis_calls(raw_sio_client, socketio_app):
+    """join 후 같은 타일 이동은 소유권 검사 포함 Redis 왕복 0회"""
     sc, app = raw_sio_client
+    _, sio = socketio_app
     import app as app_mod
+    with app.app_context():
+        char = _make_user_and_char('no_redis', map_key='city')
+        _join(sc, char)
+        watcher, _ = _joined_client(app, sio, 'no_redis_watch', 64, 64)
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                         'x': 32, 'y': 32})           # 타일 진입 (cache 세팅)
+
+        with patch.object(app.fake_redis, 'hget', side_effect=AssertionError), \
+             patch.object(app.fake_redis, 'hset', side_effect=AssertionError), \
+             patch.object(app.fake_redis, 'pipeline', side_effect=AssertionError):
+            sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                             'x': 48, 'y': 48})
+        watcher.get_received()
+        app_mod.sessions.touch(char.id).last_move_sent = 0
+        app.flush_world_deltas()
+        assert _delta_moves(watcher) == [[char.id, 48, 48]]   # fast-path 로 수락됨
+
+
+# ═══════════════════════════════════════════════════════
+# 레이어 E: AOI(관심 영역) 팬아웃
+# ═══════════════════════════════════════════════════════
+
+def _joined_client(app, sio, name, x, y, map_key='city', wire=None):
+    """캐릭터 생성 + 좌표 지정 + join_map 까지 마친 test client"""
     from models import db
+    char = _make_user_and_char(name, map_key=map_key)
+    char.x, char.y = x, y
+    db.session.commit()
+    sc = sio.test_client(app, flask_test_client=app.test_client())
+    extra = {'wire': wire} if wire else {}
+    _join(sc, char, map_key=map_key, **extra)
+    return sc, char.id
+
+
+def _received(sc, event):
+    return [p['args'][0] for p in sc.get_received() if p['name'] == event]
+
+
+def _delta_moves(sc):
+    """수신한 world_delta 들의 플레이어 이동 [id, x, y] 목록"""
+    return [m for d in _received(sc, 'world_delta') for m in d.get('players', [])]
+
+
+def test_player_move_fanout_limited_to_aoi(socketio_app):
+    """시야(주변 셀) 안 플레이어는 매 tick, 시야 밖은 FAR_MOVE_INTERVAL 당 1회만"""
+    app, sio = socketio_app
+    import app as app_mod
     with app.app_context():
-        char = _make_user_and_char('stale_sid_map', map_key='city')
-        sc.emit('join_map', {'character_id': char.id, 'map_key': 'city'})
+        mover, mover_id = _joined_client(app, sio, 'aoi_mover', 64, 64)
+        near, _ = _joined_client(app, sio, 'aoi_near', 300, 300)
+        far, _ = _joined_client(app, sio, 'aoi_far', 40 * 128, 40 * 128)
+        for sc in (mover, near, far):
+            sc.get_received()
 
-        current_sid = app.fake_redis.hget(app_mod.K_CHAR_TO_SID, char.id)
-        assert current_sid is not None
-        app.fake_redis.hset(app_mod.K_CHAR_TO_SID, char.id, 'stale_sid_123')
-        app.fake_redis.hdel(app_mod.K_SID_TO_MAP, 'stale_sid_123')
-        app.fake_redis.hset(app_mod.K_SID_TO_MAP, current_sid, 'city')
+        for i in range(3):
+            app_mod.sessions.touch(mover_id).last_move_sent = 0     # 120 ms rate-limit 우회
+            mover.emit('move', {'character_id': mover_id, 'map_key': 'city',
+                                'x': 64 + i * 200, 'y': 64})
+            app.flush_world_deltas()                       # tick 1회
 
-        with patch.object(db.session, 'get', wraps=db.session.get) as spy_get:
-            sc.emit('move', {'character_id': char.id, 'map_key': 'city',
-                             'x': 32, 'y': 32})
-            spy_get.assert_called()
+        assert [m[0] for m in _delta_moves(near)] == [mover_id] * 3
+        assert [m[0] for m in _delta_moves(far)] == [mover_id]
 
-        assert app.fake_redis.hget(app_mod.K_CHAR_TO_SID, char.id) == current_sid
 
+def test_world_delta_keeps_latest_position_per_tick(socketio_app):
+    """한 tick 안의 여러 이동은 마지막 좌표 하나로 합쳐져 패킷 1개로 나간다"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        mover, mover_id = _joined_client(app, sio, 'delta_mover', 64, 64)
+        near, _ = _joined_client(app, sio, 'delta_near', 300, 300)
+        near.get_received()
 
-def test_move_byte_encoded_sid_mapping_is_accepted(raw_sio_client):
-    """Redis가 bytes를 반환해도 sid/map 비교는 문자열 기준으로 통과해야 한다."""
-    sc, app = raw_sio_client
+        app_mod.sessions.touch(mover_id).last_move_sent = 0
+        for x in (70, 80, 90):
+            mover.emit('move', {'character_id': mover_id, 'map_key': 'city',
+                                'x': x, 'y': 64})
+        app.flush_world_deltas()
+
+        packets = _received(near, 'world_delta')
+        assert [d['players'] for d in packets] == [[[mover_id, 90, 64]]]
+
+        app.flush_world_deltas()                           # 빈 tick → 전송 없음
+        assert _received(near, 'world_delta') == []
+
+
+def test_world_delta_carries_rate_limited_move_to_next_tick(socketio_app):
+    """120 ms 안에 들어온 이동은 버리지 않고 다음 tick 으로 이월"""
+    app, sio = socketio_app
     import app as app_mod
+    with app.app_context():
+        mover, mover_id = _joined_client(app, sio, 'carry_mover', 64, 64)
+        near, _ = _joined_client(app, sio, 'carry_near', 300, 300)
+        near.get_received()
+
+        app_mod.sessions.touch(mover_id).last_move_sent = time.time()     # 방금 보낸 것으로
+        mover.emit('move', {'character_id': mover_id, 'map_key': 'city',
+                            'x': 90, 'y': 64})
+        app.flush_world_deltas()
+        assert _delta_moves(near) == []
+
+        app_mod.sessions.touch(mover_id).last_move_sent = 0
+        app.flush_world_deltas()
+        assert _delta_moves(near) == [[mover_id, 90, 64]]
+
+
+def test_world_delta_batches_monster_events(socketio_app):
+    """몬스터 이동/피격/디스폰은 맵 room 패킷 하나로, 같은 몬스터 이동은 최신만"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        watcher, _ = _joined_client(app, sio, 'delta_watcher', 64, 64)
+        watcher.get_received()
+
+        app_mod.world_deltas.monster_move('city', 7, 1, 1)
+        app_mod.world_deltas.monster_move('city', 7, 2, 1)
+        app_mod.world_deltas.monster_move('city', 8, 5, 5)
+        app_mod.world_deltas.monster_hit('city', {'id': 8, 'attacker_id': 1,
+                                                  'dmg': 3, 'hp': 0, 'x': 6, 'y': 5})
+        app_mod.world_deltas.monster_despawn('city', 8)
+        app.flush_world_deltas()
+
+        packets = _received(watcher, 'world_delta')
+        assert len(packets) == 1
+        pkt = packets[0]
+        assert pkt['map_key'] == 'city'
+        assert pkt['monsters'] == [[7, 2, 1]]
+        assert [h['id'] for h in pkt['monster_hits']] == [8]
+        assert pkt['despawns'] == [8]
+
+
+def test_aoi_cell_follows_tile_crossings(socketio_app):
+    """셀 경계를 넘으면 AOI 격자 + 셀 room 이 함께 바뀐다"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        mover, mover_id = _joined_client(app, sio, 'aoi_walker', 64, 64)
+        assert app_mod.aoi_grid.cell_of(mover_id) == ('city', 0, 0)
+
+        cell_px = app_mod.AOI_CELL_TILES * app_mod.TILE
+        mover.emit('move', {'character_id': mover_id, 'map_key': 'city',
+                            'x': cell_px + 10, 'y': 64})
+        assert app_mod.aoi_grid.cell_of(mover_id) == ('city', 1, 0)
+
+        mover.disconnect()
+        assert app_mod.aoi_grid.cell_of(mover_id) is None
+
+
+def test_world_delta_not_echoed_to_mover(socketio_app):
+    """같은 셀에서 함께 움직이면 서로의 이동만 받고 자기 이동은 받지 않음"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        a, a_id = _joined_client(app, sio, 'echo_a', 64, 64)
+        b, b_id = _joined_client(app, sio, 'echo_b', 200, 64, wire='bin1')
+        lone, lone_id = _joined_client(app, sio, 'echo_lone', 64, 300)
+        for sc in (a, b, lone):
+            sc.get_received()
+        for sc, cid, x, y in ((a, a_id, 70, 64), (b, b_id, 210, 64)):
+            app_mod.sessions.touch(cid).last_move_sent = 0
+            app_mod.sessions.touch(cid).last_far_sent = time.time()
+            sc.emit('move', {'character_id': cid, 'map_key': 'city', 'x': x, 'y': y})
+        app.flush_world_deltas()
+
+        from utils.wire import decode_world_delta
+        assert _delta_moves(a) == [[b_id, 210, 64]]
+        b_packets = _received(b, 'world_delta')
+        assert len(b_packets) == 1
+        assert decode_world_delta(b_packets[0], app_mod.player_handles,
+                                  app_mod.monster_handles)['players'] == [[a_id, 70, 64]]
+        assert sorted(m[0] for m in _delta_moves(lone)) == [a_id, b_id]
+
+
+def test_binary_wire_negotiated_on_join_map(socketio_app):
+    """wire=bin1 로 입장한 클라이언트는 world_delta 를 바이트로, JSON 클라이언트는 dict 로"""
+    app, sio = socketio_app
+    import app as app_mod
+    from utils.wire import decode_world_delta
+    with app.app_context():
+        mover, mover_id = _joined_client(app, sio, 'wire_mover', 64, 64)
+        binc, bin_id = _joined_client(app, sio, 'wire_bin', 300, 300, wire='bin1')
+        acks = _received(binc, 'wire_ack')
+        assert acks == [{'wire': 'bin1', 'h': app_mod.player_handles.get(bin_id)}]
+        mover.get_received()
+
+        app_mod.sessions.touch(mover_id).last_move_sent = 0
+        mover.emit('move', {'character_id': mover_id, 'map_key': 'city',
+                            'x': 90.4, 'y': 64})
+        app.flush_world_deltas()
+
+        packets = _received(binc, 'world_delta')
+        assert len(packets) == 1 and isinstance(packets[0], bytes)
+        decoded = decode_world_delta(packets[0], app_mod.player_handles,
+                                     app_mod.monster_handles)
+        assert decoded['players'] == [[mover_id, 90, 64]]
+        assert _delta_moves(mover) == []                  # 발신자에게는 되돌려 보내지 않음
+
+
+def test_offline_players_get_no_wire_handle(socketio_app):
+    """current_players 의 오프라인 캐릭터는 핸들을 받지 않고, 접속자는 disconnect 때 반납"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        offline = _make_user_and_char('wire_offline', map_key='city')
+        sc, online_id = _joined_client(app, sio, 'wire_online', 64, 64)
+        listed = {p['id']: p['h'] for p in _received(sc, 'current_players')[0]}
+        assert listed[offline.id] == 0
+        assert app_mod.player_handles.get(offline.id) is None
+        assert listed[online_id] == app_mod.player_handles.get(online_id) != 0
+
+        sc.disconnect()
+        assert len(app_mod.player_handles) == 0
+
+
+def test_unknown_wire_falls_back_to_json(socketio_app):
+    app, sio = socketio_app
+    with app.app_context():
+        sc, _ = _joined_client(app, sio, 'wire_legacy', 64, 64, wire='protobuf')
+        assert _received(sc, 'wire_ack')[0]['wire'] == 'json'
+
+
+# ═══════════════════════════════════════════════════════
+# 레이어 F: 타일 트리거 (포탈 / NPC / 금단 타일)
+# ═══════════════════════════════════════════════════════
+
+def _make_map(key='city', teleports=()):
+    from models import db, Map
+    db.session.add(Map(key=key, display_name=key,
+                       map_data=json.dumps({'teleports': list(teleports)})))
+    db.session.commit()
+
+
+def _sql_on(app, *tables):
+    """with 블록 안에서 실행된 SQL 중 주어진 테이블을 건드린 것"""
+    from contextlib import contextmanager
+    from sqlalchemy import event
     from models import db
+
+    @contextmanager
+    def capture():
+        seen: list[str] = []
+
+        def on_exec(conn, cursor, statement, *args):
+            if any(t in statement for t in tables):
+                seen.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', on_exec)
+        try:
+            yield seen
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', on_exec)
+    return capture()
+
+
+def test_teleport_tile_moves_char_server_side(sio_client):
+    sc, app = sio_client
+    import app as app_mod
     with app.app_context():
-        char = _make_user_and_char('byte_sid_map', map_key='city')
-        sc.emit('join_map', {'character_id': char.id, 'map_key': 'city'})
+        _make_map('city', [{'from': {'x': 2, 'y': 0}, 'to_map': 'city2',
+                            'to_position': [3, 4]}])
+        char = _make_user_and_char('portal_user', map_key='city')
+        sc.get_received()
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                         'x': 288, 'y': 32})
+        assert _received(sc, 'teleport') == [{'map_key': 'city2', 'x': 3, 'y': 4}]
+        assert _state_pos(app_mod, char.id) == ('city2', 3.5 * 128, 4.5 * 128)
+        assert _last_tile(app_mod, char.id) is None
+
+
+def test_first_move_after_teleport_is_speed_checked(socketio_app):
+    """포탈 도착 타일에서 속도 검사 — 도착 직후 먼 타일로 점프하면 거부"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        _make_map('city', [{'from': {'x': 1, 'y': 0}, 'to_map': 'city2',
+                            'to_position': [3, 4]}])
+        sc, char_id = _joined_client(app, sio, 'portal_jumper', 64, 64)
+        sc.emit('move', {'character_id': char_id, 'map_key': 'city', 'x': 160, 'y': 64})
+        assert _state_pos(app_mod, char_id)[0] == 'city2'
+        sc.get_received()
+
+        sc.emit('move', {'character_id': char_id, 'map_key': 'city2',
+                         'x': 20.5 * 128, 'y': 4.5 * 128})
+        assert _received(sc, 'move_resync') == [{}]
+        assert _state_pos(app_mod, char_id) == ('city2', 3.5 * 128, 4.5 * 128)
+
 
-        current_sid = app.fake_redis.hget(app_mod.K_CHAR_TO_SID, char.id)
-        assert current_sid is not None
-        app.fake_redis.hashes[app_mod.K_CHAR_TO_SID][str(char.id)] = current_sid.encode('utf-8')
-        app.fake_redis.hashes[app_mod.K_SID_TO_MAP][str(current_sid)] = b'city'
+def test_tile_crossings_read_no_map_or_npc_rows(sio_client):
+    """트리거 테이블은 맵당 한 번만 컴파일 — 이후 타일 변경은 maps/npcs 조회 0회"""
+    sc, app = sio_client
+    import app as app_mod
+    with app.app_context():
+        _make_map('city', [{'from': {'x': 9, 'y': 9}, 'to_map': 'city2',
+                            'to_position': [0, 0]}])
+        char = _make_user_and_char('trigger_walker', map_key='city')
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                         'x': 32, 'y': 32})
+        assert 'city' in app_mod.trigger_tables
+
+        with _sql_on(app, 'maps', 'npcs') as seen:
+            for x in (160, 288, 416):
+                sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                                 'x': x, 'y': 32})
+        assert seen == []
+        assert _state_pos(app_mod, char.id) == ('city', 416, 32)
+
+
+def test_npc_near_sent_on_entering_and_leaving_radius(sio_client):
+    """NPC 반경(NPC_NEAR_TILES) 타일 경계를 넘을 때만 npc_near — 반경 안 이동은 조용"""
+    sc, app = sio_client
+    import app as app_mod
+    from models import db, NPC
+    with app.app_context():
+        npc = NPC(name='Guard', map_key='city', x=3, y=0, is_active=True)
+        db.session.add(npc)
+        db.session.commit()
+        char = _make_user_and_char('npc_visitor', map_key='city')
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city', 'x': 32, 'y': 32})
+        sc.get_received()
+
+        for x in (288, 416, 544, 800):                    # 타일 2,3,4 (반경 안) → 6 (밖)
+            sc.emit('move', {'character_id': char.id, 'map_key': 'city', 'x': x, 'y': 32})
+        assert _received(sc, 'npc_near') == [{'npc_id': npc.id}, {'npc_id': None}]
+        assert app_mod.sessions.get(char.id).near_npc is None
+
+
+def test_join_next_to_npc_sends_npc_near(socketio_app):
+    app, sio = socketio_app
+    from models import db, NPC
+    with app.app_context():
+        npc = NPC(name='Clerk', map_key='city', x=1, y=1, is_active=True)
+        db.session.add(npc)
+        db.session.commit()
+        sc, _char_id = _joined_client(app, sio, 'npc_joiner', 64, 64)
+        assert _received(sc, 'npc_near') == [{'npc_id': npc.id}]
+
+
+def test_monster_forbidden_tile_skips_combat(sio_client):
+    """금단 타일(gid 15)은 몬스터가 있을 수 없으므로 점유 인덱스도 보지 않는다"""
+    sc, app = sio_client
+    import app as app_mod
+    from models import db, Monster
+    from utils.triggers import compile_triggers
+    with app.app_context():
+        char = _make_user_and_char('safe_walker', map_key='city')
+        mob_id = _make_monster(map_key='city', x=1, y=0, hp=20).id
+        app_mod.trigger_tables['city'] = compile_triggers('city', {}, invalid_tiles=[(1, 0)])
+
+        sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                         'x': 160, 'y': 32})
+        assert db.session.get(Monster, mob_id).hp == 20
+        assert _state_pos(app_mod, char.id) == ('city', 160, 32)
+        assert _last_tile(app_mod, char.id) == ('city', 1, 0)
+
+
+def test_map_update_invalidates_trigger_table(socketio_app):
+    app, _ = socketio_app
+    import app as app_mod
+    from utils.triggers import invalidate_live
+    with app.test_request_context():
+        app_mod.trigger_table('city')
+        assert 'city' in app_mod.trigger_tables
+        invalidate_live('city')
+        assert 'city' not in app_mod.trigger_tables
+
+
+# ═══════════════════════════════════════════════════════
+# 레이어 G: move_vel — 서버 외삽(dead reckoning)
+# ═══════════════════════════════════════════════════════
+
+def _vel(sc, char_id, x, y, vx, vy, map_key='city'):
+    sc.emit('move_vel', {'character_id': char_id, 'map_key': map_key,
+                         'x': x, 'y': y, 'vx': vx, 'vy': vy})
+
+
+def test_move_vel_extrapolates_tile_crossing(socketio_app):
+    """키프레임 하나 이후 좌표는 서버가 외삽 — 타일 변경도 서버가 처리"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        sc, char_id = _joined_client(app, sio, 'dr_walker', 64, 64)
+        watcher, _ = _joined_client(app, sio, 'dr_watcher', 300, 300)
+        _vel(sc, char_id, 64, 64, 200, 0)
+        m = app_mod.motions.get(char_id)
+        assert m is not None
+
+        app.advance_motions(m.t0 + 0.5)                   # 64 + 100 → 타일 (1, 0)
+        assert _state_pos(app_mod, char_id) == ('city', 164, 64)
+        assert app_mod.aoi_grid.cell_of(char_id) == ('city', 0, 0)
+
+        watcher.get_received()
+        app_mod.sessions.touch(char_id).last_move_sent = 0
+        app.flush_world_deltas()
+        assert _delta_moves(watcher) == [[char_id, 164, 64]]
+
+
+def test_move_vel_stop_and_cap(socketio_app):
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        sc, char_id = _joined_client(app, sio, 'dr_stopper', 64, 64)
+        _vel(sc, char_id, 64, 64, 0, 200)
+        _vel(sc, char_id, 64, 90, 0, 0)                   # 정지
+        assert char_id not in app_mod.motions
 
-        with patch.object(db.session, 'get', wraps=db.session.get) as spy_get:
+        _vel(sc, char_id, 64, 90, 0, 200)
+        t0 = app_mod.motions.get(char_id).t0
+        app.advance_motions(t0 + 10)                      # 키프레임 끊김
+        assert char_id not in app_mod.motions
+        assert _state_pos(app_mod, char_id) == ('city', 64, 290)
+
+
+def test_move_vel_diagonal_capped_and_bad_velocity_ignored(socketio_app):
+    app, sio = socketio_app
+    import app as app_mod
+    from math import hypot
+    with app.app_context():
+        sc, char_id = _joined_client(app, sio, 'dr_diag', 64, 64)
+        _vel(sc, char_id, 64, 64, 1000, 1000)
+        m = app_mod.motions.get(char_id)
+        assert abs(hypot(m.vx, m.vy) - app_mod.MAX_SPEED) < 1e-9
+
+        _vel(sc, char_id, 64, 64, '200', None)           # 숫자 아님 → 외삽 중단 (TypeError 없음)
+        assert char_id not in app_mod.motions
+
+
+def test_move_vel_blocked_tile_requests_resync(socketio_app):
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        sc, char_id = _joined_client(app, sio, 'dr_wall', 64, 64)
+        _vel(sc, char_id, 64, 64, 200, 0)
+        t0 = app_mod.motions.get(char_id).t0
+        sc.get_received()
+        with patch('app.walkable_tiles', return_value={(0, 0)}):
+            app.advance_motions(t0 + 0.5)
+        assert _received(sc, 'move_resync') == [{}]
+        assert char_id not in app_mod.motions
+        assert _state_pos(app_mod, char_id)[1] == 64
+
+
+def test_move_vel_teleport_stops_motion(socketio_app):
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        _make_map('city', [{'from': {'x': 1, 'y': 0}, 'to_map': 'city2',
+                            'to_position': [3, 4]}])
+        sc, char_id = _joined_client(app, sio, 'dr_portal', 64, 64)
+        _vel(sc, char_id, 64, 64, 200, 0)
+        app.advance_motions(app_mod.motions.get(char_id).t0 + 0.5)
+        assert char_id not in app_mod.motions
+        assert _state_pos(app_mod, char_id)[0] == 'city2'
+
+
+def test_move_vel_requires_binding(raw_sio_client):
+    sc, app = raw_sio_client
+    import app as app_mod
+    with app.app_context():
+        char = _make_user_and_char('dr_unbound', map_key='city')
+        _vel(sc, char.id, 64, 64, 200, 0)
+        assert char.id not in app_mod.motions
+
+
+def test_disconnect_closes_session(socketio_app):
+    """세션 상태는 join_map 에서 생기고 disconnect 에서 사라진다"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        sc, char_id = _joined_client(app, sio, 'sess_owner', 64, 64)
+        assert char_id in app_mod.sessions
+        sc.emit('move', {'character_id': char_id, 'map_key': 'city', 'x': 160, 'y': 64})
+        sc.disconnect()
+        assert char_id not in app_mod.sessions
+        assert len(app_mod.sessions) == 0
+
+
+def test_moves_for_same_char_are_serialized(sio_client):
+    """타일 변경 처리 도중 도착한 같은 캐릭터 이동은 끝난 뒤 순서대로 (중첩 실행 없음)"""
+    sc, app = sio_client
+    import app as app_mod
+    with app.app_context():
+        char = _make_user_and_char('serial_walker', map_key='city')
+        calls: list[tuple] = []
+        real = app_mod.update_sid_map
+
+        def reenter(sid, map_key):
+            calls.append(_state_pos(app_mod, char.id))
+            if len(calls) == 1:                          # 첫 타일 처리 중 다음 이동 도착
+                sc.emit('move', {'character_id': char.id, 'map_key': 'city',
+                                 'x': 288, 'y': 32})
+            real(sid, map_key)
+
+        with patch('app.update_sid_map', side_effect=reenter):
             sc.emit('move', {'character_id': char.id, 'map_key': 'city',
-                             'x': 32, 'y': 32})
-            spy_get.assert_called()
+                             'x': 160, 'y': 32})
+        assert calls == [('city', 160, 32), ('city', 288, 32)]
+        assert _last_tile(app_mod, char.id) == ('city', 2, 0)
+        assert len(app_mod.move_mailbox) == 0
+
+
+# ═══════════════════════════════════════════════════════
+# 이동 검증 — 컴파일된 충돌 격자(dungeon1) 기준
+# ═══════════════════════════════════════════════════════
+
+def _tile_px(tx, ty):
+    return tx * 128 + 64, ty * 128 + 64
+
+
+def test_illegal_moves_rejected_before_redis(socketio_app):
+    """벽/맵 밖/순간이동은 Redis·DB 전에 거부 + move_resync"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        sc, char_id = _joined_client(app, sio, 'mv_checker', *_tile_px(10, 1), map_key='dungeon1')
+        start = _state_pos(app_mod, char_id)
+        sc.get_received()
+        with patch.object(app.fake_redis, 'hget', side_effect=AssertionError), \
+             patch.object(app.fake_redis, 'hset', side_effect=AssertionError), \
+             patch('app.db.session.get', side_effect=AssertionError):
+            for tx, ty in ((5, 1), (-1, 1), (25, 1), (10, 15)):     # 벽, 밖, 밖, 14칸 점프
+                x, y = _tile_px(tx, ty)
+                sc.emit('move', {'character_id': char_id, 'map_key': 'dungeon1', 'x': x, 'y': y})
+            sc.emit('move', {'character_id': char_id, 'map_key': 'dungeon1',
+                             'x': float('nan'), 'y': 64})
+        assert _state_pos(app_mod, char_id) == start
+        assert len(_received(sc, 'move_resync')) == 5
+
+        x, y = _tile_px(11, 1)                                      # 옆 칸은 허용
+        sc.emit('move', {'character_id': char_id, 'map_key': 'dungeon1', 'x': x, 'y': y})
+        assert _state_pos(app_mod, char_id) == ('dungeon1', x, y)
+
+
+def test_move_to_other_map_rejected_after_join(socketio_app):
+    """join_map 뒤 다른 map_key 로 보낸 move 는 메모리에서 거부 (맵 레지스트리 조회 없음)"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        sc, char_id = _joined_client(app, sio, 'mv_hopper', *_tile_px(10, 1), map_key='dungeon1')
+        start = _state_pos(app_mod, char_id)
+        sc.get_received()
+        for map_key in ('city2', 'no_such_map'):            # 격자 있는 맵 / 모르는 맵
+            sc.emit('move', {'character_id': char_id, 'map_key': map_key, 'x': 200, 'y': 200})
+        assert _state_pos(app_mod, char_id) == start
+        assert len(_received(sc, 'move_resync')) == 2
+        assert 'no_such_map' not in app_mod.map_registry._files
+
 
+def test_move_speed_budget_grows_with_time(socketio_app):
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        sc, char_id = _joined_client(app, sio, 'mv_runner', *_tile_px(10, 1), map_key='dungeon1')
+        t0 = time.time()
+        assert app.illegal_move(char_id, 'dungeon1', *_tile_px(10, 2), now=t0) is None
+        assert app.illegal_move(char_id, 'dungeon1', *_tile_px(10, 15), now=t0 + 1) == 'mv_too_fast'
+        assert app.illegal_move(char_id, 'dungeon1', *_tile_px(10, 15), now=t0 + 10) is None
+        assert app_mod.sessions.get(char_id).move_tile == ('dungeon1', 10, 15)
+        # 서버가 맵을 옮긴 뒤(포탈/리스폰) 첫 이동은 속도 검사 없음
+        assert app.illegal_move(char_id, 'city', 900, 900, now=t0 + 10) == 'mv_map'
+        app_mod.char_states.get(char_id).set(map_key='city')
+        assert app.illegal_move(char_id, 'city', 900, 900, now=t0 + 10) is None
+
+
+# 몬스터 AI — 맵별 틱
+# ═══════════════════════════════════════════════════════
+
+def test_monster_maps_need_tilemap(socketio_app):
+    app, _sio = socketio_app
+    with app.app_context():
+        _make_monster('dungeon1', 11, 1)
+        _make_monster('no_such_map', 3, 3)
+        assert app.monster_maps() == ['dungeon1']        # 충돌 격자 없는 맵은 틱 대상 아님
+
+
+def test_monster_tick_attacks_on_its_own_map(socketio_app):
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        mob_id = _make_monster('dungeon1', 11, 1).id
+        _sc, char_id = _joined_client(app, sio, 'mob_bait', *_tile_px(10, 1), map_key='dungeon1')
+        hp0 = app_mod.char_states.get(char_id).hp
+        app.monster_tick('city')                          # 다른 맵 틱은 이 몬스터와 무관
+        assert app_mod.char_states.get(char_id).hp == hp0
+        app.monster_tick('dungeon1')
+        assert app_mod.char_states.get(char_id).hp < hp0
+        assert app_mod.monster_states.get(mob_id).target_char_id == char_id
+
+
+def test_monster_tick_runs_from_memory(socketio_app):
+    """맵당 첫 틱만 SELECT — 이후 이동은 SQL 없음, 리스폰은 즉시 UPDATE"""
+    app, _sio = socketio_app
+    import app as app_mod
+    from models import db, Monster
+    with app.app_context():
+        mob_id = _make_monster('dungeon1', 11, 1).id
+        dead_id = _make_monster('dungeon1', 12, 1).id
+        row = db.session.get(Monster, dead_id)
+        row.is_alive, row.died_at, row.respawn_s = False, time.time() - 60, 15
+        db.session.commit()
+
+        with _monster_sql(app) as seen:
+            app.monster_tick('dungeon1')
+        assert [s.split()[0] for s in seen] == ['SELECT', 'UPDATE']   # 로드 + 리스폰 기록
+        assert app_mod.monster_states.get(dead_id).is_alive
+
+        with _monster_sql(app) as seen:
+            for _ in range(5):
+                app.monster_tick('dungeon1')
+        assert seen == []
+        assert app_mod.monster_states.loads == 1
+
+        moved = app_mod.monster_states.get(mob_id)
+        app.checkpoint_monsters()
+        db.session.expire_all()
+        assert (db.session.get(Monster, mob_id).x, db.session.get(Monster, mob_id).y) == (moved.x, moved.y)
+
+
+def test_aggro_search_only_visits_nearby_buckets(socketio_app):
+    """어그로 후보는 몬스터 주변 aggro_grid 셀만 — 먼 캐릭터는 조회조차 안 함"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        _make_monster('dungeon1', 11, 1)
+        _near, near_id = _joined_client(app, sio, 'aggro_near', *_tile_px(10, 1), map_key='dungeon1')
+        far_sc, far_id = _joined_client(app, sio, 'aggro_far', *_tile_px(10, 15), map_key='dungeon1')
+        assert app_mod.aggro_grid.cell_of(far_id) == ('dungeon1', 2, 3)
+
+        looked_up = []
+        real_get = app_mod.char_states.get
+        with patch.object(app_mod.char_states, 'get',
+                          side_effect=lambda cid: looked_up.append(cid) or real_get(cid)):
+            app.monster_tick('dungeon1')
+        assert near_id in looked_up and far_id not in looked_up
 
-def test_move_no_redis_mapping_rejected(sio_client):
-    """Redis에 sid 매핑 없는 캐릭터의 move 이벤트 차단"""
+        far_sc.disconnect()
+        assert app_mod.aggro_grid.cell_of(far_id) is None
+
+
+def test_potion_and_rename_while_online_survive_flush(sio_client):
+    """REST 가 HP/이름을 바꿔도 접속 중 메모리 상태가 다음 flush 에서 덮어쓰지 않는다"""
     sc, app = sio_client
+    import app as app_mod
+    from models import db, Character, Item, CharacterItem
+    with app.app_context():
+        char = _make_user_and_char('drinker', map_key='city')
+        char_id = char.id
+        sc.emit('move', {'character_id': char_id, 'map_key': 'city', 'x': 300, 'y': 400})
+        st = app_mod.char_states.get(char_id)
+        st.set(hp=st.max_hp - 40)                         # 피격 — 아직 DB 에는 없음
+        potion = Item(name='Red Potion', category='potion', effect_value=30)
+        db.session.add(potion)
+        db.session.commit()
+        db.session.add(CharacterItem(character_id=char_id, item_id=potion.id, quantity=1))
+        db.session.commit()
+        potion_id = potion.id
+
+        rest = app.test_client()
+        resp = rest.post('/api/items/use', json={'character_id': char_id, 'item_id': potion_id})
+        assert resp.status_code == 200 and resp.get_json()['healed'] == 30
+        assert rest.put(f'/api/characters/{char_id}', json={'name': 'drinker2'}).status_code == 200
+
+        st = app_mod.char_states.get(char_id)
+        assert (st.hp, st.name) == (st.max_hp - 10, 'drinker2')
+        app_mod.char_states.flush()
+        db.session.expire_all()
+        row = db.session.get(Character, char_id)
+        assert (row.hp, row.x, row.y) == (row.max_hp - 10, 300, 400)
+
+
+def test_player_death_commit_keeps_concurrent_dirty_fields(socketio_app):
+    """사망 기록 commit 도중 들어온 변경은 dirty 로 남아 다음 flush 에 실린다"""
+    app, sio = socketio_app
+    import app as app_mod
     from models import db
     with app.app_context():
-        char = _make_user_and_char('unregistered', map_key='city')
-        with patch('app.get_sid_by_char', return_value=None):
-            with patch.object(db.session, 'get') as mock_get:
-                sc.emit('move', {'character_id': char.id, 'map_key': 'city',
-                                 'x': 32, 'y': 32})
-                mock_get.assert_not_called()  # DB 접근 없이 차단
+        _make_monster('dungeon1', 11, 1)
+        _sc, char_id = _joined_client(app, sio, 'mob_victim', *_tile_px(10, 1), map_key='dungeon1')
+        st = app_mod.char_states.get(char_id)
+        st.set(hp=1)
+
+        real_commit = db.session.commit
+
+        def commit_with_move():
+            real_commit()
+            st.set(gold=st.gold + 7)                      # commit 이 양보한 사이 다른 변경
+
+        with patch.object(db.session, 'commit', side_effect=commit_with_move):
+            app.monster_tick('dungeon1')
+        assert st.map_key == app_mod.RESPAWN_POS[0]
+        assert st.dirty == {'gold'}
+
+
+def test_first_move_after_respawn_is_speed_checked(socketio_app):
+    """사망 후 리스폰 타일에서 속도 검사 — 리스폰 직후 먼 타일로 점프하면 거부"""
+    app, sio = socketio_app
+    import app as app_mod
+    with app.app_context():
+        _make_monster('dungeon1', 11, 1)
+        sc, char_id = _joined_client(app, sio, 'respawn_jumper', *_tile_px(10, 1), map_key='dungeon1')
+        app_mod.char_states.get(char_id).set(hp=1)
+        app.monster_tick('dungeon1')
+        resp_map, rx, ry = app_mod.RESPAWN_POS
+        assert app_mod.sessions.get(char_id).move_tile == (resp_map, rx, ry)
+
+        sc.get_received()
+        sc.emit('move', {'character_id': char_id, 'map_key': resp_map,
+                         'x': 20.5 * 128, 'y': (ry + 0.5) * 128})
+        assert _received(sc, 'move_resync') == [{}]
@@ -0,0 +1,37 @@
+from utils.spatial import SpatialHash
+
+
+def test_update_returns_previous_cell_only_on_change():
+    grid = SpatialHash(8)
+    assert grid.update(1, 'worldmap', 0, 0) is None          # 첫 배치
+    assert grid.update(1, 'worldmap', 7, 7) == ('worldmap', 0, 0)   # 같은 셀
+    assert grid.update(1, 'worldmap', 8, 0) == ('worldmap', 0, 0)   # 셀 이동
+    assert grid.cell_of(1) == ('worldmap', 1, 0)
+
+
+def test_remove_cleans_empty_buckets():
+    grid = SpatialHash(8)
+    grid.update(1, 'worldmap', 3, 3)
+    grid.update(2, 'worldmap', 4, 4)
+    assert grid.occupied_cells() == 1
+    grid.remove(1)
+    grid.remove(2)
+    assert len(grid) == 0
+    assert grid.occupied_cells() == 0
+
+
+def test_query_cells_only_returns_neighbours():
+    grid = SpatialHash(8)
+    grid.update(1, 'worldmap', 0, 0)      # cell (0,0)
+    grid.update(2, 'worldmap', 9, 9)      # cell (1,1) — 이웃
+    grid.update(3, 'worldmap', 30, 30)    # cell (3,3) — 멀리
+    grid.update(4, 'city2', 0, 0)         # 다른 맵
+    found = set(grid.query_cells(('worldmap', 0, 0), 1))
+    assert found == {1, 2}
+
+
+def test_query_tiles_covers_radius_across_cell_edge():
+    grid = SpatialHash(4)
+    grid.update(1, 'dungeon1', 7, 0)      # cell (1,0)
+    # (3,0) 은 cell (0,0) 의 오른쪽 끝 — 반경 4 타일이면 (7,0) 까지 닿는다
+    assert 1 in set(grid.query_tiles('dungeon1', 3, 0, 4))
@@ -0,0 +1,47 @@
+import json
+from types import SimpleNamespace
+
+from utils.triggers import INVALID, NPC_NEAR, TELEPORT, Trigger, compile_triggers
+
+
+def _npc(id, x, y, is_active=True):
+    return SimpleNamespace(id=id, x=x, y=y, is_active=is_active)
+
+
+MAP_DATA = json.dumps({
+    'teleports': [
+        {'from': {'x': 5, 'y': 0}, 'to_map': 'worldmap', 'to_position': [10, 11]},
+        {'from': {'y': 29, 'xRange': [3, 5]}, 'to_map': 'dungeon1', 'to_position': [1, 2]},
+    ],
+})
+
+
+def test_teleport_single_tile_and_x_range():
+    table = compile_triggers('city2', MAP_DATA)
+    assert table.at(5, 0) == (Trigger(TELEPORT, to_map='worldmap', to_x=10, to_y=11),)
+    for x in (3, 4, 5):
+        assert table.at(x, 29)[0].to_map == 'dungeon1'
+    assert table.at(6, 29) == ()
+    assert len(table) == 4
+
+
+def test_npc_tiles_skip_inactive():
+    table = compile_triggers('city2', {}, [_npc(1, 2, 2), _npc(2, 4, 4, is_active=False)])
+    assert table.at(2, 2) == (Trigger(NPC_NEAR, npc_id=1),)
+    assert table.at(4, 4) == ()
+
+
+def test_npc_radius_covers_neighbourhood():
+    table = compile_triggers('city2', None, [_npc(7, 2, 2)], npc_radius=1)
+    assert len(table) == 9
+    assert table.at(1, 3)[0].npc_id == 7
+
+
+def test_invalid_tile_listed_first():
+    data = {'teleports': [{'from': {'x': 0, 'y': 0}, 'to_map': 'x', 'to_position': [0, 0]}]}
+    table = compile_triggers('dungeon1', data, invalid_tiles=[(0, 0)])
+    assert [t.kind for t in table.at(0, 0)] == [INVALID, TELEPORT]
+
+
+def test_empty_map_data():
+    assert len(compile_triggers('city', '')) == 0
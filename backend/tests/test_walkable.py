@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from utils.walkable import ROOT, WalkGrid, get_tile_layer, get_walkable
+
+
+def _reference_set(map_key):
+    """이전 구현(set of tuples)과 같은 규칙으로 직접 계산"""
+    data = json.loads((ROOT / f"{map_key}.json").read_text(encoding="utf-8"))
+    collidable = {
+        ts["firstgid"] + t["id"]
+        for ts in data["tilesets"] for t in ts.get("tiles", [])
+        if {p["name"]: p["value"] for p in t.get("properties", [])}.get("collides")
+    }
+    layer = next(l for l in data["layers"] if l["type"] == "tilelayer")
+    w = layer["width"]
+    return {(i % w, i // w) for i, g in enumerate(layer["data"]) if g == 0 or g not in collidable}, layer
+
+
+def test_grid_matches_reference_set():
+    ref, layer = _reference_set("dungeon1")
+    grid = get_walkable("dungeon1")
+    assert len(grid) == len(ref)
+    assert set(grid) == ref
+    for x in range(-1, layer["width"] + 1):
+        for y in range(-1, layer["height"] + 1):
+            assert ((x, y) in grid) == ((x, y) in ref)
+
+
+def test_neighbors_match_reference():
+    ref, layer = _reference_set("dungeon1")
+    grid = get_walkable("dungeon1")
+    for x, y in ref:
+        expected = {p for p in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)) if p in ref}
+        assert set(grid.neighbors(x, y)) == expected
+
+
+def test_neighbors_stop_at_bounds_and_walls():
+    #  . # .
+    #  . . .
+    grid = WalkGrid.from_tiles(3, 2, [(0, 0), (2, 0), (0, 1), (1, 1), (2, 1)])
+    assert grid.neighbors(0, 0) == [(0, 1)]
+    assert grid.neighbors(1, 1) == [(2, 1), (0, 1)]      # N 는 벽
+    assert not grid.is_walkable(1, 0)
+    assert grid.neighbors(5, 5) == []
+    assert not grid.is_walkable(-1, 0)
+    assert grid.nbytes == 6
+
+
+def test_cell_count_mismatch_rejected():
+    with pytest.raises(ValueError):
+        WalkGrid(2, 2, [1, 1, 1])
+
+
+def test_tile_layer_flat_gids():
+    ref = json.loads((ROOT / "dungeon1.json").read_text(encoding="utf-8"))
+    flat = next(l for l in ref["layers"] if l["type"] == "tilelayer")["data"]
+    layer = get_tile_layer("dungeon1")
+    assert layer.gid(3, 2) == flat[2 * layer.width + 3]
+    assert layer.gid(layer.width, 0) == 0
+    assert len(layer.tiles_with(15)) == flat.count(15)
@@ -0,0 +1,64 @@
+import pytest
+
+from utils.wire import (
+    WIRE_BIN, WIRE_JSON, HandleTable, WireError,
+    decode_world_delta, encode_world_delta, negotiate,
+)
+
+
+def _payload():
+    return {
+        'map_key': 'dungeon1',
+        'players': [[101, 300.4, 64.6], [102, 0, 7679]],
+        'monsters': [[7, 3, 4]],
+        'monster_hits': [{'id': 8, 'attacker_id': 101, 'dmg': 5, 'hp': -2, 'x': 2, 'y': 9}],
+        'player_hits': [{'id': 102, 'dmg': 3, 'hp': 40}],
+        'despawns': [8],
+    }
+
+
+def test_roundtrip_quantizes_pixels_and_clamps_hp():
+    players, monsters = HandleTable(), HandleTable()
+    buf = encode_world_delta(_payload(), players, monsters)
+    out = decode_world_delta(buf, players, monsters)
+
+    assert out['map_key'] == 'dungeon1'
+    assert out['players'] == [[101, 300, 65], [102, 0, 7679]]
+    assert out['monsters'] == [[7, 3, 4]]
+    assert out['monster_hits'] == [{'id': 8, 'attacker_id': 101, 'dmg': 5, 'hp': 0, 'x': 2, 'y': 9}]
+    assert out['player_hits'] == [{'id': 102, 'dmg': 3, 'hp': 40}]
+    assert out['despawns'] == [8]
+
+
+def test_binary_is_smaller_than_json():
+    import json
+    payload = _payload()
+    buf = encode_world_delta(payload, HandleTable(), HandleTable())
+    assert len(buf) < len(json.dumps(payload, separators=(',', ':'))) / 2
+
+
+def test_handle_table_reuses_released_handles():
+    t = HandleTable()
+    assert t.handle(500) == 1
+    assert t.handle(501) == 2
+    assert t.handle(500) == 1            # 같은 key → 같은 핸들
+    t.release(500)
+    assert t.get(500) is None
+    assert t.handle(999) == 1            # 반납된 핸들 재사용
+    assert t.key_of(1) == 999
+
+
+def test_handle_exhaustion_and_range_raise_wire_error():
+    tiny = HandleTable(limit=1)
+    assert tiny.handle(1) == 1
+    assert tiny.handle(2) is None
+    with pytest.raises(WireError):
+        encode_world_delta({'map_key': 'm', 'players': [[2, 0, 0]]}, tiny, HandleTable())
+    with pytest.raises(WireError):
+        encode_world_delta({'map_key': 'm', 'players': [[1, 70000, 0]]}, tiny, HandleTable())
+
+
+def test_negotiate_falls_back_to_json():
+    assert negotiate(WIRE_BIN) == WIRE_BIN
+    assert negotiate('msgpack') == WIRE_JSON
+    assert negotiate(None) == WIRE_JSON
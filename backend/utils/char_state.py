@@ -0,0 +1,162 @@
+from flask import current_app
+from sqlalchemy import update
+from models import db, Character
+
+# 소켓 핫패스가 읽고/쓰는 필드 — 이 필드만 dirty 추적 후 배치 flush
+TRACKED_FIELDS = (
+    'map_key', 'x', 'y',
+    'hp', 'max_hp', 'mp', 'max_mp',
+    'level', 'exp', 'gold',
+)
+# 전투 계산용 읽기 전용 스냅샷 (REST 로만 변경 → absorb 로 갱신)
+READONLY_FIELDS = ('name', 'str', 'dex')
+
+
+class CharState:
+    """접속 중 캐릭터 1명의 권위 있는(in-process) 상태."""
+    __slots__ = ('id',) + READONLY_FIELDS + TRACKED_FIELDS + ('dirty',)
+
+    def __init__(self, char_id: int):
+        self.id = char_id
+        self.dirty: set[str] = set()
+
+    @classmethod
+    def from_model(cls, char: Character) -> 'CharState':
+        st = cls(char.id)
+        st.absorb(char)
+        return st
+
+    def set(self, **fields) -> None:
+        """값이 바뀐 필드만 대입 + dirty 표시"""
+        for name, value in fields.items():
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                self.dirty.add(name)
+
+    def absorb(self, char: Character, keep_dirty: bool = False) -> None:
+        """DB(ORM) 값을 그대로 받아들임 → dirty 해제.
+        keep_dirty=True 면 아직 dirty 인 필드(commit 중 바뀐 값)는 메모리 값과 dirty 를 유지"""
+        keep = self.dirty if keep_dirty else ()
+        for name in READONLY_FIELDS + TRACKED_FIELDS:
+            if name not in keep:
+                setattr(self, name, getattr(char, name))
+        if not keep_dirty:
+            self.dirty.clear()
+
+    def sync_to(self, char: Character) -> None:
+        """메모리 값을 ORM 객체에 복사 (commit 은 호출자 몫)"""
+        for name in TRACKED_FIELDS:
+            setattr(char, name, getattr(self, name))
+
+    def overlay(self, d: dict) -> dict:
+        """to_dict() 결과에 최신 메모리 값을 덮어씀"""
+        for name in TRACKED_FIELDS:
+            d[name] = getattr(self, name)
+        return d
+
+
+class CharStateStore:
+    """char_id → CharState. 접속(join_map)~퇴장(disconnect) 동안만 보관.
+
+    이동/피격은 메모리만 갱신하고, flush() 가 dirty 필드만 모아
+    characters 테이블에 한 번의 bulk UPDATE 로 기록한다 (write-behind).
+    """
+
+    def __init__(self):
+        self._states: dict[int, CharState] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, char_id: int) -> bool:
+        return char_id in self._states
+
+    def get(self, char_id: int) -> CharState | None:
+        return self._states.get(char_id)
+
+    def adopt(self, char: Character) -> CharState:
+        """DB 에서 막 읽은 캐릭터로 상태를 (재)생성"""
+        st = CharState.from_model(char)
+        self._states[char.id] = st
+        return st
+
+    def load(self, char_id: int) -> CharState | None:
+        """cache miss 때만 DB 조회"""
+        st = self._states.get(char_id)
+        if st is not None:
+            return st
+        char = db.session.get(Character, char_id)
+        if char is None:
+            return None
+        return self.adopt(char)
+
+    def on_map(self, map_key: str) -> list[CharState]:
+        return [st for st in self._states.values() if st.map_key == map_key]
+
+    def dirty_count(self) -> int:
+        return sum(1 for st in self._states.values() if st.dirty)
+
+    def flush(self, char_ids=None) -> int:
+        """dirty 상태를 bulk UPDATE + commit. 기록한 행 수 반환."""
+        if char_ids is None:
+            targets = list(self._states.values())
+        else:
+            targets = [st for cid in char_ids if (st := self._states.get(cid))]
+
+        rows = []
+        taken: list[tuple[CharState, set[str]]] = []
+        for st in targets:
+            if not st.dirty:
+                continue
+            # commit I/O 중 들어온 변경을 잃지 않도록 먼저 떼어 둔다
+            fields, st.dirty = st.dirty, set()
+            taken.append((st, fields))
+            row = {'id': st.id}
+            row.update({name: getattr(st, name) for name in fields})
+            rows.append(row)
+        if not rows:
+            return 0
+
+        try:
+            db.session.execute(update(Character), rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            for st, fields in taken:      # 다음 flush 에서 재시도
+                st.dirty |= fields
+            raise
+        return len(rows)
+
+    def evict(self, char_id: int) -> CharState | None:
+        return self._states.pop(char_id, None)
+
+    def clear(self) -> None:
+        self._states.clear()
+
+
+# ─────────────────────────────────────────────────────────
+#  REST 블루프린트용 헬퍼 — 소켓 서버가 없으면(단독 테스트 앱) no-op
+# ─────────────────────────────────────────────────────────
+def _live_store() -> CharStateStore | None:
+    return current_app.extensions.get('char_states')
+
+
+def flush_live(char_ids=None) -> None:
+    """REST 가 Character 를 읽기/수정하기 전에 메모리 변경분을 먼저 기록"""
+    store = _live_store()
+    if store is not None:
+        store.flush(char_ids)
+
+
+def absorb_live(char: Character) -> None:
+    """REST 가 commit 한 값을 접속 중 상태에 반영"""
+    store = _live_store()
+    if store is not None and (st := store.get(char.id)) is not None:
+        st.absorb(char)
+
+
+def evict_live(char_id: int) -> None:
+    """삭제된 캐릭터는 flush 대상에서도 제외"""
+    store = _live_store()
+    if store is not None:
+        store.evict(char_id)
@@ -0,0 +1,72 @@
+# ─────────────────────────────────────────────────────────
+#  속도 기반 이동 — 클라이언트는 출발/정지/방향 전환(+주기 키프레임)만 보내고
+#  서버가 마지막 키프레임 + 속도로 현재 좌표를 외삽(dead reckoning)
+#   - 외삽은 MAX_EXTRAPOLATE 초까지만 (키프레임이 끊기면 그 자리에 멈춤)
+#   - 속도는 MAX_SPEED 로 클램프 (조작된 패킷 방지)
+# ─────────────────────────────────────────────────────────
+import time
+from math import hypot
+
+MAX_SPEED       = 240.0   # px/s — 프론트 utils/movement.ts 와 동일 (MOVE_SPEED 200 + 여유)
+MAX_EXTRAPOLATE = 1.0     # 초
+
+
+class Motion:
+    """마지막 키프레임 (map_key, x, y) 과 속도 (px/s)"""
+    __slots__ = ('map_key', 'x', 'y', 'vx', 'vy', 't0')
+
+    def __init__(self, map_key: str, x: float, y: float, vx: float, vy: float, t0: float):
+        self.map_key = map_key
+        self.x, self.y = x, y
+        self.vx, self.vy = vx, vy
+        self.t0 = t0
+
+    def position(self, now: float) -> tuple[float, float]:
+        dt = min(max(now - self.t0, 0.0), MAX_EXTRAPOLATE)
+        return self.x + self.vx * dt, self.y + self.vy * dt
+
+
+def clamp_velocity(vx: float, vy: float, max_speed: float = MAX_SPEED) -> tuple[float, float]:
+    """벡터 길이 기준 — 방향은 유지하고 속력만 max_speed 로"""
+    speed = hypot(vx, vy)
+    if speed <= max_speed:
+        return vx, vy
+    k = max_speed / speed
+    return vx * k, vy * k
+
+
+class MotionTable:
+    """움직이는 캐릭터만 보관 — 정지(속도 0)하면 바로 빠진다"""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._motions: dict[int, Motion] = {}
+
+    def __len__(self) -> int:
+        return len(self._motions)
+
+    def __contains__(self, char_id: int) -> bool:
+        return char_id in self._motions
+
+    def get(self, char_id: int) -> Motion | None:
+        return self._motions.get(char_id)
+
+    def set(self, char_id: int, map_key: str, x: float, y: float,
+            vx: float, vy: float, now: float | None = None) -> Motion | None:
+        vx, vy = clamp_velocity(vx, vy)
+        if not vx and not vy:
+            self._motions.pop(char_id, None)
+            return None
+        m = Motion(map_key, x, y, vx, vy, self.clock() if now is None else now)
+        self._motions[char_id] = m
+        return m
+
+    def stop(self, char_id: int) -> None:
+        self._motions.pop(char_id, None)
+
+    def items(self) -> list[tuple[int, Motion]]:
+        """외삽 중 stop() 이 불려도 안전하도록 스냅샷"""
+        return list(self._motions.items())
+
+    def clear(self) -> None:
+        self._motions.clear()
@@ -0,0 +1,98 @@
+# ─────────────────────────────────────────────────────────
+#  공유 flow field — 같은 타깃을 쫓는 몬스터들이 거리 맵 하나를 같이 읽음
+#   - 타깃 타일에서 BFS(균일 비용 Dijkstra) 한 번 → 타일당 u16 거리
+#   - 몬스터는 이웃 중 거리가 더 작은 칸으로 한 걸음 (O(1), 탐색 없음)
+#   - 타깃이 타일을 옮길 때만 다시 계산, 맵당 살아있는 field 수는 상한(LRU)
+# ─────────────────────────────────────────────────────────
+from array import array
+from collections import OrderedDict, deque
+
+from utils.walkable import WalkGrid
+
+Tile = tuple[int, int]
+
+UNREACHED = 0xFFFF
+MAX_FIELD_DIST = 64             # 이보다 먼 타일은 계산하지 않음 (큰 맵에서 BFS 비용 bound)
+
+
+class FlowField:
+    """goal 까지의 4방향 거리 — 못 가거나 max_dist 밖이면 None"""
+    __slots__ = ('goal', 'width', 'height', 'dist')
+
+    def __init__(self, walk: WalkGrid, goal: Tile, max_dist: int = MAX_FIELD_DIST):
+        w = walk.width
+        self.goal = goal
+        self.width, self.height = w, walk.height
+        dist = array('H', [UNREACHED]) * (w * walk.height)
+        gx, gy = goal
+        if walk.is_walkable(gx, gy):
+            dist[gy * w + gx] = 0
+            q = deque([goal])
+            neighbors = walk.neighbors
+            while q:
+                x, y = q.popleft()
+                d = dist[y * w + x] + 1
+                if d > max_dist:
+                    continue
+                for nx, ny in neighbors(x, y):
+                    j = ny * w + nx
+                    if dist[j] == UNREACHED:
+                        dist[j] = d
+                        q.append((nx, ny))
+        self.dist = dist
+
+    def distance(self, x: int, y: int) -> int | None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            d = self.dist[y * self.width + x]
+            return None if d == UNREACHED else d
+        return None
+
+    def next_step(self, walk: WalkGrid, x: int, y: int, blocked=()) -> Tile | None:
+        """(x, y) 에서 goal 쪽으로 한 칸 — blocked(다른 몬스터) 는 피하고,
+        더 가까워지는 칸이 없으면 None"""
+        best, best_d = None, self.distance(x, y)
+        if best_d is None:
+            return None
+        w, dist = self.width, self.dist
+        for nx, ny in walk.neighbors(x, y):
+            d = dist[ny * w + nx]
+            if d < best_d and (nx, ny) not in blocked:
+                best, best_d = (nx, ny), d
+        return best
+
+
+class FlowFieldCache:
+    """{map_key: {target_key: FlowField}} — 타깃 타일이 같으면 재사용"""
+
+    def __init__(self, max_per_map: int = 16, max_dist: int = MAX_FIELD_DIST):
+        self.max_per_map = max_per_map
+        self.max_dist = max_dist
+        self._maps: dict[str, OrderedDict[int, FlowField]] = {}
+        self.builds = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return sum(len(f) for f in self._maps.values())
+
+    def get(self, map_key: str, walk: WalkGrid, target_key: int, goal: Tile) -> FlowField:
+        fields = self._maps.setdefault(map_key, OrderedDict())
+        field = fields.get(target_key)
+        if field is not None and field.goal == goal:
+            fields.move_to_end(target_key)
+            self.hits += 1
+            return field
+        field = fields[target_key] = FlowField(walk, goal, self.max_dist)
+        fields.move_to_end(target_key)
+        self.builds += 1
+        while len(fields) > self.max_per_map:
+            fields.popitem(last=False)            # 가장 오래 안 쓴 타깃부터
+        return field
+
+    def forget(self, target_key: int) -> None:
+        """타깃 퇴장 — 모든 맵에서 제거"""
+        for fields in self._maps.values():
+            fields.pop(target_key, None)
+
+    def invalidate(self, map_key: str) -> None:
+        """맵 reload/삭제"""
+        self._maps.pop(map_key, None)
@@ -0,0 +1,66 @@
+# ─────────────────────────────────────────────────────────
+#  시야(line of sight) — 충돌 격자 위 Bresenham 직선
+#   - 두 타일 사이 직선이 지나는 칸이 모두 통과 가능하면 보임 (끝점 포함)
+#   - LosCache: 맵별 (from, to) → bool, 반경 안 쌍만 처음 물을 때 계산해 보관
+#     → 틱 안에서는 dict 조회 한 번, 맵 reload 시 그 맵만 폐기
+# ─────────────────────────────────────────────────────────
+from utils.walkable import WalkGrid
+
+Tile = tuple[int, int]
+
+
+def bresenham(a: Tile, b: Tile):
+    """a → b 직선이 지나는 타일 (양 끝 포함)"""
+    x0, y0 = a
+    x1, y1 = b
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx + dy
+    while True:
+        yield x0, y0
+        if x0 == x1 and y0 == y1:
+            return
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
+
+
+def line_clear(walk: WalkGrid, a: Tile, b: Tile) -> bool:
+    is_walkable = walk.is_walkable
+    return all(is_walkable(x, y) for x, y in bresenham(a, b))
+
+
+class LosCache:
+    """{map_key: {(ax, ay, bx, by): bool}} — 체비셰프 radius 안 쌍만 캐시"""
+
+    def __init__(self, radius: int):
+        self.radius = radius
+        self._maps: dict[str, dict[tuple[int, int, int, int], bool]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._maps.values())
+
+    def visible(self, map_key: str, walk: WalkGrid, a: Tile, b: Tile) -> bool:
+        if max(abs(a[0] - b[0]), abs(a[1] - b[1])) > self.radius:
+            return line_clear(walk, a, b)        # 반경 밖은 캐시하지 않음 (메모리 bound)
+        key = (a[0], a[1], b[0], b[1])
+        pairs = self._maps.get(map_key)
+        if pairs is None:
+            pairs = self._maps[map_key] = {}
+        seen = pairs.get(key)
+        if seen is not None:
+            self.hits += 1
+            return seen
+        self.misses += 1
+        seen = pairs[key] = line_clear(walk, a, b)
+        return seen
+
+    def invalidate(self, map_key: str) -> None:
+        self._maps.pop(map_key, None)
@@ -0,0 +1,55 @@
+# ─────────────────────────────────────────────────────────
+#  키(캐릭터)별 직렬 실행기 — 같은 키의 작업은 도착 순서대로 하나씩,
+#  다른 키끼리는 각자의 greenlet 에서 동시에
+#   - 락/추가 greenlet 없음: 먼저 들어온 greenlet 이 실행 후 큐를 비우고,
+#     그 사이 도착한 작업은 큐에만 넣고 바로 반환
+#   - coalesce=True 면 큐 끝의 같은 함수 작업을 최신 인자로 교체 (latest-wins)
+# ─────────────────────────────────────────────────────────
+from collections import deque
+from typing import Callable, Hashable
+
+
+class SerialExecutor:
+    def __init__(self, on_error: Callable[[BaseException], None] | None = None):
+        self._queues: dict[Hashable, deque] = {}
+        self.on_error = on_error
+        self.queued = 0          # 누적 — 다른 greenlet 이 실행 중이라 큐에 넣은 수
+        self.coalesced = 0       # 누적 — 큐에서 최신 작업으로 교체된 수
+
+    def __len__(self) -> int:
+        """지금 실행 중인 키 수"""
+        return len(self._queues)
+
+    def pending(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def submit(self, key: Hashable, fn: Callable, *args, coalesce: bool = False) -> bool:
+        """바로 실행했으면 True, 실행 중인 greenlet 의 큐에 넣었으면 False"""
+        q = self._queues.get(key)
+        if q is not None:
+            if coalesce and q and q[-1][0] is fn:
+                q[-1] = (fn, args)
+                self.coalesced += 1
+            else:
+                q.append((fn, args))
+                self.queued += 1
+            return False
+
+        q = self._queues[key] = deque()
+        try:
+            self._call(fn, args)
+            while q:
+                f, a = q.popleft()
+                self._call(f, a)
+        finally:
+            del self._queues[key]
+        return True
+
+    def _call(self, fn: Callable, args: tuple) -> None:
+        try:
+            fn(*args)
+        except Exception as e:
+            # 한 작업의 실패가 뒤에 쌓인 같은 키 작업을 막지 않도록
+            if self.on_error is None:
+                raise
+            self.on_error(e)
@@ -0,0 +1,102 @@
+# ─────────────────────────────────────────────────────────
+#  맵 번들 — 맵 입장에 필요한 것(메타데이터·Tiled JSON·NPC·포탈)을 응답 하나로
+#   - version = 본문 sha256 앞 16자 → ETag, 같으면 304
+#   - gzip / brotli 변형을 만들 때 한 번 압축해 메모리에 보관 (요청마다 압축하지 않음)
+#   - Map/NPC 가 REST 로 바뀌면 invalidate(), Tiled JSON 은 mtime/크기로 감지해 재생성
+# ─────────────────────────────────────────────────────────
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+
+try:
+    import brotli                # 선택 의존성 — 없으면 gzip 까지만
+except ImportError:
+    brotli = None
+
+FileStamp = tuple[str, int, int] | None      # (경로, mtime_ns, 크기)
+
+
+class MapBundle:
+    __slots__ = ('map_key', 'version', 'stamp', 'identity', 'gzip', 'br')
+
+    def __init__(self, map_key: str, version: str, stamp: FileStamp, body: bytes):
+        self.map_key = map_key
+        self.version = version
+        self.stamp = stamp
+        self.identity = body
+        self.gzip = gzip.compress(body, compresslevel=9, mtime=0)
+        self.br = brotli.compress(body) if brotli is not None else None
+
+    def variant(self, accept) -> tuple[bytes, str | None]:
+        """Accept-Encoding(werkzeug Accept) 에 맞는 (본문, Content-Encoding)"""
+        if self.br is not None and accept.quality('br') > 0:
+            return self.br, 'br'
+        if accept.quality('gzip') > 0:
+            return self.gzip, 'gzip'
+        return self.identity, None
+
+
+def file_stamp(path: pathlib.Path | None) -> FileStamp:
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+def _map_meta(map_data) -> dict:
+    try:
+        meta = json.loads(map_data or '{}')
+    except ValueError:
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def build_bundle(m, npcs, source: pathlib.Path | None) -> MapBundle:
+    """m: Map 행, npcs: 활성 NPC 행 목록, source: Tiled JSON 경로 (없으면 tilemap=null)"""
+    stamp = file_stamp(source)
+    tilemap = None
+    if stamp is not None:
+        tilemap = json.loads(pathlib.Path(source).read_bytes())
+    meta = _map_meta(m.map_data)
+    content = {
+        'map': m.to_dict(),
+        'start_position': meta.get('start_position'),
+        'teleports': meta.get('teleports', []),
+        'npcs': [n.to_dict() for n in npcs],
+        'tilemap': tilemap,
+    }
+    raw = json.dumps(content, separators=(',', ':'), ensure_ascii=False, default=str).encode()
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    body = b'{"version":"' + version.encode() + b'",' + raw[1:]
+    return MapBundle(m.key, version, stamp, body)
+
+
+_bundles: dict[str, MapBundle] = {}
+
+
+def has(map_key: str) -> bool:
+    return map_key in _bundles
+
+
+def cached(map_key: str, source: pathlib.Path | None) -> MapBundle | None:
+    """캐시된 번들 — 원본 파일이 바뀌었으면 None (다시 만들어야 함)"""
+    bundle = _bundles.get(map_key)
+    if bundle is not None and bundle.stamp == file_stamp(source):
+        return bundle
+    return None
+
+
+def store(bundle: MapBundle) -> MapBundle:
+    _bundles[bundle.map_key] = bundle
+    return bundle
+
+
+def invalidate(*map_keys: str) -> None:
+    """Map / NPC 가 바뀐 맵 — 다음 요청 때 다시 생성"""
+    for key in map_keys:
+        _bundles.pop(key, None)
@@ -0,0 +1,91 @@
+# ─────────────────────────────────────────────────────────
+#  맵 청크 스트리밍 — 타일 레이어를 CHUNK_TILES² 조각으로 잘라 따로 전송
+#   - 청크 해시 = 청크 gid(u32 LE) + 크기의 sha256 앞 16자 → URL 에 넣어 immutable 캐시
+#   - 맵이 바뀌면 바뀐 청크만 해시가 달라짐 (나머지는 브라우저/CDN 캐시 그대로)
+#   - CompiledMap 이 교체되면(레지스트리 reload) 다음 조회 때 인덱스를 새로 만듦
+# ─────────────────────────────────────────────────────────
+import hashlib
+import sys
+from array import array
+
+from utils.mapcompiler import CompiledMap
+
+CHUNK_TILES = 32
+CHUNK_RADIUS = 1                # 플레이어 청크 주변 (2r+1)² 청크만 내려줌
+CHUNK_RADIUS_MAX = 2
+
+
+class ChunkIndex:
+    """CompiledMap 하나의 청크 격자 — 해시는 처음 요청될 때 계산해 보관"""
+    __slots__ = ('cm', 'size', 'cols', 'rows', '_hashes')
+
+    def __init__(self, cm: CompiledMap, size: int = CHUNK_TILES):
+        self.cm = cm
+        self.size = size
+        self.cols = -(-cm.width // size)
+        self.rows = -(-cm.height // size)
+        self._hashes: dict[tuple[int, int], str] = {}
+
+    def __contains__(self, chunk: tuple[int, int]) -> bool:
+        cx, cy = chunk
+        return 0 <= cx < self.cols and 0 <= cy < self.rows
+
+    def chunk_of(self, tx: int, ty: int) -> tuple[int, int]:
+        """타일 → 청크 (맵 밖이면 가장자리 청크로)"""
+        cx = min(max(tx // self.size, 0), self.cols - 1)
+        cy = min(max(ty // self.size, 0), self.rows - 1)
+        return cx, cy
+
+    def bounds(self, cx: int, cy: int) -> tuple[int, int, int, int]:
+        """(x0, y0, w, h) — 오른쪽/아래 끝 청크는 잘릴 수 있음"""
+        x0, y0 = cx * self.size, cy * self.size
+        return x0, y0, min(self.size, self.cm.width - x0), min(self.size, self.cm.height - y0)
+
+    def gids(self, cx: int, cy: int) -> array:
+        x0, y0, w, h = self.bounds(cx, cy)
+        src, width = self.cm.layer.gids, self.cm.width
+        out = array('I')
+        for y in range(y0, y0 + h):
+            out.extend(src[y * width + x0:y * width + x0 + w])
+        return out
+
+    def hash(self, cx: int, cy: int) -> str:
+        h = self._hashes.get((cx, cy))
+        if h is None:
+            _x0, _y0, w, hgt = self.bounds(cx, cy)
+            gids = self.gids(cx, cy)
+            if sys.byteorder != 'little':
+                gids.byteswap()
+            digest = hashlib.sha256(f"{w}x{hgt}:".encode() + gids.tobytes())
+            h = self._hashes[(cx, cy)] = digest.hexdigest()[:16]
+        return h
+
+    def around(self, tx: int, ty: int, radius: int = CHUNK_RADIUS) -> list[tuple[int, int]]:
+        """(tx, ty) 타일이 속한 청크 주변 청크 목록 (맵 밖 제외)"""
+        ccx, ccy = self.chunk_of(tx, ty)
+        return [
+            (cx, cy)
+            for cy in range(ccy - radius, ccy + radius + 1)
+            for cx in range(ccx - radius, ccx + radius + 1)
+            if (cx, cy) in self
+        ]
+
+    def payload(self, cx: int, cy: int) -> dict:
+        x0, y0, w, h = self.bounds(cx, cy)
+        return {
+            'map_key': self.cm.map_key, 'cx': cx, 'cy': cy,
+            'x0': x0, 'y0': y0, 'w': w, 'h': h,
+            'hash': self.hash(cx, cy),
+            'gids': self.gids(cx, cy).tolist(),
+        }
+
+
+_indexes: dict[str, ChunkIndex] = {}
+
+
+def chunk_index(cm: CompiledMap) -> ChunkIndex:
+    """맵별 인덱스 — 레지스트리가 CompiledMap 을 교체했으면 새로 만듦"""
+    idx = _indexes.get(cm.map_key)
+    if idx is None or idx.cm is not cm or idx.size != CHUNK_TILES:
+        idx = _indexes[cm.map_key] = ChunkIndex(cm, CHUNK_TILES)
+    return idx
@@ -0,0 +1,261 @@
+# ─────────────────────────────────────────────────────────
+#  맵 컴파일러 — Tiled JSON → 버전 붙은 바이너리(.mapbin), 워커는 읽기 전용 mmap
+#   - 섹션: gid 격자(u32) / 통과 격자(WalkGrid 셀) / 트리거 플래그(u8)
+#           / 연결 요소 라벨(u32, 0=벽, 1=가장 큰 요소)
+#   - 헤더에 원본 JSON 의 sha256 — 원본이 바뀌면 다음 로드 때 다시 컴파일
+#   - 같은 파일을 mmap 하므로 워커 N 개가 페이지를 공유 (JSON 파싱은 최초 1회)
+#
+#   python -m utils.mapcompiler            # SOURCE_DIRS 의 Tiled JSON 전부
+#   python -m utils.mapcompiler dungeon1
+# ─────────────────────────────────────────────────────────
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+from array import array
+from collections import deque
+
+from utils.walkable import ROOT, WALK, TileLayer, WalkGrid, parse_tiled
+
+MAGIC = b'MAPB'
+MAPBIN_VERSION = 3
+BUILD_DIR = pathlib.Path(os.environ.get('MAP_BUILD_DIR', ROOT / 'build' / 'maps'))
+# Map.json_file 을 찾을 디렉터리 (앞쪽 우선) — MAP_JSON_DIRS=dir1:dir2 로 추가
+SOURCE_DIRS = [pathlib.Path(d) for d in os.environ.get('MAP_JSON_DIRS', '').split(os.pathsep) if d]
+SOURCE_DIRS += [ROOT, ROOT.parent / 'frontend' / 'public']
+
+INVALID_TILE_ID = 15            # 몬스터 금단 타일 gid
+TRIG_MONSTER_FORBIDDEN = 0x01   # 트리거 플래그 비트
+
+# magic, version, width, height, 통과 타일 수, 원본 sha256, 섹션 수
+_HEADER = struct.Struct('<4sHHHI32sB')
+_SECTION = struct.Struct('<BII')            # kind, offset, length
+SEC_GIDS, SEC_WALK, SEC_TRIG, SEC_COMP = 1, 2, 3, 5   # 4 = 벽까지 거리 (v2, 런타임 미사용으로 v3 에서 제거)
+
+
+class MapBinError(ValueError):
+    pass
+
+
+def _components(walk: WalkGrid) -> array:
+    """4방향 연결 요소 라벨 — 크기 내림차순으로 1, 2, … (막힌 타일 0)"""
+    w = walk.width
+    labels = array('I', bytes(4 * len(walk.cells)))
+    sizes: list[int] = []
+    for i, c in enumerate(walk.cells):
+        if not c & WALK or labels[i]:
+            continue
+        label = len(sizes) + 1
+        labels[i] = label
+        q = deque([i])
+        size = 0
+        while q:
+            j = q.popleft()
+            size += 1
+            for nx, ny in walk.neighbors(j % w, j // w):
+                k = ny * w + nx
+                if not labels[k]:
+                    labels[k] = label
+                    q.append(k)
+        sizes.append(size)
+    order = sorted(range(len(sizes)), key=lambda k: -sizes[k])
+    rank = [0] * (len(sizes) + 1)
+    for new, old in enumerate(order, 1):
+        rank[old + 1] = new
+    for i, v in enumerate(labels):
+        if v:
+            labels[i] = rank[v]
+    return labels
+
+
+def _le_bytes(arr: array) -> bytes:
+    if sys.byteorder != 'little':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _u32_view(sec: memoryview):
+    arr = sec.cast('I')
+    if sys.byteorder != 'little':
+        arr = array('I', arr)
+        arr.byteswap()
+    return arr
+
+
+def compile_bytes(raw: bytes) -> bytes:
+    """Tiled JSON 원본 바이트 → .mapbin 바이트"""
+    width, height, gids, collidable = parse_tiled(json.loads(raw))
+    walk = WalkGrid(width, height, (g == 0 or g not in collidable for g in gids))
+    trig = bytearray(TRIG_MONSTER_FORBIDDEN if g == INVALID_TILE_ID else 0 for g in gids)
+
+    sections = [(SEC_GIDS, _le_bytes(array('I', gids))), (SEC_WALK, bytes(walk.cells)),
+                (SEC_TRIG, bytes(trig)), (SEC_COMP, _le_bytes(_components(walk)))]
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table, body = [], []
+    for kind, blob in sections:
+        pad = -offset % 4                    # u32 섹션 정렬
+        body.append(b'\0' * pad)
+        offset += pad
+        table.append(_SECTION.pack(kind, offset, len(blob)))
+        body.append(blob)
+        offset += len(blob)
+    header = _HEADER.pack(MAGIC, MAPBIN_VERSION, width, height, len(walk),
+                          hashlib.sha256(raw).digest(), len(sections))
+    return header + b''.join(table) + b''.join(body)
+
+
+class CompiledMap:
+    """.mapbin 읽기 전용 뷰 — walk / layer 는 mmap 위의 memoryview (복사 없음)"""
+    __slots__ = ('map_key', 'width', 'height', 'source_hash', 'walk', 'layer',
+                 'trig', 'comp', '_buf')
+
+    def __init__(self, map_key: str, buf):
+        if len(buf) < _HEADER.size:
+            raise MapBinError(f"{map_key}: truncated header")
+        magic, version, w, h, walk_count, digest, n = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != MAPBIN_VERSION:
+            raise MapBinError(f"{map_key}: not a v{MAPBIN_VERSION} mapbin")
+        view = memoryview(buf)
+        secs = {}
+        for k in range(n):
+            kind, off, length = _SECTION.unpack_from(buf, _HEADER.size + k * _SECTION.size)
+            if off + length > len(buf):
+                raise MapBinError(f"{map_key}: section {kind} out of range")
+            secs[kind] = view[off:off + length]
+        if any(s not in secs for s in (SEC_GIDS, SEC_WALK, SEC_TRIG, SEC_COMP)):
+            raise MapBinError(f"{map_key}: missing section")
+
+        self.map_key = map_key
+        self.width, self.height = w, h
+        self.source_hash = digest
+        self.walk = WalkGrid.from_cells(w, h, secs[SEC_WALK], walk_count)
+        self.layer = TileLayer.from_gids(w, h, _u32_view(secs[SEC_GIDS]))
+        self.trig = secs[SEC_TRIG]
+        self.comp = _u32_view(secs[SEC_COMP])
+        self._buf = buf                      # mmap 수명 유지
+
+    def tiles_with_flag(self, flag: int) -> list[tuple[int, int]]:
+        w = self.width
+        return [(i % w, i // w) for i, f in enumerate(self.trig) if f & flag]
+
+    def flags(self, x: int, y: int) -> int:
+        """트리거 플래그 비트 — 맵 밖은 0"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.trig[y * self.width + x]
+        return 0
+
+    def component(self, x: int, y: int) -> int:
+        """연결 요소 라벨 — 벽/맵 밖은 0"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.comp[y * self.width + x]
+        return 0
+
+    def reachable(self, a: tuple[int, int], b: tuple[int, int]) -> bool:
+        """a 에서 b 로 걸어갈 수 있는지 (O(1))"""
+        ca = self.component(*a)
+        return ca != 0 and ca == self.component(*b)
+
+    def nearest_in_main(self, x: int, y: int, max_radius: int = 16) -> tuple[int, int] | None:
+        """(x, y) 에서 가장 가까운(체비셰프 링 순) 가장 큰 연결 요소의 타일"""
+        for r in range(max_radius + 1):
+            for dy in range(-r, r + 1):
+                for dx in range(-r, r + 1):
+                    if max(abs(dx), abs(dy)) == r and self.component(x + dx, y + dy) == 1:
+                        return x + dx, y + dy
+        return None
+
+
+def _read_hash(path: pathlib.Path) -> bytes | None:
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(head) < _HEADER.size:
+        return None
+    magic, version, *_rest, digest, _n = _HEADER.unpack(head)
+    return digest if magic == MAGIC and version == MAPBIN_VERSION else None
+
+
+def _write_atomic(path: pathlib.Path, blob: bytes) -> None:
+    """여러 워커가 동시에 컴파일해도 반쯤 쓴 파일을 mmap 하지 않도록 rename 으로 교체"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def artifact_path(map_key: str) -> pathlib.Path:
+    return BUILD_DIR / f"{map_key}.mapbin"
+
+
+def _source(map_key: str, source: pathlib.Path | None) -> tuple[bytes, bytes]:
+    if source is None:
+        source = ROOT / f"{map_key}.json"
+    raw = source.read_bytes()                            # 없으면 FileNotFoundError
+    return raw, hashlib.sha256(raw).digest()
+
+
+def ensure_compiled(map_key: str, source: pathlib.Path | None = None) -> tuple[pathlib.Path, bool]:
+    """원본 해시가 다르거나 없으면 컴파일. (경로, 새로 컴파일했는지)"""
+    raw, digest = _source(map_key, source)
+    path = artifact_path(map_key)
+    if _read_hash(path) == digest:
+        return path, False
+    _write_atomic(path, compile_bytes(raw))
+    return path, True
+
+
+def load_map(map_key: str, source: pathlib.Path | None = None) -> CompiledMap:
+    """컴파일 결과를 mmap. 빌드 디렉터리에 쓸 수 없으면 메모리에서 바로 사용
+    (source 생략 시 backend/<map_key>.json)"""
+    raw, digest = _source(map_key, source)
+    path = artifact_path(map_key)
+    if _read_hash(path) != digest:
+        blob = compile_bytes(raw)
+        try:
+            _write_atomic(path, blob)
+        except OSError:                      # 읽기 전용 이미지 등 — 이 프로세스만 사용
+            return CompiledMap(map_key, blob)
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return CompiledMap(map_key, mm)
+
+
+def _tiled_sources() -> list[pathlib.Path]:
+    found: dict[str, pathlib.Path] = {}
+    for p in (p for d in SOURCE_DIRS for p in sorted(d.glob('*.json'))):
+        if p.stem in found:
+            continue
+        try:
+            data = json.loads(p.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and 'layers' in data and 'tilesets' in data:
+            found[p.stem] = p
+    return list(found.values())
+
+
+def main(argv: list[str]) -> int:
+    sources = _tiled_sources()
+    if argv:
+        sources = [p for p in sources if p.stem in argv]
+    for src in sources:
+        key = src.stem
+        path, fresh = ensure_compiled(key, src)
+        print(f"{key:>12} → {path} ({path.stat().st_size} B, {'compiled' if fresh else 'up to date'})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
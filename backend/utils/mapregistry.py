@@ -0,0 +1,131 @@
+# ─────────────────────────────────────────────────────────
+#  타일맵 레지스트리 — Map.key → CompiledMap (utils/mapcompiler)
+#   - 원본 파일은 Map.json_file 을 SOURCE_DIRS 에서 찾음 (없으면 <key>.json)
+#   - 처음 쓰일 때 로드, warm() 으로 기동 시 미리 로드
+#   - reload() 는 새 CompiledMap 을 다 만든 뒤 dict 항목 하나만 교체
+#     → 진행 중인 AI 틱은 이미 잡은 이전 스냅샷을 끝까지 사용, 반쯤 로드된 맵은 보이지 않음
+#   - listeners: 교체/삭제된 맵 키를 받는 콜백 (경로 캐시 등 파생 데이터 폐기)
+# ─────────────────────────────────────────────────────────
+import pathlib
+from typing import Callable, Iterable
+
+from flask import current_app
+
+from utils import mapcompiler
+from utils.mapcompiler import CompiledMap
+
+
+class MapRegistry:
+    def __init__(self):
+        self._maps: dict[str, CompiledMap] = {}
+        self._files: dict[str, str] = {}      # {map_key: Map.json_file}
+        self._missing: set[str] = set()       # Tiled JSON 이 없는 맵 (매번 파일 찾지 않도록)
+        self.resolve: Callable[[str], str | None] | None = None   # 처음 보는 키 → Map.json_file
+        self.listeners: list[Callable[[str], None]] = []
+        self.loads = 0
+        self.reloads = 0
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def __contains__(self, map_key: str) -> bool:
+        return map_key in self._maps
+
+    def set_source(self, map_key: str, json_file: str | None) -> None:
+        self._files[map_key] = json_file or ''
+
+    def source_path(self, map_key: str) -> pathlib.Path | None:
+        if map_key not in self._files and self.resolve is not None:
+            json_file = self.resolve(map_key)
+            if json_file is not None:         # 모르는 키(Map 행 없음)는 기억하지 않음 — 무한 증가 방지
+                self.set_source(map_key, json_file)
+        name = pathlib.PurePath(self._files.get(map_key) or f"{map_key}.json").name
+        for d in mapcompiler.SOURCE_DIRS:
+            p = d / name
+            if p.is_file():
+                return p
+        return None
+
+    def get(self, map_key: str) -> CompiledMap:
+        """없으면 로드 — Tiled JSON 이 없는 맵은 FileNotFoundError"""
+        cm = self._maps.get(map_key)
+        if cm is None:
+            cm = self._load(map_key)
+        return cm
+
+    def find(self, map_key: str) -> CompiledMap | None:
+        if map_key in self._missing:
+            return None
+        try:
+            return self.get(map_key)
+        except FileNotFoundError:
+            return None
+
+    def _load(self, map_key: str) -> CompiledMap:
+        if map_key in self._missing:
+            raise FileNotFoundError(f"no tilemap for {map_key}")
+        src = self.source_path(map_key)
+        if src is None:
+            self._missing.add(map_key)
+            raise FileNotFoundError(f"no tilemap for {map_key}")
+        cm = mapcompiler.load_map(map_key, src)
+        self._maps[map_key] = cm              # 완성된 뒤에만 보이도록 마지막에 대입
+        self.loads += 1
+        return cm
+
+    def reload(self, map_key: str, json_file: str | None = None) -> CompiledMap | None:
+        """원본을 다시 읽어 교체 (이미 로드된 적 없으면 다음 사용 때 로드)"""
+        if json_file is not None:
+            self.set_source(map_key, json_file)
+        self._missing.discard(map_key)
+        if map_key not in self._maps:
+            return None
+        src = self.source_path(map_key)
+        if src is None:
+            self._maps.pop(map_key, None)
+            self._missing.add(map_key)
+            self._changed(map_key)
+            return None
+        cm = mapcompiler.load_map(map_key, src)
+        self._maps[map_key] = cm              # 원자적 교체
+        self.reloads += 1
+        self._changed(map_key)
+        return cm
+
+    def forget(self, map_key: str) -> None:
+        had = self._maps.pop(map_key, None) is not None
+        self._files.pop(map_key, None)
+        self._missing.discard(map_key)
+        if had:
+            self._changed(map_key)
+
+    def _changed(self, map_key: str) -> None:
+        for fn in self.listeners:
+            fn(map_key)
+
+    def warm(self, map_keys: Iterable[str]) -> list[str]:
+        """미리 로드, 실제로 로드된 키 목록 반환"""
+        return [k for k in map_keys if self.find(k) is not None]
+
+
+# 프로세스 공용 — utils.walkable.get_walkable / get_tile_layer 가 사용
+maps = MapRegistry()
+
+
+def reload_live(map_key: str, json_file: str | None = None) -> None:
+    """REST 에서 Map 이 바뀐 뒤 호출 — 실행 중인 앱의 레지스트리 갱신"""
+    registry = current_app.extensions.get('map_registry')
+    if registry is not None:
+        registry.reload(map_key, json_file)
+
+
+def forget_live(map_key: str) -> None:
+    registry = current_app.extensions.get('map_registry')
+    if registry is not None:
+        registry.forget(map_key)
+
+
+def live_registry() -> MapRegistry:
+    """REST 에서 타일맵 읽기 — 앱에 등록된 레지스트리 (없으면 프로세스 공용)"""
+    registry = current_app.extensions.get('map_registry')
+    return maps if registry is None else registry      # 빈 레지스트리(len 0)도 앱 것을 씀
@@ -0,0 +1,147 @@
+# ─────────────────────────────────────────────────────────
+#  몬스터 상태 — 맵별로 한 번 로드해 메모리에서 시뮬레이션
+#   - MonsterState: ORM 대신 __slots__ 레코드 (틱/전투는 DB 를 보지 않음)
+#   - DB 기록은 사망·리스폰(flush) 과 주기 체크포인트(checkpoint) 뿐
+#   - 마지막으로 기록한 값(saved)과 달라진 몬스터만 bulk UPDATE
+# ─────────────────────────────────────────────────────────
+from flask import current_app
+from sqlalchemy import update
+from models import db, Monster
+
+# 시뮬레이션이 바꾸는 필드 — 체크포인트 때 이 필드만 비교/기록
+TRACKED_FIELDS = ('x', 'y', 'hp', 'is_alive', 'died_at')
+# 로드 시점 스냅샷 (REST 로 바뀌지 않는 스탯/스폰 정보)
+READONLY_FIELDS = (
+    'map_key', 'name', 'species', 'level',
+    'max_hp', 'mp', 'max_mp', 'attack', 'defense',
+    'spawn_x', 'spawn_y', 'respawn_s', 'drop_item_id',
+)
+
+
+class MonsterState:
+    """몬스터 1마리의 권위 있는(in-process) 상태. target_char_id 는 메모리 전용."""
+    __slots__ = ('id',) + READONLY_FIELDS + TRACKED_FIELDS + ('target_char_id', 'saved')
+
+    SPRITE_MAP = Monster.SPRITE_MAP
+
+    def __init__(self, mob_id: int):
+        self.id = mob_id
+        self.target_char_id: int | None = None
+
+    @classmethod
+    def from_model(cls, m: Monster) -> 'MonsterState':
+        st = cls(m.id)
+        for name in READONLY_FIELDS + TRACKED_FIELDS:
+            setattr(st, name, getattr(m, name))
+        st.target_char_id = m.target_char_id
+        st.saved = st.snapshot()
+        return st
+
+    def snapshot(self) -> tuple:
+        return tuple(getattr(self, name) for name in TRACKED_FIELDS)
+
+    def changed(self) -> bool:
+        return self.snapshot() != self.saved
+
+    def to_dict(self) -> dict:
+        return Monster.to_dict(self)      # 같은 필드 이름 — 패킷 형식 그대로
+
+    def overlay(self, d: dict) -> dict:
+        """to_dict() 결과(DB 값)에 최신 메모리 값을 덮어씀"""
+        for name in ('x', 'y', 'hp'):
+            d[name] = getattr(self, name)
+        return d
+
+
+class MonsterStore:
+    """{map_key: {mob_id: MonsterState}} — 맵을 처음 쓸 때 한 번만 SELECT"""
+
+    def __init__(self):
+        self._maps: dict[str, dict[int, MonsterState]] = {}
+        self._by_id: dict[int, MonsterState] = {}
+        self.loads = 0
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, map_key: str) -> bool:
+        return map_key in self._maps
+
+    def get(self, mob_id: int) -> MonsterState | None:
+        return self._by_id.get(mob_id)
+
+    def on_map(self, map_key: str) -> list[MonsterState]:
+        mobs = self._maps.get(map_key)
+        if mobs is None:
+            mobs = self._load(map_key)
+        return list(mobs.values())
+
+    def alive(self, map_key: str) -> list[MonsterState]:
+        return [m for m in self.on_map(map_key) if m.is_alive]
+
+    def adopt(self, m: Monster) -> MonsterState:
+        """맵 로드 뒤 DB 에 추가된 몬스터 — 그 맵이 로드돼 있으면 편입"""
+        st = MonsterState.from_model(m)
+        self._by_id[m.id] = st
+        if m.map_key in self._maps:
+            self._maps[m.map_key][m.id] = st
+        return st
+
+    def _load(self, map_key: str) -> dict[int, MonsterState]:
+        self.loads += 1
+        rows = Monster.query.filter_by(map_key=map_key).all()
+        mobs = self._maps[map_key] = {m.id: MonsterState.from_model(m) for m in rows}
+        self._by_id.update(mobs)
+        return mobs
+
+    def dirty_count(self) -> int:
+        return sum(1 for m in self._by_id.values() if m.changed())
+
+    def flush(self, mob_ids=None) -> int:
+        """바뀐 몬스터를 bulk UPDATE + commit (mob_ids=None 이면 전체 = 체크포인트)"""
+        if mob_ids is None:
+            targets = list(self._by_id.values())
+        else:
+            targets = [m for mid in mob_ids if (m := self._by_id.get(mid))]
+
+        rows = []
+        taken: list[tuple[MonsterState, tuple]] = []
+        for m in targets:
+            snap = m.snapshot()
+            if snap == m.saved:
+                continue
+            # commit I/O 중 바뀐 값은 다음 flush 때 — 기록한 스냅샷만 saved 로
+            taken.append((m, snap))
+            rows.append({'id': m.id, **dict(zip(TRACKED_FIELDS, snap))})
+        if not rows:
+            return 0
+
+        try:
+            db.session.execute(update(Monster), rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()         # saved 그대로 → 다음 flush 에서 재시도
+            raise
+        for m, snap in taken:
+            m.saved = snap
+        return len(rows)
+
+    def forget_map(self, map_key: str) -> None:
+        for mob_id in self._maps.pop(map_key, {}):
+            self._by_id.pop(mob_id, None)
+
+    def clear(self) -> None:
+        self._maps.clear()
+        self._by_id.clear()
+
+
+# ─────────────────────────────────────────────────────────
+#  REST 블루프린트용 헬퍼 — 소켓 서버가 없으면(단독 테스트 앱) no-op
+# ─────────────────────────────────────────────────────────
+def overlay_live(m: Monster) -> dict:
+    """DB 행 + (로드된 맵이면) 체크포인트 전 메모리 값"""
+    store: MonsterStore | None = current_app.extensions.get('monster_states')
+    d = m.to_dict()
+    if store is not None and (st := store.get(m.id)) is not None:
+        st.overlay(d)
+    return d
@@ -0,0 +1,167 @@
+# ─────────────────────────────────────────────────────────
+#  타일 경로 탐색 — WalkGrid(4방향) 위 A* + jump point search (JPS4)
+#   - 가로 이동: 위/아래 칸이 새로 열리는 곳(강제 이웃)에서만 멈춤
+#   - 세로 이동: 칸마다 좌우로 가로 점프를 쏴서 뭔가 찾으면 멈춤
+#   - 점프 포인트 사이는 직선이므로 비용 = 맨해튼 거리 (휴리스틱도 맨해튼)
+#  PathCache — (map_key, from, to) → 다음 칸, LRU. 맵 reload 시 그 맵 항목만 폐기
+# ─────────────────────────────────────────────────────────
+from collections import OrderedDict
+from heapq import heappop, heappush
+
+from utils.walkable import WALK, WalkGrid
+
+Tile = tuple[int, int]
+
+MAX_EXPANSIONS = 4096           # 점프 포인트 확장 상한 (못 찾으면 None)
+_ALL_DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def _jump_h(walk: WalkGrid, x: int, y: int, dx: int, goal: Tile) -> Tile | None:
+    w, h, cells = walk.width, walk.height, walk.cells
+    gx, gy = goal
+    while True:
+        x += dx
+        if not (0 <= x < w) or not cells[y * w + x] & WALK:
+            return None
+        if x == gx and y == gy:
+            return x, y
+        # 강제 이웃: 위/아래가 열렸는데 직전 칸의 위/아래는 막힘
+        for ny in (y - 1, y + 1):
+            if 0 <= ny < h and cells[ny * w + x] & WALK and not cells[ny * w + x - dx] & WALK:
+                return x, y
+
+
+def _jump_v(walk: WalkGrid, x: int, y: int, dy: int, goal: Tile) -> Tile | None:
+    w, h, cells = walk.width, walk.height, walk.cells
+    gx, gy = goal
+    while True:
+        y += dy
+        if not (0 <= y < h) or not cells[y * w + x] & WALK:
+            return None
+        if x == gx and y == gy:
+            return x, y
+        if _jump_h(walk, x, y, 1, goal) or _jump_h(walk, x, y, -1, goal):
+            return x, y
+
+
+def _directions(walk: WalkGrid, x: int, y: int, d: Tile | None):
+    """도착 방향 d 로 가지치기한 탐색 방향 (시작점은 4방향 전부)"""
+    if d is None:
+        return _ALL_DIRS
+    dx, dy = d
+    if dy:
+        return (d, (1, 0), (-1, 0))
+    dirs = [d]
+    w, cells = walk.width, walk.cells
+    for s in (-1, 1):
+        ny = y + s
+        if 0 <= ny < walk.height and cells[ny * w + x] & WALK and not cells[ny * w + x - dx] & WALK:
+            dirs.append((0, s))
+    return dirs
+
+
+def _unroll(parent: dict[Tile, Tile | None], goal: Tile) -> list[Tile]:
+    """점프 포인트 목록 → 한 칸씩 (시작점 제외)"""
+    jumps = [goal]
+    while (p := parent[jumps[-1]]) is not None:
+        jumps.append(p)
+    jumps.reverse()
+    path: list[Tile] = []
+    for (ax, ay), (bx, by) in zip(jumps, jumps[1:]):
+        sx = (bx > ax) - (bx < ax)
+        sy = (by > ay) - (by < ay)
+        while (ax, ay) != (bx, by):
+            ax, ay = ax + sx, ay + sy
+            path.append((ax, ay))
+    return path
+
+
+def find_path(walk: WalkGrid, start: Tile, goal: Tile,
+              max_expansions: int = MAX_EXPANSIONS) -> list[Tile] | None:
+    """start → goal 최단 경로 (start 제외, goal 포함). 같은 칸이면 [], 못 가면 None"""
+    if start == goal:
+        return []
+    if not walk.is_walkable(*start) or not walk.is_walkable(*goal):
+        return None
+    gx, gy = goal
+    g_best: dict[Tile, int] = {start: 0}
+    parent: dict[Tile, Tile | None] = {start: None}
+    heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, 0, start, None)]
+    seq = 0
+    expanded = 0
+    while heap and expanded < max_expansions:
+        _f, neg_g, _s, node, d = heappop(heap)
+        g = -neg_g
+        if g > g_best[node]:
+            continue                    # 더 짧은 경로로 이미 확장됨
+        if node == goal:
+            return _unroll(parent, goal)
+        expanded += 1
+        x, y = node
+        for dx, dy in _directions(walk, x, y, d):
+            jp = _jump_h(walk, x, y, dx, goal) if dx else _jump_v(walk, x, y, dy, goal)
+            if jp is None:
+                continue
+            ng = g + abs(jp[0] - x) + abs(jp[1] - y)
+            if ng < g_best.get(jp, ng + 1):
+                g_best[jp] = ng
+                parent[jp] = node
+                seq += 1
+                # f 가 같으면 더 멀리 간(g 큰) 쪽 먼저
+                heappush(heap, (ng + abs(jp[0] - gx) + abs(jp[1] - gy), -ng, seq, jp, (dx, dy)))
+    return None
+
+
+# ─────────────────────────────────────────────────────────
+#  경로 캐시 — 경로 하나를 계산하면 경로 위 모든 칸을 (칸, 목적지) 키로 등록
+#   (최단 경로의 뒷부분도 최단 경로) → 경로를 따라가는 몬스터는 매 틱 dict 조회 한 번
+# ─────────────────────────────────────────────────────────
+class PathCache:
+    """(map_key, from, to) → (공유 경로 튜플, from 의 인덱스), 항목 수 기준 LRU"""
+
+    def __init__(self, capacity: int = 20_000, max_expansions: int = MAX_EXPANSIONS):
+        self.capacity = capacity
+        self.max_expansions = max_expansions
+        self._entries: OrderedDict[tuple[str, Tile, Tile], tuple[tuple[Tile, ...], int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, map_key: str, walk: WalkGrid, start: Tile, goal: Tile):
+        key = (map_key, start, goal)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        steps = find_path(walk, start, goal, self.max_expansions)
+        full = (start, *steps) if steps is not None else (start,)   # 못 가는 목적지도 캐시
+        entries = self._entries
+        for i, tile in enumerate(full[:-1] if steps else full):
+            entries[(map_key, tile, goal)] = (full, i)
+            entries.move_to_end((map_key, tile, goal))
+        while len(entries) > self.capacity:
+            entries.popitem(last=False)
+        return full, 0
+
+    def next_step(self, map_key: str, walk: WalkGrid, start: Tile, goal: Tile) -> Tile | None:
+        """start 에서 goal 로 가는 첫 칸 (같은 칸이거나 못 가면 None)"""
+        if start == goal:
+            return None
+        full, i = self._lookup(map_key, walk, start, goal)
+        return full[i + 1] if i + 1 < len(full) else None
+
+    def path(self, map_key: str, walk: WalkGrid, start: Tile, goal: Tile) -> list[Tile] | None:
+        """남은 경로 전체 (start 제외) — 못 가면 None"""
+        if start == goal:
+            return []
+        full, i = self._lookup(map_key, walk, start, goal)
+        return list(full[i + 1:]) if i + 1 < len(full) else None
+
+    def invalidate(self, map_key: str) -> None:
+        """맵 reload/삭제 — 그 맵 항목만 버림"""
+        for key in [k for k in self._entries if k[0] == map_key]:
+            del self._entries[key]
@@ -0,0 +1,53 @@
+# ─────────────────────────────────────────────────────────
+#  소켓 입력 rate-limit — sid × 이벤트 종류별 토큰 버킷
+#   - 순수 in-process (Redis/DB 이전 단계에서 호출)
+#   - 버킷은 첫 이벤트 때 가득 찬 상태로 생성, disconnect 시 forget()
+# ─────────────────────────────────────────────────────────
+import time
+
+
+class TokenBucket:
+    """초당 rate 개씩 채워지고 최대 burst 개까지 쌓이는 버킷"""
+    __slots__ = ('rate', 'burst', 'tokens', 'stamp')
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+
+    def take(self, now: float) -> bool:
+        elapsed = now - self.stamp
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class SidRateLimiter:
+    """limits = {event: (초당 허용 수, 버킷 크기)}. 목록에 없는 이벤트는 항상 통과."""
+
+    def __init__(self, limits: dict[str, tuple[float, float]], clock=time.monotonic):
+        self.limits = limits
+        self.clock = clock
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def allow(self, sid: str, event: str) -> bool:
+        limit = self.limits.get(event)
+        if limit is None:
+            return True
+        now = self.clock()
+        bucket = self._buckets.get((sid, event))
+        if bucket is None:
+            bucket = self._buckets[(sid, event)] = TokenBucket(*limit, now)
+        return bucket.take(now)
+
+    def forget(self, sid: str) -> None:
+        for event in self.limits:
+            self._buckets.pop((sid, event), None)
@@ -0,0 +1,123 @@
+# ─────────────────────────────────────────────────────────
+#  접속 세션 / 몬스터 엔티티 레지스트리 — 모듈 dict 여러 개 대신 __slots__ 객체 하나
+#   - PlayerSession : join_map 에서 open, disconnect 에서 close
+#   - MonsterEntity : 넉백/리쉬 복귀 시 생성, 둘 다 끝나거나 사망 시 제거
+#   - sweep() 으로 바인딩이 사라진 세션을 주기적으로 회수 (disconnect 유실 대비)
+# ─────────────────────────────────────────────────────────
+from typing import Container
+
+
+class PlayerSession:
+    """캐릭터 한 명의 이동/전송 상태"""
+    __slots__ = ('char_id', 'sid', 'last_tile', 'last_move_sent', 'last_far_sent', 'near_npc',
+                 'move_tile', 'move_at')
+
+    def __init__(self, char_id: int, sid: str | None = None):
+        self.char_id = char_id
+        self.sid = sid
+        self.last_tile: tuple[str, int, int] | None = None   # fast-path 캐시 (map_key, tx, ty)
+        self.last_move_sent = 0.0      # world_delta 로 마지막 전송한 시각
+        self.last_far_sent = 0.0       # 시야 밖(맵 전체) 전송 시각
+        self.near_npc: int | None = None   # 마지막으로 알린 근접 NPC (npc_near)
+        self.move_tile: tuple[str, int, int] | None = None   # 마지막으로 허용한 이동 타일
+        self.move_at = 0.0
+
+
+class SessionRegistry:
+    def __init__(self):
+        self._by_char: dict[int, PlayerSession] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_char)
+
+    def __contains__(self, char_id: int) -> bool:
+        return char_id in self._by_char
+
+    def open(self, char_id: int, sid: str) -> PlayerSession:
+        """join_map — 맵이 바뀌었을 수 있으므로 타일 캐시/이동 검증 기준만 초기화"""
+        sess = self.touch(char_id)
+        sess.sid = sid
+        sess.last_tile = None
+        sess.move_tile = None
+        sess.near_npc = None
+        return sess
+
+    def get(self, char_id: int) -> PlayerSession | None:
+        return self._by_char.get(char_id)
+
+    def touch(self, char_id: int) -> PlayerSession:
+        sess = self._by_char.get(char_id)
+        if sess is None:
+            sess = self._by_char[char_id] = PlayerSession(char_id)
+        return sess
+
+    def close(self, char_id: int) -> PlayerSession | None:
+        return self._by_char.pop(char_id, None)
+
+    def sweep(self, live: Container[int]) -> int:
+        """live 에 없는 캐릭터 세션 제거, 제거 수 반환"""
+        gone = [cid for cid in self._by_char if cid not in live]
+        for cid in gone:
+            del self._by_char[cid]
+        return len(gone)
+
+
+class MonsterEntity:
+    __slots__ = ('knockback_until', 'returning')
+
+    def __init__(self, knockback_until: float = 0.0):
+        self.knockback_until = knockback_until
+        self.returning = False         # 리쉬 — 스폰 도착 전까지 어그로 없음
+
+
+class EntityRegistry:
+    """몬스터별 일시 상태 — 넉백 중이거나 스폰으로 복귀 중인 몬스터만 보관"""
+
+    def __init__(self):
+        self._by_id: dict[int, MonsterEntity] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def knock_back(self, mob_id: int, until: float) -> None:
+        ent = self._by_id.get(mob_id)
+        if ent is None:
+            self._by_id[mob_id] = MonsterEntity(until)
+        else:
+            ent.knockback_until = until
+
+    def knocked_back(self, mob_id: int, now: float) -> bool:
+        """넉백 쿨타임 중이면 True — 만료된 항목은 이때 제거"""
+        ent = self._by_id.get(mob_id)
+        if ent is None:
+            return False
+        if ent.knockback_until > now:
+            return True
+        if ent.returning:
+            ent.knockback_until = 0.0
+        else:
+            del self._by_id[mob_id]
+        return False
+
+    def start_return(self, mob_id: int) -> None:
+        ent = self._by_id.get(mob_id)
+        if ent is None:
+            ent = self._by_id[mob_id] = MonsterEntity()
+        ent.returning = True
+
+    def returning(self, mob_id: int) -> bool:
+        ent = self._by_id.get(mob_id)
+        return ent is not None and ent.returning
+
+    def end_return(self, mob_id: int) -> None:
+        ent = self._by_id.get(mob_id)
+        if ent is None:
+            return
+        if ent.knockback_until:
+            ent.returning = False
+        else:
+            del self._by_id[mob_id]
+
+    def forget(self, mob_id: int) -> None:
+        """사망/스폰 위치 복귀"""
+        self._by_id.pop(mob_id, None)
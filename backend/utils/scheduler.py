@@ -0,0 +1,118 @@
+# ─────────────────────────────────────────────────────────
+#  월드 틱 스케줄러 — 맵마다 독립된 틱 태스크(greenlet) 하나
+#   - 맵별 주기(period), 고정 간격 스케줄 (next_due += period)
+#   - 틱이 주기를 넘기면 overrun — 밀린 틱은 몰아서 돌리지 않고 건너뜀
+#   - 틱 소요시간/지연(jitter)을 맵별로 기록 → 한 맵이 느려도 다른 맵 틱은 제때
+# ─────────────────────────────────────────────────────────
+import time
+from typing import Callable, Iterable
+
+_EWMA = 0.2
+
+
+class MapTicker:
+    """맵 하나의 틱 루프 상태 + 통계 (ms)"""
+    __slots__ = ('map_key', 'period', 'fn', 'running',
+                 'ticks', 'overruns', 'last_ms', 'avg_ms', 'max_ms', 'jitter_ms', 'max_jitter_ms')
+
+    def __init__(self, map_key: str, period: float, fn: Callable[[str], None]):
+        self.map_key = map_key
+        self.period = period
+        self.fn = fn
+        self.running = True
+        self.ticks = 0
+        self.overruns = 0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        self.jitter_ms = 0.0           # 예정 시각 대비 실제 시작 지연 (EWMA)
+        self.max_jitter_ms = 0.0
+
+    def record(self, late_s: float, took_s: float) -> None:
+        late, took = late_s * 1000, took_s * 1000
+        self.ticks += 1
+        self.last_ms = took
+        self.avg_ms = took if self.ticks == 1 else self.avg_ms + _EWMA * (took - self.avg_ms)
+        self.max_ms = max(self.max_ms, took)
+        self.jitter_ms = late if self.ticks == 1 else self.jitter_ms + _EWMA * (late - self.jitter_ms)
+        self.max_jitter_ms = max(self.max_jitter_ms, late)
+        if took_s > self.period:
+            self.overruns += 1
+
+    def stats(self) -> dict:
+        return {
+            'period_ms': round(self.period * 1000), 'ticks': self.ticks, 'overruns': self.overruns,
+            'last_ms': round(self.last_ms, 1), 'avg_ms': round(self.avg_ms, 1),
+            'max_ms': round(self.max_ms, 1),
+            'jitter_ms': round(self.jitter_ms, 1), 'max_jitter_ms': round(self.max_jitter_ms, 1),
+        }
+
+
+class WorldScheduler:
+    """spawn/sleep 은 socketio.start_background_task / socketio.sleep (테스트는 가짜 시계)"""
+
+    def __init__(self, spawn: Callable, sleep: Callable[[float], None],
+                 clock: Callable[[], float] = time.monotonic):
+        self.spawn = spawn
+        self.sleep = sleep
+        self.clock = clock
+        self.on_error: Callable[[str, BaseException], None] | None = None
+        self._tickers: dict[str, MapTicker] = {}
+
+    def __len__(self) -> int:
+        return len(self._tickers)
+
+    def __contains__(self, map_key: str) -> bool:
+        return map_key in self._tickers
+
+    def add(self, map_key: str, period: float, fn: Callable[[str], None]) -> MapTicker:
+        """이미 돌고 있으면 주기만 바꿈"""
+        t = self._tickers.get(map_key)
+        if t is not None:
+            t.period = period
+            return t
+        t = self._tickers[map_key] = MapTicker(map_key, period, fn)
+        self.spawn(self._run, t)
+        return t
+
+    def remove(self, map_key: str) -> None:
+        t = self._tickers.pop(map_key, None)
+        if t is not None:
+            t.running = False              # 루프는 다음 깨어날 때 종료
+
+    def sync(self, map_keys: Iterable[str], period_of: Callable[[str], float],
+             fn: Callable[[str], None]) -> None:
+        """몬스터가 있는 맵 목록에 맞춰 틱 태스크 추가/정리"""
+        wanted = set(map_keys)
+        for key in list(self._tickers):
+            if key not in wanted:
+                self.remove(key)
+        for key in sorted(wanted):
+            self.add(key, period_of(key), fn)
+
+    def run_once(self, t: MapTicker, due: float) -> float:
+        """틱 한 번 실행 후 다음 예정 시각 반환"""
+        start = self.clock()
+        try:
+            t.fn(t.map_key)
+        except Exception as e:             # 틱 함수가 삼키지 못한 예외 — 루프는 계속
+            if self.on_error is not None:
+                self.on_error(t.map_key, e)
+        end = self.clock()
+        t.record(max(start - due, 0.0), end - start)
+        nxt = due + t.period
+        if end > nxt:
+            nxt = end + t.period           # 밀린 틱은 건너뜀 (몰아서 실행 안 함)
+        return nxt
+
+    def _run(self, t: MapTicker) -> None:
+        due = self.clock() + t.period
+        while t.running:
+            delay = due - self.clock()
+            self.sleep(delay if delay > 0 else 0)
+            if not t.running:
+                break
+            due = self.run_once(t, due)
+
+    def stats(self) -> dict[str, dict]:
+        return {k: t.stats() for k, t in sorted(self._tickers.items())}
@@ -0,0 +1,30 @@
+# ─────────────────────────────────────────────────────────
+#  소켓 인증 토큰 — /auth/login 에서 발급, connect/join_map 에서 검증
+#   itsdangerous 서명 (SECRET_KEY + salt), user_id 만 담는다
+# ─────────────────────────────────────────────────────────
+import os
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+TOKEN_SALT = 'socket-auth'
+TOKEN_MAX_AGE = int(os.environ.get('SOCKET_TOKEN_MAX_AGE', 12 * 3600))   # 초
+
+
+def _serializer() -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=TOKEN_SALT)
+
+
+def issue_token(user_id: int) -> str:
+    return _serializer().dumps({'uid': user_id})
+
+
+def verify_token(token, max_age: int = TOKEN_MAX_AGE) -> int | None:
+    """유효하면 user_id, 아니면(위조/만료/형식 오류) None"""
+    if not token or not isinstance(token, str):
+        return None
+    try:
+        data = _serializer().loads(token, max_age=max_age)
+    except BadSignature:                 # SignatureExpired 포함
+        return None
+    uid = data.get('uid') if isinstance(data, dict) else None
+    return uid if isinstance(uid, int) else None
@@ -0,0 +1,77 @@
+# ─────────────────────────────────────────────────────────
+#  타일 좌표 기반 균일 격자(spatial hash)
+#   - 엔티티(key) 하나당 (map_key, cx, cy) 셀 하나
+#   - 셀 크기는 타일 단위 (cell_tiles × cell_tiles 타일 = 1셀)
+# ─────────────────────────────────────────────────────────
+Cell = tuple[str, int, int]      # (map_key, cx, cy)
+
+
+class SpatialHash:
+    """key → 셀, 셀 → key 집합 을 함께 유지하는 균일 격자"""
+
+    def __init__(self, cell_tiles: int):
+        self.cell_tiles = cell_tiles
+        self._cell_of: dict[int, Cell] = {}
+        self._buckets: dict[Cell, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def cell_for(self, map_key: str, tx: int, ty: int) -> Cell:
+        return (map_key, tx // self.cell_tiles, ty // self.cell_tiles)
+
+    def cell_of(self, key: int) -> Cell | None:
+        return self._cell_of.get(key)
+
+    def update(self, key: int, map_key: str, tx: int, ty: int) -> Cell | None:
+        """key 를 (tx, ty) 타일이 속한 셀로 옮김.
+        셀이 바뀌었으면 이전 셀(처음이면 None)을, 그대로면 새 셀과 같은 값을 반환"""
+        new = self.cell_for(map_key, tx, ty)
+        old = self._cell_of.get(key)
+        if old == new:
+            return old
+        if old is not None:
+            self._discard(key, old)
+        self._cell_of[key] = new
+        self._buckets.setdefault(new, set()).add(key)
+        return old
+
+    def remove(self, key: int) -> Cell | None:
+        old = self._cell_of.pop(key, None)
+        if old is not None:
+            self._discard(key, old)
+        return old
+
+    def _discard(self, key: int, cell: Cell) -> None:
+        bucket = self._buckets.get(cell)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[cell]     # 빈 셀은 바로 정리 (메모리 bound)
+
+    def occupied(self, cell: Cell) -> bool:
+        return cell in self._buckets
+
+    def cells_around(self, cell: Cell, radius: int) -> list[Cell]:
+        """cell 을 중심으로 (2r+1)² 셀 목록 (비어 있는 셀 포함)"""
+        map_key, cx, cy = cell
+        return [
+            (map_key, cx + dx, cy + dy)
+            for dy in range(-radius, radius + 1)
+            for dx in range(-radius, radius + 1)
+        ]
+
+    def query_cells(self, cell: Cell, radius: int):
+        """cell 주변 (2r+1)² 셀에 들어 있는 key 들을 순회"""
+        for c in self.cells_around(cell, radius):
+            bucket = self._buckets.get(c)
+            if bucket:
+                yield from bucket
+
+    def query_tiles(self, map_key: str, tx: int, ty: int, radius_tiles: int):
+        """(tx, ty) 에서 radius_tiles 타일 안쪽 셀들의 key (거리 필터는 호출자 몫)"""
+        r = -(-radius_tiles // self.cell_tiles)          # ceil
+        yield from self.query_cells(self.cell_for(map_key, tx, ty), r)
+
+    def occupied_cells(self) -> int:
+        return len(self._buckets)
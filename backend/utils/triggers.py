@@ -0,0 +1,88 @@
+# ─────────────────────────────────────────────────────────
+#  맵별 타일 트리거 테이블 — (tx, ty) → 트리거 튜플
+#   - 맵 최초 사용 시 Map.map_data(JSON) / NPC / 타일 레이어로 한 번만 컴파일
+#   - handle_move 는 타일이 바뀔 때 dict 조회 한 번으로 끝 (JSON 파싱·DB 없음)
+#   - 몬스터는 움직이므로 여기 넣지 않고 app._monster_tiles_by_map 을 쓴다
+# ─────────────────────────────────────────────────────────
+import json
+from typing import NamedTuple
+
+from flask import current_app
+
+TELEPORT = 'teleport'
+NPC_NEAR = 'npc'
+INVALID  = 'invalid'     # 몬스터 금단 타일(gid 15) — 플레이어는 통과, 전투 없음
+
+
+class Trigger(NamedTuple):
+    kind: str
+    to_map: str | None = None      # teleport
+    to_x: int = 0                  # teleport 도착 타일
+    to_y: int = 0
+    npc_id: int | None = None      # npc
+
+
+_EMPTY: tuple[Trigger, ...] = ()
+
+
+class TriggerTable:
+    """한 맵의 컴파일된 트리거. at() 은 트리거가 없으면 빈 튜플."""
+    __slots__ = ('map_key', 'tiles')
+
+    def __init__(self, map_key: str, tiles: dict[tuple[int, int], tuple[Trigger, ...]]):
+        self.map_key = map_key
+        self.tiles = tiles
+
+    def __len__(self) -> int:
+        return len(self.tiles)
+
+    def at(self, tx: int, ty: int) -> tuple[Trigger, ...]:
+        return self.tiles.get((tx, ty), _EMPTY)
+
+
+def _teleport_tiles(src: dict):
+    """map_data.teleports[].from — {"x","y"} 또는 {"y","xRange":[a,b]}"""
+    if 'x' in src:
+        yield int(src['x']), int(src['y'])
+    elif 'xRange' in src:
+        lo, hi = src['xRange']
+        for x in range(int(lo), int(hi) + 1):
+            yield x, int(src['y'])
+
+
+def compile_triggers(map_key: str, map_data, npcs=(), invalid_tiles=(),
+                     npc_radius: int = 0) -> TriggerTable:
+    """map_data: Map.map_data (JSON 문자열 또는 dict), npcs: NPC 행 목록,
+    invalid_tiles: 몬스터 금단 타일 (tx, ty) 목록"""
+    if isinstance(map_data, str):
+        map_data = json.loads(map_data or '{}')
+    tiles: dict[tuple[int, int], list[Trigger]] = {}
+
+    for tile in invalid_tiles:
+        tiles.setdefault(tuple(tile), []).append(Trigger(INVALID))
+
+    for tp in (map_data or {}).get('teleports', []):
+        to_x, to_y = tp['to_position']
+        trig = Trigger(TELEPORT, to_map=tp['to_map'], to_x=int(to_x), to_y=int(to_y))
+        for tile in _teleport_tiles(tp['from']):
+            tiles.setdefault(tile, []).append(trig)
+
+    for npc in npcs:
+        if not npc.is_active:
+            continue
+        trig = Trigger(NPC_NEAR, npc_id=npc.id)
+        for dy in range(-npc_radius, npc_radius + 1):
+            for dx in range(-npc_radius, npc_radius + 1):
+                tiles.setdefault((npc.x + dx, npc.y + dy), []).append(trig)
+
+    return TriggerTable(map_key, {k: tuple(v) for k, v in tiles.items()})
+
+
+# ─────────────────────────────────────────────────────────
+#  REST 블루프린트용 — 맵/NPC 가 바뀌면 다음 사용 때 다시 컴파일
+# ─────────────────────────────────────────────────────────
+def invalidate_live(*map_keys: str) -> None:
+    tables = current_app.extensions.get('trigger_tables')
+    if tables is not None:
+        for key in map_keys:
+            tables.pop(key, None)
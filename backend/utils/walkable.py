@@ -1,15 +1,21 @@
-import json, pathlib
-import types
-from functools import lru_cache
+import pathlib
+from array import array
 
 ROOT = pathlib.Path(__file__).resolve().parent.parent   # app.py 기준 프로젝트 루트
 
-@lru_cache                             # 서버 기동-1회만 파싱
-def get_walkable(map_key: str) -> set[tuple[int,int]]:
-    """Tiled JSON → (x, y) 타일 좌표 중 통과 가능한 것만 set 로 돌려준다."""
-    path = ROOT / f"{map_key}.json"
-    data = json.loads(path.read_text(encoding="utf-8"))
+# WalkGrid 셀 1바이트 = 통과 비트 + 4방향 이웃 통과 비트 (로드 시 미리 계산)
+WALK = 0x01
+N, E, S, W = 0x02, 0x04, 0x08, 0x10
+_DIRS = ((N, 0, -1), (E, 1, 0), (S, 0, 1), (W, -1, 0))
 
+# 셀 바이트(5비트) → 이동 가능한 (dx, dy) 튜플 — neighbors() 는 바이트 하나 + 표 조회
+_STEPS: tuple[tuple[tuple[int, int], ...], ...] = tuple(
+    tuple((dx, dy) for bit, dx, dy in _DIRS if mask & bit) for mask in range(32)
+)
+
+
+def parse_tiled(data: dict) -> tuple[int, int, list[int], set[int]]:
+    """Tiled JSON → (width, height, 첫 타일 레이어 gid 목록, 충돌 gid 집합)"""
     # 1) 충돌 타일 gid 수집
     collidable = set()
     for ts in data["tilesets"]:
@@ -21,51 +27,118 @@ def get_walkable(map_key: str) -> set[tuple[int,int]]:
 
     # 2) 첫 번째 타일 레이어만 사용 (Tile Layer 1)
     layer = next(l for l in data["layers"] if l["type"] == "tilelayer")
-    w = layer["width"]
-    walkable = set()
-    for idx, gid in enumerate(layer["data"]):
-        x, y = idx % w, idx // w
-        if gid == 0 or gid not in collidable:      # gid 0=빈칸, 또는 collides False
-            walkable.add((x, y))
-    return walkable
+    return layer["width"], layer["height"], layer["data"], collidable
 
 
 # ─────────────────────────────────────────────────────────
-#  Tiled JSON 전체를 읽어서 layer.data[y][x] 식으로 접근
+#  통과 가능 타일 격자 — set[(x, y)] 대신 bytearray (타일당 1바이트)
 # ─────────────────────────────────────────────────────────
-class _SimpleLayer:
-    """Phaser-style layer 최소 구현 (id, data, get_tile_at)"""
-    def __init__(self, width:int, height:int, flat:list[int]):
-        self.width  = width
+class WalkGrid:
+    """(x, y) in grid / is_walkable / neighbors 모두 O(1), 범위 밖은 통과 불가"""
+    __slots__ = ('width', 'height', 'cells', '_count')
+
+    def __init__(self, width: int, height: int, walkable_flags):
+        self.width = width
         self.height = height
-        # 2 차원 list [y][x]  (gid 값, 0 == empty)
-        self.data: list[list[int]] = [
-            flat[y*width:(y+1)*width] for y in range(height)
-        ]
+        cells = bytearray(WALK if f else 0 for f in walkable_flags)
+        if len(cells) != width * height:
+            raise ValueError(f"WalkGrid: {len(cells)} cells for {width}x{height}")
+        # 이웃 비트 미리 채우기
+        for i, c in enumerate(cells):
+            if not c:
+                continue
+            x, y = i % width, i // width
+            for bit, dx, dy in _DIRS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and cells[ny * width + nx] & WALK:
+                    cells[i] |= bit
+        self.cells = cells
+        self._count = sum(1 for c in cells if c & WALK)
 
-    def get_tile_at(self, x:int, y:int):
-        if 0 <= x < self.width and 0 <= y < self.height:
-            gid = self.data[y][x]
-            return _SimpleTile(gid) if gid else None
-        return None
+    @classmethod
+    def from_cells(cls, width: int, height: int, cells, count: int) -> 'WalkGrid':
+        """이미 이웃 비트까지 계산된 셀 버퍼(.mapbin mmap 등)를 복사 없이 감쌈"""
+        if len(cells) != width * height:
+            raise ValueError(f"WalkGrid: {len(cells)} cells for {width}x{height}")
+        grid = cls.__new__(cls)
+        grid.width, grid.height = width, height
+        grid.cells = cells
+        grid._count = count
+        return grid
+
+    @classmethod
+    def from_tiles(cls, width: int, height: int, tiles) -> 'WalkGrid':
+        """(x, y) 목록으로 생성 — 테스트/벤치용"""
+        flags = bytearray(width * height)
+        for x, y in tiles:
+            flags[y * width + x] = 1
+        return cls(width, height, flags)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, tile) -> bool:
+        x, y = tile
+        return self.is_walkable(x, y)
+
+    def __iter__(self):
+        w = self.width
+        for i, c in enumerate(self.cells):
+            if c & WALK:
+                yield i % w, i // w
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        return (0 <= x < self.width and 0 <= y < self.height
+                and bool(self.cells[y * self.width + x] & WALK))
+
+    def neighbors(self, x: int, y: int) -> list[tuple[int, int]]:
+        """4방향 중 통과 가능한 이웃 (N, E, S, W 순)"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return []
+        return [(x + dx, y + dy) for dx, dy in _STEPS[self.cells[y * self.width + x]]]
 
+    @property
+    def nbytes(self) -> int:
+        return len(self.cells)
 
-class _SimpleTile:
-    """Phaser Tile 객체와 호환되는 최소 속성(index)만 제공"""
-    def __init__(self, gid:int):
-        self.index = gid
 
+def get_walkable(map_key: str) -> WalkGrid:
+    """통과 가능 격자. gid 0=빈칸, 또는 collides False 면 통과
+    (utils.mapregistry 가 .mapbin mmap 을 캐시 — 관리자 수정 시 교체)"""
+    from utils.mapregistry import maps
+    return maps.get(map_key).walk
+
+
+# ─────────────────────────────────────────────────────────
+#  타일 레이어 gid — 중첩 list 대신 평탄한 array('I') (Tiled 뒤집기 플래그 비트까지 수용)
+# ─────────────────────────────────────────────────────────
+class TileLayer:
+    """layer.gid(x, y) 로 접근 (범위 밖은 0 = 빈칸)"""
+    __slots__ = ('width', 'height', 'gids')
+
+    def __init__(self, width: int, height: int, flat):
+        self.width = width
+        self.height = height
+        self.gids = array('I', flat)
+
+    @classmethod
+    def from_gids(cls, width: int, height: int, gids) -> 'TileLayer':
+        """u32 버퍼(array / memoryview.cast('I'))를 복사 없이 감쌈"""
+        layer = cls.__new__(cls)
+        layer.width, layer.height = width, height
+        layer.gids = gids
+        return layer
+
+    def gid(self, x: int, y: int) -> int:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.gids[y * self.width + x]
+        return 0
 
-@lru_cache
-def get_tilemap(map_key:str):
-    """Tiled JSON → (전체 json, 2차원 타일배열) 반환"""
-    path  = ROOT / f"{map_key}.json"
-    data  = json.loads(path.read_text(encoding="utf-8"))
+    def tiles_with(self, gid: int) -> list[tuple[int, int]]:
+        w = self.width
+        return [(i % w, i // w) for i, g in enumerate(self.gids) if g == gid]
 
-    layer = next(l for l in data["layers"] if l["type"]=="tilelayer")
-    w, h  = layer["width"], layer["height"]
-    grid  = [layer["data"][i*w:(i+1)*w] for i in range(h)]  # 2-D 리스트
 
-    # grid 를 .data 로 접근할 수 있게 네임스페이스 래핑
-    layer_ns = types.SimpleNamespace(width=w, height=h, data=grid)
-    return data, layer_ns
\ No newline at end of file
+def get_tile_layer(map_key: str) -> TileLayer:
+    from utils.mapregistry import maps
+    return maps.get(map_key).layer
@@ -0,0 +1,154 @@
+# ─────────────────────────────────────────────────────────
+#  world_delta 바이너리 인코딩 (join_map 의 wire 로 협상, JSON 이 기본)
+#
+#  bin1 레이아웃 (little-endian, 모든 엔티티는 u16 핸들)
+#    <BB  version, len(map_key)   + map_key(utf-8)
+#    <5H  players, monsters, monster_hits, player_hits, despawns 개수
+#    players      <3H  handle, px, py          (픽셀, 정수 반올림)
+#    monsters     <3H  handle, tx, ty          (타일)
+#    monster_hits <6H  handle, attacker, dmg, hp, tx, ty
+#    player_hits  <3H  handle, dmg, hp
+#    despawns     <H   handle
+# ─────────────────────────────────────────────────────────
+import struct
+
+WIRE_JSON = 'json'
+WIRE_BIN  = 'bin1'
+WIRE_CODECS = (WIRE_JSON, WIRE_BIN)
+
+BIN_VERSION = 1
+U16_MAX = 0xFFFF
+
+_HEAD   = struct.Struct('<BB')
+_COUNTS = struct.Struct('<5H')
+_MOVE   = struct.Struct('<3H')
+_MHIT   = struct.Struct('<6H')
+_DESP   = struct.Struct('<H')
+
+
+class WireError(ValueError):
+    """바이너리로 표현할 수 없는 패킷 (핸들 고갈/범위 초과) → JSON 으로 대체"""
+
+
+def negotiate(requested) -> str:
+    return requested if requested in WIRE_CODECS else WIRE_JSON
+
+
+class HandleTable:
+    """엔티티 id ↔ u16 핸들. 1 부터 배정, 0 은 '없음'."""
+
+    def __init__(self, limit: int = U16_MAX):
+        self.limit = limit
+        self._handle_of: dict[int, int] = {}
+        self._key_of: dict[int, int] = {}
+        self._free: list[int] = []
+        self._next = 1
+
+    def __len__(self) -> int:
+        return len(self._handle_of)
+
+    def get(self, key: int) -> int | None:
+        return self._handle_of.get(key)
+
+    def key_of(self, handle: int) -> int | None:
+        return self._key_of.get(handle)
+
+    def handle(self, key: int) -> int | None:
+        """없으면 새로 배정. 다 쓰면 None"""
+        h = self._handle_of.get(key)
+        if h is not None:
+            return h
+        if self._free:
+            h = self._free.pop()
+        elif self._next <= self.limit:
+            h = self._next
+            self._next += 1
+        else:
+            return None
+        self._handle_of[key] = h
+        self._key_of[h] = key
+        return h
+
+    def release(self, key: int) -> None:
+        h = self._handle_of.pop(key, None)
+        if h is not None:
+            del self._key_of[h]
+            self._free.append(h)
+
+
+def _u16(value) -> int:
+    v = int(round(value))
+    if not 0 <= v <= U16_MAX:
+        raise WireError(f"u16 범위 초과: {value}")
+    return v
+
+
+def _h(table: HandleTable, key: int) -> int:
+    h = table.handle(key)
+    if h is None:
+        raise WireError("핸들 고갈")
+    return h
+
+
+def encode_world_delta(payload: dict, players: HandleTable, monsters: HandleTable) -> bytes:
+    """flush_world_deltas 의 JSON payload 를 bin1 바이트로"""
+    map_b = payload['map_key'].encode('utf-8')
+    pm = payload.get('players', ())
+    mm = payload.get('monsters', ())
+    mh = payload.get('monster_hits', ())
+    ph = payload.get('player_hits', ())
+    ds = payload.get('despawns', ())
+
+    out = bytearray(_HEAD.pack(BIN_VERSION, len(map_b)))
+    out += map_b
+    out += _COUNTS.pack(len(pm), len(mm), len(mh), len(ph), len(ds))
+    for cid, x, y in pm:
+        out += _MOVE.pack(_h(players, cid), _u16(max(x, 0)), _u16(max(y, 0)))
+    for mid, x, y in mm:
+        out += _MOVE.pack(_h(monsters, mid), _u16(x), _u16(y))
+    for hit in mh:
+        out += _MHIT.pack(_h(monsters, hit['id']), _h(players, hit['attacker_id']),
+                          _u16(hit['dmg']), _u16(max(hit['hp'], 0)),
+                          _u16(hit['x']), _u16(hit['y']))
+    for hit in ph:
+        out += _MOVE.pack(_h(players, hit['id']), _u16(hit['dmg']), _u16(max(hit['hp'], 0)))
+    for mid in ds:
+        out += _DESP.pack(_h(monsters, mid))
+    return bytes(out)
+
+
+def decode_world_delta(buf: bytes, players: HandleTable, monsters: HandleTable) -> dict:
+    """bin1 → JSON payload 모양 (테스트/벤치용, 클라이언트는 utils/worldDelta.ts)"""
+    version, n = _HEAD.unpack_from(buf, 0)
+    if version != BIN_VERSION:
+        raise WireError(f"지원하지 않는 버전: {version}")
+    off = _HEAD.size
+    payload: dict = {'map_key': buf[off:off + n].decode('utf-8')}
+    off += n
+    npm, nmm, nmh, nph, nds = _COUNTS.unpack_from(buf, off)
+    off += _COUNTS.size
+
+    pid, mid = players.key_of, monsters.key_of
+    if npm:
+        rows = _MOVE.iter_unpack(buf[off:off + npm * _MOVE.size])
+        payload['players'] = [[pid(h), x, y] for h, x, y in rows]
+        off += npm * _MOVE.size
+    if nmm:
+        rows = _MOVE.iter_unpack(buf[off:off + nmm * _MOVE.size])
+        payload['monsters'] = [[mid(h), x, y] for h, x, y in rows]
+        off += nmm * _MOVE.size
+    if nmh:
+        rows = _MHIT.iter_unpack(buf[off:off + nmh * _MHIT.size])
+        payload['monster_hits'] = [
+            {'id': mid(h), 'attacker_id': pid(a), 'dmg': d, 'hp': hp, 'x': x, 'y': y}
+            for h, a, d, hp, x, y in rows
+        ]
+        off += nmh * _MHIT.size
+    if nph:
+        rows = _MOVE.iter_unpack(buf[off:off + nph * _MOVE.size])
+        payload['player_hits'] = [{'id': pid(h), 'dmg': d, 'hp': hp} for h, d, hp in rows]
+        off += nph * _MOVE.size
+    if nds:
+        rows = _DESP.iter_unpack(buf[off:off + nds * _DESP.size])
+        payload['despawns'] = [mid(h) for (h,) in rows]
+    return payload
@@ -0,0 +1,87 @@
+# ─────────────────────────────────────────────────────────
+#  맵별 world_delta 누적 버퍼
+#   - 한 tick 동안 쌓인 이동/피격/디스폰을 맵(room)당 패킷 하나로 묶는다
+#   - 같은 엔티티의 이동은 마지막 좌표만 남긴다 (latest-wins)
+# ─────────────────────────────────────────────────────────
+
+
+class MapDelta:
+    """맵 하나의 tick 누적분"""
+    __slots__ = ('players', 'monsters', 'monster_hits', 'player_hits', 'despawns')
+
+    def __init__(self):
+        self.players: dict[int, tuple[float, float]] = {}    # char_id → (px, py)
+        self.monsters: dict[int, tuple[int, int]] = {}       # mob_id → (tx, ty)
+        self.monster_hits: list[dict] = []
+        self.player_hits: list[dict] = []
+        self.despawns: list[int] = []
+
+    def is_empty(self) -> bool:
+        return not (self.players or self.monsters or self.monster_hits
+                    or self.player_hits or self.despawns)
+
+    def map_payload(self, map_key: str) -> dict:
+        """맵 전체 room 에 나갈 부분 (플레이어 이동 제외 — AOI 로 따로 보냄).
+        빈 항목은 키째 생략한다."""
+        payload: dict = {'map_key': map_key}
+        if self.monster_hits:
+            payload['monster_hits'] = self.monster_hits
+        if self.monsters:
+            payload['monsters'] = [[mid, x, y] for mid, (x, y) in self.monsters.items()]
+        if self.despawns:
+            payload['despawns'] = self.despawns
+        if self.player_hits:
+            payload['player_hits'] = self.player_hits
+        return payload
+
+
+class WorldDeltaBuffer:
+    """map_key → MapDelta. 소켓 핸들러/AI 는 기록만, tick 루프가 take() 로 비운다."""
+
+    def __init__(self):
+        self._maps: dict[str, MapDelta] = {}
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def _delta(self, map_key: str) -> MapDelta:
+        delta = self._maps.get(map_key)
+        if delta is None:
+            delta = self._maps[map_key] = MapDelta()
+        return delta
+
+    def player_move(self, map_key: str, char_id: int, px, py) -> None:
+        self._delta(map_key).players[char_id] = (px, py)
+
+    def drop_player(self, map_key: str, char_id: int) -> None:
+        """퇴장/맵 이동 시 아직 안 나간 이동 제거"""
+        delta = self._maps.get(map_key)
+        if delta is not None:
+            delta.players.pop(char_id, None)
+
+    def monster_move(self, map_key: str, mob_id: int, tx: int, ty: int) -> None:
+        self._delta(map_key).monsters[mob_id] = (tx, ty)
+
+    def monster_hit(self, map_key: str, hit: dict) -> None:
+        delta = self._delta(map_key)
+        # 피격 패킷이 넉백 후 최신 좌표를 담고 있으므로 이전 이동은 버림
+        delta.monsters.pop(hit['id'], None)
+        delta.monster_hits.append(hit)
+
+    def monster_despawn(self, map_key: str, mob_id: int) -> None:
+        delta = self._delta(map_key)
+        delta.monsters.pop(mob_id, None)
+        delta.despawns.append(mob_id)
+
+    def player_hit(self, map_key: str, hit: dict) -> None:
+        self._delta(map_key).player_hits.append(hit)
+
+    def map_keys(self) -> list[str]:
+        return list(self._maps)
+
+    def take(self, map_key: str) -> MapDelta | None:
+        """해당 맵 누적분을 떼어 냄 (비어 있으면 None)"""
+        delta = self._maps.pop(map_key, None)
+        if delta is None or delta.is_empty():
+            return None
+        return delta
@@ -4,6 +4,11 @@ import { fetchNpcs, NpcDTO } from './utils/npc'
 import { io, Socket } from 'socket.io-client';
 import { CharacterDTO } from './utils/character'
 import { playHitSfx, playPlayerHitSfx, playKillSfx } from './utils/sfx'
+import {
+  applyWorldDelta, decodeWorldDelta, HandleMaps, WorldDelta,
+  MonsterHitDTO, PlayerHitDTO, WIRE_BIN,
+} from './utils/worldDelta'
+import { VelocitySender, inputVelocity } from './utils/movement'
 
 type MapKey = 'worldmap' | 'city2' | 'dungeon1'
 const TALK_DIST   = 48   // 대화 시작
@@ -61,6 +66,7 @@ export class MyScene extends Phaser.Scene {
 
   private bgm?: Phaser.Sound.BaseSound
   private interactingNpcId = 0   // 중복 대화 방지
+  private nearNpcId = 0          // 서버 npc_near — 0 이면 근처 NPC 없음 (거리 계산 생략)
   private closeDialogNpc = false
 
   private isChangingMap = false;         // ★ 전환 중 플래그
@@ -71,10 +77,14 @@ export class MyScene extends Phaser.Scene {
   private isAttacking = false;        // 공격 애니메이션 재생 중 플래그
   private attackTimer?: Phaser.Time.TimerEvent;  // 공격 타이머 (중복 방지)
   private monsterSyncTimer?: Phaser.Time.TimerEvent;  // 주기적 몬스터 동기화
+  private handles: HandleMaps = { players: new Map(), monsters: new Map() };  // bin1 핸들 → id
+  private moveSeq = 0;                // move 순번 — 서버가 역순/중복 이동을 버림
+  private velSender = new VelocitySender();   // move_vel 전송 시점 (속도 변화 + 키프레임)
 
   upsertMonster = (m:any)=>{
     // 현재 맵과 다른 맵의 몬스터는 무시
     if(m.map_key && m.map_key !== this.currentMap) return;
+    if(m.h) this.handles.monsters.set(m.h, m.id);
     if(!this.mapReady){          // 아직 맵 세팅 중이면
       this.monsterQueue.push(m); //  → 큐에 적재
       return;
@@ -168,7 +178,10 @@ export class MyScene extends Phaser.Scene {
 
     /* ── ① socket 연결 ── */
     const socketUrl = import.meta.env.VITE_API_BASE_URL || ''
-    this.socket = io(socketUrl || undefined);  // 빈 문자열이면 undefined로 현재 origin 사용
+    // 빈 문자열이면 undefined로 현재 origin 사용 / auth 는 재연결 때도 다시 전송됨
+    this.socket = io(socketUrl || undefined, {
+      auth: { token: sessionStorage.getItem('socket_token') ?? '' },
+    });
 
     /* socket 연결 직후 – 디버그용 콘솔 */
 
@@ -196,6 +209,7 @@ export class MyScene extends Phaser.Scene {
         this.socket.emit('join_map', {
           character_id: this.meId,
           map_key: this.currentMap,
+          wire: WIRE_BIN,
         });
       }
     })
@@ -217,11 +231,11 @@ export class MyScene extends Phaser.Scene {
       if (c.id !== myCharId) this.spawnOrUpdateActor(c);
     });
 
-    /* 이동 업데이트 */
-    this.socket.on('player_move', (p:{id:number,x:number,y:number}) => {
+    /* 이동 업데이트 (world_delta 로 수신) */
+    const onPlayerMove = (p:{id:number,x:number,y:number}) => {
       const cont = this.actors.get(p.id);
       if (cont) cont.setPosition(p.x, p.y);
-    });
+    };
 
     /* 퇴장 */
     this.socket.on('player_despawn', ({ id }) => {
@@ -247,7 +261,7 @@ export class MyScene extends Phaser.Scene {
       filtered.forEach(this.upsertMonster);
     });
     this.socket.on('monster_spawn',    this.upsertMonster); // ← 수정!
-    this.socket.on('monster_move', p => {
+    const onMonsterMove = (p:{id:number,x:number,y:number}) => {
       if (!this.mapReady) return            // 맵 전환 중엔 무시
       const cont = this.monsters.get(p.id)
       if (!cont || !this.tilemap) return
@@ -266,8 +280,8 @@ export class MyScene extends Phaser.Scene {
         duration: 130,            // 8 프레임 @60 FPS
         ease: 'Linear'
       })
-    })
-    this.socket.on('monster_despawn', ({id}) => {
+    }
+    const onMonsterDespawn = ({ id }: { id: number }) => {
       const cont = this.monsters.get(id);
       if (cont) {
         // 활성 트윈 정리 후 파괴 — 리스폰 시 잔여 트윈 간섭 방지
@@ -278,10 +292,10 @@ export class MyScene extends Phaser.Scene {
       }
       this.monsters.delete(id);
       delete this.monstersMeta[id];
-    })
+    }
 
     /* --- 소켓 이벤트 추가 --- */
-    this.socket.on('monster_hit', (info)=>{
+    const onMonsterHit = (info: MonsterHitDTO)=>{
       const cont = this.monsters.get(info.id);
       if (!cont || !this.tilemap) return;
 
@@ -352,10 +366,10 @@ export class MyScene extends Phaser.Scene {
           {x:dstX,y:dstY,duration:120,ease:'Quad.easeIn'}
         ]
       });
-    });
+    };
 
     /* ────────── NEW: 몬스터→플레이어 전투 이벤트 ────────── */
-    this.socket.on('player_hit', (p:{id:number,dmg:number,hp:number})=>{
+    const onPlayerHit = (p: PlayerHitDTO)=>{
       if (p.id !== this.meId) return;
 
       // 장난감용 콘솔
@@ -404,6 +418,45 @@ export class MyScene extends Phaser.Scene {
       ).setOrigin(0.5).setDepth(10);
       this.tweens.add({targets:pDmgText, y:pDmgText.y-PLAYER_DMG_FLOAT, alpha:0,
         duration:PLAYER_DMG_FLOAT_DUR, ease:'Cubic.easeOut', onComplete:()=>pDmgText.destroy()});
+    };
+
+    /* 서버 tick 묶음: 이동/피격/디스폰을 한 패킷으로 */
+    this.socket.on('auth_error', (e: { reason: string }) =>
+      console.error('[socket] auth_error', e.reason))
+
+    /* join_map 의 wire 협상 결과 — 내 핸들 등록 */
+    this.socket.on('wire_ack', (a: { wire: string; h: number }) => {
+      this.handles.players.set(a.h, this.meId);
+    });
+
+    /* 서버 외삽이 벽에 닿음 → 실제 좌표 키프레임 즉시 전송 */
+    this.socket.on('move_resync', () => this.velSender.force());
+
+    /* 서버 트리거 테이블이 확정한 포탈 — 로컬 포탈 체크가 이미 전환 중이면 무시 */
+    /* 서버 타일 트리거 — NPC 반경에 들어오거나 나갈 때만 */
+    this.socket.on('npc_near', (n: { npc_id: number | null }) => {
+      this.nearNpcId = n.npc_id ?? 0
+      if (!this.nearNpcId && this.closeDialogNpc) {
+        this.interactingNpcId = 0                  // 반경 밖 = RESET_DIST 밖 → 다시 대화 가능
+        this.closeDialogNpc = false
+      }
+    });
+
+    this.socket.on('teleport', (t: { map_key: string; x: number; y: number }) => {
+      if (this.isChangingMap || t.map_key === this.currentMap) return
+      this.loadMap(t.map_key as MapKey, t.x, t.y)
+    });
+
+    this.socket.on('world_delta', (raw: WorldDelta | ArrayBuffer) => {
+      const d = raw instanceof ArrayBuffer ? decodeWorldDelta(raw, this.handles) : raw
+      if (d.map_key !== this.currentMap) return   // 맵 전환 직후 이전 맵 패킷 무시
+      applyWorldDelta(d, {
+        playerMove: onPlayerMove,
+        monsterMove: onMonsterMove,
+        monsterHit: onMonsterHit,
+        monsterDespawn: onMonsterDespawn,
+        playerHit: onPlayerHit,
+      })
     });
 
     this.socket.on('player_respawn', (r:{
@@ -580,6 +633,7 @@ export class MyScene extends Phaser.Scene {
 
   /* ───────────────── ① create or update ───────────────── */
   private spawnOrUpdateActor(c: CharacterDTO) {
+    if (c.h) this.handles.players.set(c.h, c.id);
     if (c.id === this.meId) return      // ★ 내 컨테이너 생성 금지
 
     /* 이미 있으면 위치만 갱신 */
@@ -615,6 +669,7 @@ export class MyScene extends Phaser.Scene {
     this.player.setVisible(false)           // 이전 좌표에서 깜박임 방지
 
     this.mapReady = false;
+    this.nearNpcId = 0                      // 새 맵 근접 NPC 는 join_map 응답으로
 
     /* ─ 이전 리소스 정리 ─ */
     this.monsterSyncTimer?.remove(false);
@@ -683,7 +738,8 @@ export class MyScene extends Phaser.Scene {
     if (mapKey !== this.currentMap) {
       this.socket.emit('join_map', {
         character_id: this.meId,
-        map_key: mapKey
+        map_key: mapKey,
+        wire: WIRE_BIN,
       })
     }
     this.currentMap = mapKey
@@ -714,6 +770,7 @@ export class MyScene extends Phaser.Scene {
 
     this.events.emit('mapTransition', false) // React 오버레이 해제
     this.isChangingMap = false              // ★ 잠금 해제
+    this.velSender.force()                  // 새 맵 첫 키프레임
   }
 
   /* ▽▽ NPC 로드 / 스폰 ▽▽ */
@@ -756,22 +813,25 @@ export class MyScene extends Phaser.Scene {
   /* ▽▽ UPDATE ▽▽ */
   update() {
     /* ─ 플레이어 이동 ─ */
-    const speed = 200
-    const vx = (this.cursors.left?.isDown ? -1 : this.cursors.right?.isDown ? 1 : 0) * speed
-    const vy = (this.cursors.up?.isDown ? -1 : this.cursors.down?.isDown ? 1 : 0) * speed
+    const [vx, vy] = inputVelocity(
+      this.cursors.left?.isDown ? -1 : this.cursors.right?.isDown ? 1 : 0,
+      this.cursors.up?.isDown ? -1 : this.cursors.down?.isDown ? 1 : 0,
+    )
     this.player.setVelocity(vx, vy)
 
     if (this.anims.exists('stand') && !this.isAttacking) {
       this.player.play(vx || vy ? 'walk' : 'stand', true);
     }
 
-    // 전환 중엔 move 패킷 보내지 않음
-    if (!this.isChangingMap && (vx || vy)) {
-      this.socket.emit('move', {
+    // 전환 중엔 move 패킷 보내지 않음 — 속도가 바뀔 때 + 키프레임만 (사이는 서버가 외삽)
+    if (!this.isChangingMap && this.velSender.shouldSend(vx, vy, this.time.now)) {
+      this.socket.emit('move_vel', {
         character_id: this.meId,
         map_key     : this.currentMap,
         x: this.player.x,
-        y: this.player.y
+        y: this.player.y,
+        vx, vy,
+        seq: ++this.moveSeq,
       });
     }
 
@@ -798,7 +858,8 @@ export class MyScene extends Phaser.Scene {
       }
     }
 
-    /* ─ NPC 대화 트리거 (32px 이내) ─ */
+    /* ─ NPC 대화 트리거 (TALK_DIST 이내) — 서버가 근처라고 알려준 동안만 거리 계산 ─ */
+    if (!this.nearNpcId) return
     this.npcGroup?.children.iterate((obj) => {
       const npc = obj as Phaser.GameObjects.Sprite
       const dist = Phaser.Math.Distance.Between(
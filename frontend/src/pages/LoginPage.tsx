@@ -47,8 +47,9 @@ export default function LoginPage() {
       }
       // 성공 → 토큰·플래그 저장(프로토타입이라 토큰 대신 flag)
       sessionStorage.setItem('arkacia_token', 'yes')
-      const { user } = await res.json()
+      const { user, token } = await res.json()
       sessionStorage.setItem('userId', user.id)
+      if (token) sessionStorage.setItem('socket_token', token)   // 소켓 connect 인증용
       nav('/characters', { replace: true })
     } catch {
       setErr('Network error')
@@ -33,7 +33,7 @@ describe('LoginPage', () => {
       'fetch',
       vi.fn().mockResolvedValue({
         ok: true,
-        json: () => Promise.resolve({ user: { id: 42 } }),
+        json: () => Promise.resolve({ user: { id: 42 }, token: 'signed.tok' }),
       }),
     )
     const user = userEvent.setup()
@@ -46,6 +46,7 @@ describe('LoginPage', () => {
     expect(await screen.findByText('Character Select')).toBeInTheDocument()
     expect(sessionStorage.getItem('arkacia_token')).toBe('yes')
     expect(sessionStorage.getItem('userId')).toBe('42')
+    expect(sessionStorage.getItem('socket_token')).toBe('signed.tok')
   })
 
   it('shows error on login failure', async () => {
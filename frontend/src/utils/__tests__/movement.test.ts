@@ -0,0 +1,56 @@
+import { describe, it, expect } from 'vitest'
+import { VelocitySender, MOVE_KEYFRAME_MS, MOVE_SPEED, MAX_SPEED, inputVelocity } from '../movement'
+
+/** 60 fps 로 frames 프레임 동안 vel(t) 를 넣고 전송 횟수 */
+function sends(s: VelocitySender, frames: number, vel: (i: number) => [number, number]) {
+  let n = 0
+  for (let i = 0; i < frames; i++) {
+    const [vx, vy] = vel(i)
+    if (s.shouldSend(vx, vy, i * (1000 / 60))) n++
+  }
+  return n
+}
+
+describe('VelocitySender', () => {
+  it('sends start, turn and stop immediately', () => {
+    const s = new VelocitySender()
+    expect(s.shouldSend(200, 0, 0)).toBe(true)     // 출발
+    expect(s.shouldSend(200, 0, 16)).toBe(false)
+    expect(s.shouldSend(0, 200, 32)).toBe(true)    // 방향 전환
+    expect(s.shouldSend(0, 0, 48)).toBe(true)      // 정지
+    expect(s.shouldSend(0, 0, 5000)).toBe(false)   // 정지 중엔 키프레임 없음
+  })
+
+  it('keyframes while moving in a straight line', () => {
+    const s = new VelocitySender()
+    s.shouldSend(200, 0, 0)
+    expect(s.shouldSend(200, 0, MOVE_KEYFRAME_MS - 1)).toBe(false)
+    expect(s.shouldSend(200, 0, MOVE_KEYFRAME_MS)).toBe(true)
+  })
+
+  it('cuts straight-line traffic by at least 5x vs per-frame move', () => {
+    const n = sends(new VelocitySender(), 120, () => [200, 0])   // 2초 직진
+    expect(n).toBeLessThanOrEqual(120 / 5)
+  })
+
+  it('force() sends on the next frame even when velocity is unchanged', () => {
+    const s = new VelocitySender()
+    s.shouldSend(0, 0, 0)
+    s.force()
+    expect(s.shouldSend(0, 0, 1)).toBe(true)
+  })
+})
+
+describe('inputVelocity', () => {
+  it('keeps diagonal speed equal to straight speed and under the server cap', () => {
+    expect(inputVelocity(1, 0)).toEqual([MOVE_SPEED, 0])
+    const [vx, vy] = inputVelocity(-1, 1)
+    expect(Math.hypot(vx, vy)).toBeCloseTo(MOVE_SPEED)
+    expect(vx).toBeCloseTo(-vy)
+    expect(Math.hypot(...inputVelocity(1, 1, 1000))).toBeCloseTo(MAX_SPEED)
+  })
+
+  it('is zero without input', () => {
+    expect(inputVelocity(0, 0)).toEqual([0, 0])
+  })
+})
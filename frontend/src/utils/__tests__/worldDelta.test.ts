@@ -0,0 +1,102 @@
+import { describe, it, expect, vi } from 'vitest'
+import { applyWorldDelta, decodeWorldDelta, WorldDelta } from '../worldDelta'
+
+function handlers() {
+  return {
+    playerMove: vi.fn(),
+    monsterMove: vi.fn(),
+    monsterHit: vi.fn(),
+    monsterDespawn: vi.fn(),
+    playerHit: vi.fn(),
+  }
+}
+
+describe('applyWorldDelta', () => {
+  it('dispatches every entry to its handler', () => {
+    const h = handlers()
+    const d: WorldDelta = {
+      map_key: 'dungeon1',
+      players: [[1, 100, 200]],
+      monsters: [[7, 3, 4]],
+      monster_hits: [{ id: 8, attacker_id: 1, dmg: 5, hp: 0, x: 2, y: 2 }],
+      player_hits: [{ id: 1, dmg: 2, hp: 9 }],
+      despawns: [8],
+    }
+    applyWorldDelta(d, h)
+
+    expect(h.playerMove).toHaveBeenCalledWith({ id: 1, x: 100, y: 200 })
+    expect(h.monsterMove).toHaveBeenCalledWith({ id: 7, x: 3, y: 4 })
+    expect(h.monsterHit).toHaveBeenCalledWith(d.monster_hits![0])
+    expect(h.monsterDespawn).toHaveBeenCalledWith({ id: 8 })
+    expect(h.playerHit).toHaveBeenCalledWith({ id: 1, dmg: 2, hp: 9 })
+  })
+
+  it('applies monster hits before despawns', () => {
+    const order: string[] = []
+    const h = handlers()
+    h.monsterHit.mockImplementation(() => order.push('hit'))
+    h.monsterDespawn.mockImplementation(() => order.push('despawn'))
+    applyWorldDelta({
+      map_key: 'dungeon1',
+      despawns: [8],
+      monster_hits: [{ id: 8, attacker_id: 1, dmg: 5, hp: 0, x: 2, y: 2 }],
+    }, h)
+    expect(order).toEqual(['hit', 'despawn'])
+  })
+
+  it('skips missing sections', () => {
+    const h = handlers()
+    applyWorldDelta({ map_key: 'city' }, h)
+    expect(h.playerMove).not.toHaveBeenCalled()
+    expect(h.monsterMove).not.toHaveBeenCalled()
+  })
+})
+
+/* 서버 utils/wire.py 와 같은 bin1 레이아웃으로 직접 조립 */
+function bin1(mapKey: string, counts: number[], body: number[]): ArrayBuffer {
+  const key = new TextEncoder().encode(mapKey)
+  const buf = new ArrayBuffer(2 + key.length + 10 + body.length * 2)
+  const v = new DataView(buf)
+  v.setUint8(0, 1)
+  v.setUint8(1, key.length)
+  new Uint8Array(buf, 2, key.length).set(key)
+  let off = 2 + key.length
+  for (const n of [...counts, ...body]) { v.setUint16(off, n, true); off += 2 }
+  return buf
+}
+
+describe('decodeWorldDelta', () => {
+  const maps = {
+    players: new Map([[1, 101], [2, 102]]),
+    monsters: new Map([[1, 7], [2, 8]]),
+  }
+
+  it('maps handles back to entity ids', () => {
+    const buf = bin1('dungeon1', [1, 1, 1, 1, 1], [
+      1, 300, 64,              // player move
+      1, 3, 4,                 // monster move
+      2, 1, 5, 0, 2, 9,        // monster hit
+      2, 3, 40,                // player hit
+      2,                       // despawn
+    ])
+    expect(decodeWorldDelta(buf, maps)).toEqual({
+      map_key: 'dungeon1',
+      players: [[101, 300, 64]],
+      monsters: [[7, 3, 4]],
+      monster_hits: [{ id: 8, attacker_id: 101, dmg: 5, hp: 0, x: 2, y: 9 }],
+      player_hits: [{ id: 102, dmg: 3, hp: 40 }],
+      despawns: [8],
+    })
+  })
+
+  it('omits empty sections and marks unknown handles', () => {
+    const d = decodeWorldDelta(bin1('city', [1, 0, 0, 0, 0], [9, 1, 1]), maps)
+    expect(d).toEqual({ map_key: 'city', players: [[-1, 1, 1]] })
+  })
+
+  it('rejects unknown versions', () => {
+    const buf = bin1('city', [0, 0, 0, 0, 0], [])
+    new DataView(buf).setUint8(0, 2)
+    expect(() => decodeWorldDelta(buf, maps)).toThrow()
+  })
+})
@@ -6,6 +6,7 @@ export interface CharacterDTO{
     map_key:string;
     x: number;
     y : number;
+    h?: number;      // world_delta bin1 핸들 (소켓 spawn 패킷에만)
     /* 필요 시 다른 필드도… */
   }
   
@@ -0,0 +1,44 @@
+// src/utils/movement.ts
+// move_vel — 매 프레임 좌표 대신 속도 변화(출발/정지/방향 전환)와 주기 키프레임만 전송.
+// 사이 구간은 서버가 마지막 키프레임 + 속도로 외삽한다 (backend utils/dead_reckoning.py).
+
+/** 이동 중 키프레임 주기 — 서버 외삽 한도(1 s)보다 충분히 짧게 */
+export const MOVE_KEYFRAME_MS = 250
+
+/** 플레이어 이동 속력 (px/s) — 대각선도 이 길이 */
+export const MOVE_SPEED = 200
+/** 서버 속도 상한 (dead_reckoning.MAX_SPEED 와 동일) — 벡터 길이 기준 */
+export const MAX_SPEED = 240
+
+/** 방향키 입력(-1/0/1) → 속도. 대각선은 정규화해 축별 200 (= 283 px/s) 이 되지 않게 */
+export function inputVelocity(dx: number, dy: number, speed = MOVE_SPEED): [number, number] {
+  const len = Math.hypot(dx, dy)
+  if (len === 0) return [0, 0]
+  const k = Math.min(speed, MAX_SPEED) / len
+  return [dx * k, dy * k]
+}
+
+export class VelocitySender {
+  private vx = 0
+  private vy = 0
+  private lastSent = -Infinity
+
+  constructor(private readonly keyframeMs = MOVE_KEYFRAME_MS) {}
+
+  /** 이번 프레임에 move_vel 을 보내야 하면 true (보낸 것으로 기록) */
+  shouldSend(vx: number, vy: number, now: number): boolean {
+    const changed = vx !== this.vx || vy !== this.vy
+    const keyframe = (vx !== 0 || vy !== 0) && now - this.lastSent >= this.keyframeMs
+    if (!changed && !keyframe) return false
+    this.vx = vx
+    this.vy = vy
+    this.lastSent = now
+    return true
+  }
+
+  /** 다음 프레임에 무조건 전송 — 서버 move_resync / 맵 전환 직후 */
+  force(): void {
+    this.vx = NaN
+    this.lastSent = -Infinity
+  }
+}
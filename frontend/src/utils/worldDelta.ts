@@ -0,0 +1,85 @@
+// src/utils/worldDelta.ts
+// 서버가 tick(50 ms) 마다 보내는 world_delta 묶음 패킷 → 개별 이벤트 핸들러로 분배
+
+export type MoveTuple = [number, number, number]   // [id, x, y]
+
+export interface MonsterHitDTO {
+  id: number
+  attacker_id: number
+  dmg: number
+  hp: number
+  x: number
+  y: number
+}
+
+export interface PlayerHitDTO {
+  id: number
+  dmg: number
+  hp: number
+}
+
+export interface WorldDelta {
+  map_key: string
+  players?: MoveTuple[]        // 플레이어 픽셀 좌표
+  monsters?: MoveTuple[]       // 몬스터 타일 좌표
+  monster_hits?: MonsterHitDTO[]
+  player_hits?: PlayerHitDTO[]
+  despawns?: number[]          // 몬스터 id
+}
+
+export interface WorldDeltaHandlers {
+  playerMove: (p: { id: number; x: number; y: number }) => void
+  monsterMove: (p: { id: number; x: number; y: number }) => void
+  monsterHit: (h: MonsterHitDTO) => void
+  monsterDespawn: (p: { id: number }) => void
+  playerHit: (h: PlayerHitDTO) => void
+}
+
+/**
+ * 서버 기록 순서와 맞춰 적용: 피격(넉백 좌표) → 이후 이동 → 디스폰 → 플레이어
+ */
+export function applyWorldDelta(d: WorldDelta, h: WorldDeltaHandlers): void {
+  d.monster_hits?.forEach(hit => h.monsterHit(hit))
+  d.monsters?.forEach(([id, x, y]) => h.monsterMove({ id, x, y }))
+  d.despawns?.forEach(id => h.monsterDespawn({ id }))
+  d.player_hits?.forEach(hit => h.playerHit(hit))
+  d.players?.forEach(([id, x, y]) => h.playerMove({ id, x, y }))
+}
+
+/* ─────────────────────────────────────────────
+   bin1 — 서버 utils/wire.py 와 같은 레이아웃 (little-endian, u16 핸들)
+───────────────────────────────────────────── */
+export const WIRE_BIN = 'bin1'
+
+/** 핸들(h) → 엔티티 id. spawn 계열 패킷의 h 로 채운다 */
+export interface HandleMaps {
+  players: Map<number, number>
+  monsters: Map<number, number>
+}
+
+export function decodeWorldDelta(buf: ArrayBuffer, maps: HandleMaps): WorldDelta {
+  const v = new DataView(buf)
+  let off = 0
+  const u8 = () => v.getUint8(off++)
+  const u16 = () => { const x = v.getUint16(off, true); off += 2; return x }
+  // 모르는 핸들은 -1 → 핸들러 쪽에서 get() 실패로 무시됨
+  const pid = (h: number) => maps.players.get(h) ?? -1
+  const mid = (h: number) => maps.monsters.get(h) ?? -1
+
+  const version = u8()
+  if (version !== 1) throw new Error(`world_delta: unsupported version ${version}`)
+  const n = u8()
+  const map_key = new TextDecoder().decode(new Uint8Array(buf, off, n))
+  off += n
+  const [np, nm, nmh, nph, nd] = [u16(), u16(), u16(), u16(), u16()]
+
+  const d: WorldDelta = { map_key }
+  if (np) d.players = Array.from({ length: np }, () => [pid(u16()), u16(), u16()] as MoveTuple)
+  if (nm) d.monsters = Array.from({ length: nm }, () => [mid(u16()), u16(), u16()] as MoveTuple)
+  if (nmh) d.monster_hits = Array.from({ length: nmh }, () => ({
+    id: mid(u16()), attacker_id: pid(u16()), dmg: u16(), hp: u16(), x: u16(), y: u16(),
+  }))
+  if (nph) d.player_hits = Array.from({ length: nph }, () => ({ id: pid(u16()), dmg: u16(), hp: u16() }))
+  if (nd) d.despawns = Array.from({ length: nd }, () => mid(u16()))
+  return d
+}